@@ -1,25 +1,51 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from flask_cors import CORS
 from marshmallow import Schema, fields, ValidationError
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
-from langchain.memory import ConversationBufferMemory
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain.chains import ConversationalRetrievalChain
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import HumanMessage, AIMessage
+from langchain.text_splitter import RecursiveCharacterTextSplitter, Language
+from langchain.schema import HumanMessage, AIMessage, SystemMessage
+from langchain_core.embeddings import Embeddings
+import numpy as np
 import google.generativeai as genai
 import uuid
 from typing import Dict, Optional, List, Any
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlencode, urljoin, urlsplit
 from dotenv import load_dotenv
 import base64
+import hashlib
+import hmac
+import shutil
 import warnings
 import re
 import json
 import time
 import datetime
+import threading
+import sqlite3
+import concurrent.futures
+import functools
+import random
+import itertools
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+import httpx
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response as ASGIResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
 
 load_dotenv()
 warnings.filterwarnings('ignore')
@@ -31,6 +57,20 @@ try:
 except Exception:
 	_FASTEMBED_AVAILABLE = False
 
+# xxhash keys the embedding cache; blake2b is the (slower) fallback
+try:
+	import xxhash  # type: ignore
+	_XXHASH_AVAILABLE = True
+except Exception:
+	_XXHASH_AVAILABLE = False
+
+# zstd compression for the optional on-disk cache tier
+try:
+	import zstandard  # type: ignore
+	_ZSTD_AVAILABLE = True
+except Exception:
+	_ZSTD_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
@@ -39,16 +79,1006 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 genai.configure(api_key=GOOGLE_API_KEY)
 
 GITHUB_PER_PAGE = 25
-
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", 20))
+# Extra tokens (comma-separated) pooled with GITHUB_TOKEN; each request goes to the token with the most quota left
+GITHUB_TOKENS = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
+# Share of each rate-limit bucket held back for interactive requests; background refreshes queue below it
+GITHUB_BACKGROUND_RESERVE = float(os.getenv("GITHUB_BACKGROUND_RESERVE", 0.2))
+# Seconds a request may wait for quota to reset before failing (interactive / background)
+GITHUB_INTERACTIVE_MAX_WAIT = float(os.getenv("GITHUB_INTERACTIVE_MAX_WAIT", 5))
+GITHUB_BACKGROUND_MAX_WAIT = float(os.getenv("GITHUB_BACKGROUND_MAX_WAIT", 300))
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+INSIGHTS_MAX_WORKERS = int(os.getenv("INSIGHTS_MAX_WORKERS", 8))
+# Conversations idle longer than this (seconds) are dropped, as are the least recently used past the cap
+SESSION_IDLE_TIMEOUT = int(os.getenv("SESSION_IDLE_TIMEOUT", 3600))
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", 1000))
+# Estimated input tokens for the system prompt; lower-priority real-time sections are trimmed to fit
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 4000))
+# Turns a conversation's memory keeps verbatim; older turns are folded into a rolling summary (0 keeps every turn)
+MEMORY_WINDOW_TURNS = int(os.getenv("MEMORY_WINDOW_TURNS", 6))
+MEMORY_SUMMARY_MAX_CHARS = int(os.getenv("MEMORY_SUMMARY_MAX_CHARS", 2000))
+# Messages per conversation kept for /api/history, and its default page size
+HISTORY_MAX_MESSAGES = int(os.getenv("HISTORY_MAX_MESSAGES", 200))
+HISTORY_PAGE_SIZE = 50
+# LLM calls in flight at once, callers queued behind them before new ones are turned away, and the
+# seconds a request may spend queued and retrying rate-limited (429) calls
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", 32))
+LLM_REQUEST_DEADLINE = float(os.getenv("LLM_REQUEST_DEADLINE", 60))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+# "rest" fans out over the REST API, "graphql" fetches everything GitHub-side in one query
+INSIGHTS_BACKEND = os.getenv("INSIGHTS_BACKEND", "rest").lower()
+# Overall wall-clock budget (seconds) for one trending crawl across all sources
+CRAWL_DEADLINE = float(os.getenv("CRAWL_DEADLINE", 6))
+CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", 12))
+# Intent-selected fetchers (trending, repos, issues, guide, insights, Stack Overflow) run side by side per question;
+# the ASGI app awaits their async versions instead of using this pool
+CONTEXT_MAX_WORKERS = int(os.getenv("CONTEXT_MAX_WORKERS", 12))
+# Connection pool of the non-blocking client used by the ASGI app (asgi_app)
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", 100))
+STACKEXCHANGE_API_URL = "https://api.stackexchange.com/2.3/search"
+
+# Background trending refresher; an interval of 0 disables snapshot serving
+TRENDING_REFRESH_INTERVAL = int(os.getenv("TRENDING_REFRESH_INTERVAL", 900))
+TRENDING_MAX_PAIRS = int(os.getenv("TRENDING_MAX_PAIRS", 40))
+# (language, topic) pairs that are always kept warm
+TRENDING_POPULAR_PAIRS = [
+	("", ""),
+	("python", ""),
+	("javascript", ""),
+	("typescript", ""),
+	("java", ""),
+	("go", ""),
+	("rust", "")
+]
+
+RSS_FEEDS = [
+	"https://opensource.com/feed",
+	"https://changelog.com/feed"
+]
+
+# "expiry" is how long an entry counts as fresh. Up to "max_age" a stale entry is still served
+# immediately while it is refreshed in the background; beyond that, callers wait for a fetch.
 CACHE_CONFIG = {
-	"repo": {"expiry": 1800},
-	"issue": {"expiry": 900},
-	"guide": {"expiry": 3600},
+	"repo": {"expiry": 1800, "max_age": 7200, "max_entries": 500, "max_bytes": 8 * 1024 * 1024},
+	"issue": {"expiry": 900, "max_age": 3600, "max_entries": 500, "max_bytes": 8 * 1024 * 1024},
+	"guide": {"expiry": 3600, "max_age": 86400, "max_entries": 500, "max_bytes": 16 * 1024 * 1024},
+	# Chunk embeddings of each guide, keyed by the guide's content hash so they age out with it
+	"guide_index": {"expiry": 3600, "max_age": 86400, "max_entries": 200, "max_bytes": 32 * 1024 * 1024},
+	"insights": {"expiry": 1800, "max_age": 7200, "max_entries": 500, "max_bytes": 4 * 1024 * 1024},
+	# Validators stay useful long after the payload caches expire, since a 304 is free
+	"http": {"expiry": 86400, "max_entries": 2000, "max_bytes": 32 * 1024 * 1024},
+	"trending": {"expiry": max(2 * TRENDING_REFRESH_INTERVAL, 1), "max_entries": TRENDING_MAX_PAIRS, "max_bytes": 4 * 1024 * 1024},
+}
+# Answers live no longer than the freshest data they were built from
+CACHE_CONFIG["answers"] = {
+	"expiry": min(CACHE_CONFIG[name]["expiry"] for name in ("repo", "issue", "guide", "insights")),
+	"max_entries": 1000,
+	"max_bytes": 16 * 1024 * 1024
+}
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", 300))
+REFRESH_MAX_WORKERS = int(os.getenv("REFRESH_MAX_WORKERS", 4))
+# Contribution guides are kept up to GUIDE_MAX_CHARS and indexed in GUIDE_CHUNK_SIZE chunks; the prompt
+# gets up to GUIDE_TOP_K chunks closest to the question, never more than GUIDE_EXCERPT_MAX_CHARS in all
+GUIDE_MAX_CHARS = int(os.getenv("GUIDE_MAX_CHARS", 30000))
+GUIDE_CHUNK_SIZE = int(os.getenv("GUIDE_CHUNK_SIZE", 300))
+GUIDE_TOP_K = int(os.getenv("GUIDE_TOP_K", 3))
+GUIDE_EXCERPT_MAX_CHARS = int(os.getenv("GUIDE_EXCERPT_MAX_CHARS", 1000))
+# Cosine similarity at which an earlier question (same context and profile) reuses its answer; 0 disables the answer cache
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", 0.92))
+# SQLite file for the persistent cache tier; leave unset to keep caches in memory only
+DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "")
+# Built FAISS indexes are saved here under a corpus/splitter/model fingerprint; set empty to rebuild on every boot
+VECTORSTORE_DIR = os.getenv("VECTORSTORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".vectorstore"))
+# Journaled index changes after which the whole index is saved again and the journal starts over
+VECTORSTORE_CHECKPOINT_ENTRIES = int(os.getenv("VECTORSTORE_CHECKPOINT_ENTRIES", 50))
+# SQLite file of document embeddings keyed by content hash and model; set empty to embed every chunk every time
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".embeddings.sqlite"))
+# Required as X-Admin-Token on /api/admin/* endpoints; leave unset to disable them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+class DiskCacheTier:
+	"""Write-through SQLite store for cache entries, kept as zstd-compressed JSON"""
+
+	def __init__(self, path: str, level: int = 3):
+		self.path = path
+		self.level = level
+		self.conn = sqlite3.connect(path, check_same_thread=False)
+		self.conn.execute("PRAGMA journal_mode=WAL")
+		self.conn.execute(
+			"CREATE TABLE IF NOT EXISTS cache_entries ("
+			"namespace TEXT NOT NULL, key TEXT NOT NULL, timestamp REAL NOT NULL, value BLOB NOT NULL, "
+			"PRIMARY KEY (namespace, key))"
+		)
+		self.conn.commit()
+		self.lock = threading.Lock()
+
+	def get(self, namespace: str, key: str) -> Optional[dict]:
+		with self.lock:
+			row = self.conn.execute(
+				"SELECT value FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+			).fetchone()
+		if row is None:
+			return None
+		return json.loads(zstandard.ZstdDecompressor().decompress(row[0]))
+
+	def set(self, namespace: str, key: str, entry: dict):
+		value = zstandard.ZstdCompressor(level=self.level).compress(json.dumps(entry, default=str).encode("utf-8"))
+		with self.lock:
+			self.conn.execute(
+				"INSERT OR REPLACE INTO cache_entries (namespace, key, timestamp, value) VALUES (?, ?, ?, ?)",
+				(namespace, key, entry["timestamp"], value)
+			)
+			self.conn.commit()
+
+	def delete(self, namespace: str, key: str):
+		with self.lock:
+			self.conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+			self.conn.commit()
+
+	def purge(self, namespace: str, older_than: float) -> int:
+		with self.lock:
+			cursor = self.conn.execute(
+				"DELETE FROM cache_entries WHERE namespace = ? AND timestamp < ?", (namespace, older_than)
+			)
+			self.conn.commit()
+			return cursor.rowcount
+
+disk_cache = None
+if DISK_CACHE_PATH:
+	if _ZSTD_AVAILABLE:
+		try:
+			disk_cache = DiskCacheTier(DISK_CACHE_PATH)
+		except Exception as e:
+			print(f"Disk cache disabled, could not open {DISK_CACHE_PATH}: {str(e)}")
+	else:
+		print("Disk cache disabled: zstandard is not installed")
+
+class SingleFlight:
+	"""Coalesces concurrent calls with the same key: one caller runs, the rest share its result"""
+
+	def __init__(self):
+		self.calls = {}
+		self.tasks = {}
+		self.coalesced = 0
+		self.lock = threading.Lock()
+
+	def do(self, key: str, fn):
+		with self.lock:
+			future = self.calls.get(key)
+			leader = future is None
+			if leader:
+				future = concurrent.futures.Future()
+				self.calls[key] = future
+			else:
+				self.coalesced += 1
+
+		if not leader:
+			return future.result()
+
+		try:
+			result = fn()
+			future.set_result(result)
+			return result
+		except Exception as e:
+			future.set_exception(e)
+			raise
+		finally:
+			with self.lock:
+				del self.calls[key]
+
+	async def ado(self, key: str, fn):
+		"""do() on the event loop: fn() returns a coroutine, and one task per key is shared by every awaiting caller"""
+		task = self.tasks.get(key)
+		if task is None:
+			task = asyncio.ensure_future(fn())
+			self.tasks[key] = task
+			task.add_done_callback(lambda _: self.tasks.pop(key, None))
+		else:
+			with self.lock:
+				self.coalesced += 1
+
+		# A cancelled caller must not cancel the load the others are waiting on
+		return await asyncio.shield(task)
+
+class BoundedCache:
+	"""Thread-safe LRU cache with a TTL and entry-count/byte limits for one namespace.
+
+	Entries are dicts carrying a "timestamp". They are fresh for `expiry` seconds and are
+	kept (as stale) until `max_age`, which defaults to the expiry.
+	"""
+
+	def __init__(self, name: str, expiry: int, max_entries: int, max_bytes: int, max_age: Optional[int] = None, disk: Optional[DiskCacheTier] = None):
+		self.name = name
+		self.disk = disk
+		self.expiry = expiry
+		self.max_age = max(max_age or expiry, expiry)
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.entries = OrderedDict()
+		self.sizes = {}
+		self.total_bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.expirations = 0
+		self.disk_hits = 0
+		self.stale_hits = 0
+		self.background_refreshes = 0
+		self.refreshing = set()
+		self.flights = SingleFlight()
+		self.lock = threading.Lock()
+
+	@staticmethod
+	def _approx_size(entry: dict) -> int:
+		try:
+			return len(json.dumps(entry, default=str))
+		except Exception:
+			return len(str(entry))
+
+	def _remove(self, key: str):
+		self.entries.pop(key, None)
+		self.total_bytes -= self.sizes.pop(key, 0)
+
+	def _is_expired(self, entry: dict, now: float) -> bool:
+		return now - entry["timestamp"] >= self.max_age
+
+	def is_stale(self, entry: dict) -> bool:
+		return time.time() - entry["timestamp"] >= self.expiry
+
+	def get(self, key: str, allow_stale: bool = False) -> Optional[dict]:
+		decided, entry = self._get_memory(key, allow_stale)
+		if decided:
+			return entry
+		# Memory miss: a restarted process can still find the entry on disk
+		return self._from_disk(key, self._read_disk(key), allow_stale)
+
+	async def aget(self, key: str, allow_stale: bool = False) -> Optional[dict]:
+		"""get() for the event loop: a disk-tier read runs in a worker thread"""
+		decided, entry = self._get_memory(key, allow_stale)
+		if decided:
+			return entry
+		disk_entry = await asyncio.to_thread(self._read_disk, key) if self.disk is not None else None
+		return self._from_disk(key, disk_entry, allow_stale)
+
+	def _get_memory(self, key: str, allow_stale: bool) -> tuple:
+		"""(decided, entry): decided is False when the disk tier should be asked"""
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is not None and self._is_expired(entry, time.time()):
+				self._remove(key)
+				self.expirations += 1
+				entry = None
+			if entry is not None and (allow_stale or not self.is_stale(entry)):
+				self.entries.move_to_end(key)
+				self.hits += 1
+				return True, entry
+			if entry is not None:
+				self.misses += 1
+				return True, None
+		return False, None
+
+	def _read_disk(self, key: str) -> Optional[dict]:
+		if self.disk is None:
+			return None
+		try:
+			return self.disk.get(self.name, key)
+		except Exception as e:
+			print(f"Disk cache read failed for {self.name}/{key}: {str(e)}")
+			return None
+
+	def _from_disk(self, key: str, entry: Optional[dict], allow_stale: bool) -> Optional[dict]:
+		if entry is not None and not self._is_expired(entry, time.time()):
+			self._store(key, entry)
+			if allow_stale or not self.is_stale(entry):
+				with self.lock:
+					self.disk_hits += 1
+					self.hits += 1
+				return entry
+
+		with self.lock:
+			self.misses += 1
+		return None
+
+	def set(self, key: str, entry: dict):
+		self._store(key, entry)
+		self._write_disk(key, entry)
+
+	async def aset(self, key: str, entry: dict):
+		"""set() for the event loop: the disk-tier write runs in a worker thread"""
+		self._store(key, entry)
+		if self.disk is not None:
+			await asyncio.to_thread(self._write_disk, key, entry)
+
+	def _write_disk(self, key: str, entry: dict):
+		if self.disk is None:
+			return
+		try:
+			self.disk.set(self.name, key, entry)
+		except Exception as e:
+			print(f"Disk cache write failed for {self.name}/{key}: {str(e)}")
+
+	def _store(self, key: str, entry: dict):
+		size = self._approx_size(entry)
+		with self.lock:
+			self._remove(key)
+			if size > self.max_bytes:
+				return
+			self.entries[key] = entry
+			self.sizes[key] = size
+			self.total_bytes += size
+			while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+				oldest = next(iter(self.entries))
+				self._remove(oldest)
+				self.evictions += 1
+
+	def get_or_load(self, key: str, loader, force_refresh: bool = False):
+		"""Return cached data for key, or call loader() (which fetches, stores and returns the data).
+
+		Stale entries younger than max_age are returned at once while loader() runs in the
+		background; force_refresh always loads synchronously. Concurrent loads of the same
+		key are coalesced into a single upstream fetch.
+		"""
+		if not force_refresh:
+			entry = self.get(key, allow_stale=True)
+			if entry is not None:
+				if not self.is_stale(entry):
+					print(f"Using cached {self.name} entry for: {key}")
+				else:
+					print(f"Serving stale {self.name} entry for: {key} while revalidating")
+					with self.lock:
+						self.stale_hits += 1
+					self._refresh_in_background(key, loader)
+				return entry["data"]
+
+		return self.flights.do(key, loader)
+
+	async def aget_or_load(self, key: str, aloader, loader, force_refresh: bool = False):
+		"""get_or_load for the event loop: a miss awaits aloader() instead of blocking a thread.
+
+		Background revalidation of stale entries still runs the blocking loader() on the refresh pool.
+		"""
+		if not force_refresh:
+			entry = await self.aget(key, allow_stale=True)
+			if entry is not None:
+				if not self.is_stale(entry):
+					print(f"Using cached {self.name} entry for: {key}")
+				else:
+					print(f"Serving stale {self.name} entry for: {key} while revalidating")
+					with self.lock:
+						self.stale_hits += 1
+					self._refresh_in_background(key, loader)
+				return entry["data"]
+
+		return await self.flights.ado(key, aloader)
+
+	def _refresh_in_background(self, key: str, loader):
+		with self.lock:
+			if key in self.refreshing:
+				return
+			self.refreshing.add(key)
+			self.background_refreshes += 1
+
+		def refresh():
+			try:
+				with request_priority(PRIORITY_BACKGROUND):
+					self.flights.do(key, loader)
+			except Exception as e:
+				print(f"Background refresh failed for {self.name}/{key}: {str(e)}")
+			finally:
+				with self.lock:
+					self.refreshing.discard(key)
+
+		refresh_executor.submit(refresh)
+
+	def pop(self, key: str):
+		with self.lock:
+			self._remove(key)
+		if self.disk is not None:
+			try:
+				self.disk.delete(self.name, key)
+			except Exception as e:
+				print(f"Disk cache delete failed for {self.name}/{key}: {str(e)}")
+
+	def sweep(self) -> int:
+		"""Drop every expired entry and return how many were removed"""
+		now = time.time()
+		with self.lock:
+			expired = [key for key, entry in self.entries.items() if self._is_expired(entry, now)]
+			for key in expired:
+				self._remove(key)
+			self.expirations += len(expired)
+		if self.disk is not None:
+			self.disk.purge(self.name, now - self.max_age)
+		return len(expired)
+
+	def stats(self) -> Dict[str, Any]:
+		with self.lock:
+			return {
+				"entries": len(self.entries),
+				"bytes": self.total_bytes,
+				"max_entries": self.max_entries,
+				"max_bytes": self.max_bytes,
+				"hits": self.hits,
+				"misses": self.misses,
+				"evictions": self.evictions,
+				"expirations": self.expirations,
+				"disk_hits": self.disk_hits,
+				"stale_hits": self.stale_hits,
+				"background_refreshes": self.background_refreshes,
+				"coalesced": self.flights.coalesced,
+				"persistent": self.disk is not None
+			}
+
+CACHES = {name: BoundedCache(name, disk=disk_cache, **config) for name, config in CACHE_CONFIG.items()}
+# Work done for a waiting user outranks background revalidation when shared quotas run low
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+_request_priority = threading.local()
+
+def current_priority() -> int:
+	return getattr(_request_priority, "level", PRIORITY_INTERACTIVE)
+
+@contextmanager
+def request_priority(level: int):
+	"""Run the enclosed work (on this thread) at the given priority"""
+	previous = current_priority()
+	_request_priority.level = level
+	try:
+		yield
+	finally:
+		_request_priority.level = previous
+
+def run_with_priority(level: int, fn, *args, **kwargs):
+	"""Executor target that carries the submitting thread's priority over to the worker"""
+	with request_priority(level):
+		return fn(*args, **kwargs)
+
+refresh_executor = concurrent.futures.ThreadPoolExecutor(max_workers=REFRESH_MAX_WORKERS, thread_name_prefix="refresh")
+
+REPO_CACHE = CACHES["repo"]
+ISSUE_CACHE = CACHES["issue"]
+GUIDE_CACHE = CACHES["guide"]
+GUIDE_INDEX_CACHE = CACHES["guide_index"]
+INSIGHTS_CACHE = CACHES["insights"]
+# Conditional-request validators (ETag / Last-Modified) stored next to the raw GitHub payloads
+GITHUB_HTTP_CACHE = CACHES["http"]
+TRENDING_CACHE = CACHES["trending"]
+ANSWER_CACHE = CACHES["answers"]
+
+def _sweep_caches():
+	while True:
+		time.sleep(CACHE_SWEEP_INTERVAL)
+		for cache in CACHES.values():
+			try:
+				cache.sweep()
+			except Exception as e:
+				print(f"Error sweeping {cache.name} cache: {str(e)}")
+
+threading.Thread(target=_sweep_caches, name="cache-sweeper", daemon=True).start()
+
+class GitHubResponse:
+	"""Minimal response object so revalidated (304) payloads look exactly like fresh ones"""
+
+	def __init__(self, url: str, status_code: int, headers: dict, text: str, revalidated: bool = False):
+		self.url = url
+		self.status_code = status_code
+		self.headers = headers
+		self.text = text
+		self.revalidated = revalidated
+
+	def json(self):
+		return json.loads(self.text) if self.text else None
+
+	def raise_for_status(self):
+		if self.status_code >= 400:
+			raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+class GitHubRateLimited(requests.HTTPError):
+	"""No token has quota left in the bucket within the caller's wait budget"""
+
+class GitHubRateLimiter:
+	"""Remaining quota and reset time per token and bucket (core, search, graphql). Each request is
+	handed the token with the most quota left; background work stops short of a reserve kept for
+	interactive requests and queues until the bucket resets."""
+
+	LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+	ANONYMOUS_LIMITS = {"core": 60, "search": 10, "graphql": 0}
+
+	def __init__(self, tokens: List[str], reserve: float = GITHUB_BACKGROUND_RESERVE, interactive_wait: float = GITHUB_INTERACTIVE_MAX_WAIT, background_wait: float = GITHUB_BACKGROUND_MAX_WAIT):
+		self.tokens = list(dict.fromkeys(tokens)) or [None]
+		limits = self.LIMITS if tokens else self.ANONYMOUS_LIMITS
+		self.buckets = {
+			(token, bucket): {"limit": limit, "remaining": limit, "reset": 0.0}
+			for token in self.tokens for bucket, limit in limits.items()
+		}
+		self.reserve = reserve
+		self.interactive_wait = interactive_wait
+		self.background_wait = background_wait
+		self.condition = threading.Condition()
+		self.interactive_waiting = {bucket: 0 for bucket in limits}
+		self.waits = 0
+		self.rejections = 0
+		self.throttled = 0
+
+	def _bucket(self, token: Optional[str], bucket: str, now: float) -> dict:
+		state = self.buckets[(token, bucket)]
+		if state["reset"] and now >= state["reset"]:
+			state["remaining"] = state["limit"]
+			state["reset"] = 0.0
+		return state
+
+	def _reserve(self, bucket: str, background: bool, deadline: float) -> tuple:
+		"""One attempt at taking quota, with the condition held: (None, token) on success, else (seconds to wait, None)"""
+		now = time.time()
+		token, state = max(
+			((token, self._bucket(token, bucket, now)) for token in self.tokens),
+			key=lambda item: item[1]["remaining"]
+		)
+		floor = state["limit"] * self.reserve if background else 0
+		if state["remaining"] > floor and not (background and self.interactive_waiting[bucket]):
+			state["remaining"] -= 1
+			return None, token
+
+		resets = [self.buckets[(token, bucket)]["reset"] for token in self.tokens if self.buckets[(token, bucket)]["reset"]]
+		next_reset = min(resets) if resets else None
+		# Without a known reset only an interactive request holding the quota can free it up
+		blocked_for_good = next_reset is None and not (background and self.interactive_waiting[bucket])
+		if now >= deadline or blocked_for_good or (next_reset or now) > deadline:
+			self.rejections += 1
+			raise GitHubRateLimited(f"GitHub {bucket} rate limit exhausted on all {len(self.tokens)} token(s)")
+
+		return min(next_reset or deadline, deadline) - now + 0.05, None
+
+	def acquire(self, bucket: str) -> Optional[str]:
+		"""Reserve one request in the bucket and return the token to send it with"""
+		background = current_priority() != PRIORITY_INTERACTIVE
+		deadline = time.time() + (self.background_wait if background else self.interactive_wait)
+
+		with self.condition:
+			if not background:
+				self.interactive_waiting[bucket] += 1
+			try:
+				waited = False
+				while True:
+					wait, token = self._reserve(bucket, background, deadline)
+					if wait is None:
+						return token
+					if not waited:
+						self.waits += 1
+						waited = True
+					self.condition.wait(wait)
+			finally:
+				if not background:
+					self.interactive_waiting[bucket] -= 1
+					self.condition.notify_all()
+
+	async def aacquire(self, bucket: str) -> Optional[str]:
+		"""acquire() for the event loop: the wait is an asyncio.sleep (re-checked every 0.25s) instead of a blocked thread"""
+		background = current_priority() != PRIORITY_INTERACTIVE
+		deadline = time.time() + (self.background_wait if background else self.interactive_wait)
+
+		if not background:
+			with self.condition:
+				self.interactive_waiting[bucket] += 1
+		try:
+			waited = False
+			while True:
+				with self.condition:
+					wait, token = self._reserve(bucket, background, deadline)
+					if wait is None:
+						return token
+					if not waited:
+						self.waits += 1
+						waited = True
+				await asyncio.sleep(min(wait, 0.25))
+		finally:
+			if not background:
+				with self.condition:
+					self.interactive_waiting[bucket] -= 1
+					self.condition.notify_all()
+
+	def update(self, token: Optional[str], bucket: str, response) -> bool:
+		"""Record the quota GitHub reported for this token; True when the response was a rate-limit rejection"""
+		headers = response.headers
+		resource = headers.get("X-RateLimit-Resource")
+		if resource not in self.interactive_waiting:
+			resource = bucket
+		now = time.time()
+
+		with self.condition:
+			state = self.buckets[(token, resource)]
+			try:
+				if headers.get("X-RateLimit-Limit") is not None:
+					state["limit"] = int(headers["X-RateLimit-Limit"])
+				if headers.get("X-RateLimit-Remaining") is not None:
+					state["remaining"] = int(headers["X-RateLimit-Remaining"])
+				if headers.get("X-RateLimit-Reset") is not None:
+					state["reset"] = float(headers["X-RateLimit-Reset"])
+			except ValueError:
+				pass
+
+			limited = response.status_code in (403, 429) and (state["remaining"] <= 0 or headers.get("Retry-After") is not None)
+			if limited:
+				self.throttled += 1
+				state["remaining"] = 0
+				retry_after = headers.get("Retry-After")
+				if retry_after is not None and retry_after.isdigit():
+					state["reset"] = max(state["reset"], now + int(retry_after))
+				elif not state["reset"]:
+					state["reset"] = now + 60
+			self.condition.notify_all()
+
+		if state["remaining"] < 10:
+			print(f"WARNING: GitHub API {resource} rate limit approaching exhaustion")
+		return limited
+
+	def stats(self) -> Dict[str, Any]:
+		now = time.time()
+		with self.condition:
+			return {
+				"tokens": {
+					f"...{token[-4:]}" if token else "anonymous": {
+						bucket: {
+							"remaining": state["remaining"],
+							"limit": state["limit"],
+							"reset_in": max(round(state["reset"] - now), 0) if state["reset"] else None
+						}
+						for (owner, bucket), state in self.buckets.items() if owner == token
+					}
+					for token in self.tokens
+				},
+				"waits": self.waits,
+				"rejections": self.rejections,
+				"throttled": self.throttled
+			}
+
+class GitHubClient:
+	"""Shared GitHub REST client with a keep-alive connection pool and ETag/Last-Modified revalidation.
+
+	aget/agraphql send the same requests over the ASGI app's httpx.AsyncClient.
+	"""
+
+	def __init__(self, tokens: Optional[List[str]] = None, base_url: str = GITHUB_API_URL, graphql_url: str = GITHUB_GRAPHQL_URL, pool_size: int = GITHUB_POOL_SIZE):
+		self.base_url = base_url
+		self.graphql_url = graphql_url
+		self.default_headers = {
+			"Accept": "application/vnd.github.v3+json",
+			"User-Agent": "OpenSourceGuide/1.0"
+		}
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+		self.session.headers.update(self.default_headers)
+		tokens = [token for token in (tokens or []) if token]
+		self.authenticated = bool(tokens)
+		self.rate_limiter = GitHubRateLimiter(tokens)
+
+	def _url(self, path: str) -> str:
+		return path if path.startswith("http") else f"{self.base_url}{path}"
+
+	def _cache_key(self, url: str, params: Optional[dict], headers: Optional[dict]) -> str:
+		accept = (headers or {}).get("Accept", self.default_headers["Accept"])
+		query = urlencode(sorted((params or {}).items()))
+		return f"{accept} {url}?{query}"
+
+	def _bucket(self, url: str) -> str:
+		path = url[len(self.base_url):] if url.startswith(self.base_url) else urlsplit(url).path
+		return "search" if path.startswith("/search/") else "core"
+
+	@staticmethod
+	def _authorized(headers: dict, token: Optional[str]) -> dict:
+		request_headers = dict(headers)
+		if token:
+			request_headers["Authorization"] = f"token {token}"
+		return request_headers
+
+	def _send(self, bucket: str, send, headers: dict):
+		"""Send through the rate limiter, retrying once on another token (or after the reset) when rejected"""
+		for attempt in range(2):
+			token = self.rate_limiter.acquire(bucket)
+			response = send(self._authorized(headers, token))
+			if not self.rate_limiter.update(token, bucket, response):
+				break
+			print(f"GitHub {bucket} rate limit hit, retrying (attempt {attempt + 1})")
+		return response
+
+	async def _asend(self, bucket: str, send, headers: dict):
+		"""_send for the event loop; send(headers) returns an awaitable"""
+		for attempt in range(2):
+			token = await self.rate_limiter.aacquire(bucket)
+			response = await send(self._authorized(headers, token))
+			if not self.rate_limiter.update(token, bucket, response):
+				break
+			print(f"GitHub {bucket} rate limit hit, retrying (attempt {attempt + 1})")
+		return response
+
+	@staticmethod
+	def _validator_headers(cached: Optional[dict], headers: Optional[dict]) -> dict:
+		"""Request headers carrying the stored copy's validators, if there is one"""
+		request_headers = dict(headers or {})
+		if cached:
+			if cached.get("etag"):
+				request_headers["If-None-Match"] = cached["etag"]
+			if cached.get("last_modified"):
+				request_headers["If-Modified-Since"] = cached["last_modified"]
+		return request_headers
+
+	def get(self, path: str, params: Optional[dict] = None, headers: Optional[dict] = None, timeout: int = 10) -> GitHubResponse:
+		"""GET a GitHub resource, revalidating any stored copy so unchanged data costs a 304 instead of a refetch"""
+		url = self._url(path)
+		cache_key = self._cache_key(url, params, headers)
+		cached = GITHUB_HTTP_CACHE.get(cache_key)
+		response = self._send(
+			self._bucket(url),
+			lambda send_headers: self.session.get(url, params=params, headers=send_headers, timeout=timeout),
+			self._validator_headers(cached, headers)
+		)
+		result, validators = self._revalidated(url, cached, response)
+		if validators:
+			GITHUB_HTTP_CACHE.set(cache_key, validators)
+		return result
+
+	async def aget(self, path: str, params: Optional[dict] = None, headers: Optional[dict] = None, timeout: int = 10) -> GitHubResponse:
+		"""get() over the non-blocking client, sharing the validator cache and rate limiter"""
+		url = self._url(path)
+		cache_key = self._cache_key(url, params, headers)
+		cached = await GITHUB_HTTP_CACHE.aget(cache_key)
+		response = await self._asend(
+			self._bucket(url),
+			lambda send_headers: async_http.get(url, params=params, headers={**self.default_headers, **send_headers}, timeout=timeout),
+			self._validator_headers(cached, headers)
+		)
+		result, validators = self._revalidated(url, cached, response)
+		if validators:
+			await GITHUB_HTTP_CACHE.aset(cache_key, validators)
+		return result
+
+	def _revalidated(self, url: str, cached: Optional[dict], response) -> tuple:
+		"""(response, validators entry to store or None): a 304 is served from the stored copy
+		(requests or httpx response)"""
+		if response.status_code == 304 and cached:
+			cached["timestamp"] = time.time()
+			return GitHubResponse(url, 200, CaseInsensitiveDict(cached["headers"]), cached["text"], revalidated=True), None
+
+		validators = None
+		etag = response.headers.get("ETag")
+		last_modified = response.headers.get("Last-Modified")
+		if response.status_code == 200 and (etag or last_modified):
+			validators = {
+				"etag": etag,
+				"last_modified": last_modified,
+				"headers": dict(response.headers),
+				"text": response.text,
+				"timestamp": time.time()
+			}
+
+		return GitHubResponse(url, response.status_code, response.headers, response.text), validators
+
+	def graphql(self, query: str, variables: Optional[dict] = None, timeout: int = 10) -> dict:
+		"""Run a GraphQL query and return its data, raising on transport or query errors"""
+		response = self._send(
+			"graphql",
+			lambda send_headers: self.session.post(
+				self.graphql_url,
+				json={"query": query, "variables": variables or {}},
+				headers=send_headers,
+				timeout=timeout
+			),
+			{}
+		)
+		return self._graphql_data(response)
+
+	async def agraphql(self, query: str, variables: Optional[dict] = None, timeout: int = 10) -> dict:
+		"""graphql() over the non-blocking client"""
+		response = await self._asend(
+			"graphql",
+			lambda send_headers: async_http.post(
+				self.graphql_url,
+				json={"query": query, "variables": variables or {}},
+				headers={**self.default_headers, **send_headers},
+				timeout=timeout
+			),
+			{}
+		)
+		return self._graphql_data(response)
+
+	def _graphql_data(self, response) -> dict:
+		# Wrapped so requests and httpx responses raise the same requests.HTTPError
+		response = GitHubResponse(self.graphql_url, response.status_code, response.headers, response.text)
+		response.raise_for_status()
+
+		payload = response.json()
+		if payload.get("errors"):
+			raise requests.HTTPError(f"GraphQL error: {payload['errors'][0].get('message', 'unknown error')}")
+		return payload.get("data") or {}
+
+github_client = GitHubClient(tokens=[GITHUB_TOKEN] + GITHUB_TOKENS)
+insights_executor = concurrent.futures.ThreadPoolExecutor(max_workers=INSIGHTS_MAX_WORKERS, thread_name_prefix="insights")
+
+web_session = requests.Session()
+web_session.mount("https://", HTTPAdapter(pool_connections=CRAWL_MAX_WORKERS, pool_maxsize=CRAWL_MAX_WORKERS))
+crawl_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CRAWL_MAX_WORKERS, thread_name_prefix="crawl")
+# Separate from the insights and crawl pools so a context fetcher never waits on its own pool
+context_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CONTEXT_MAX_WORKERS, thread_name_prefix="context")
+# httpx.AsyncClient bound to the ASGI app's event loop; opened and closed by its lifespan
+async_http = None
+
+PROJECT_INSIGHTS_QUERY = """
+query ProjectInsights($owner: String!, $name: String!, $since: GitTimestamp!) {
+  repository(owner: $owner, name: $name) {
+    description
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    closedPullRequests: pullRequests(states: [CLOSED, MERGED], first: 100, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { createdAt mergedAt closedAt }
+    }
+    licenseInfo { name }
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(since: $since, first: 100) {
+            totalCount
+            nodes { author { user { login url } } }
+          }
+        }
+      }
+    }
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+      totalSize
+      edges { size node { name } }
+    }
+    codeOfConduct { name }
+    issueTemplates { name }
+    pullRequestTemplates { filename }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { byteSize } }
+    contributing: object(expression: "HEAD:CONTRIBUTING.md") { ... on Blob { byteSize } }
+    githubContributing: object(expression: "HEAD:.github/CONTRIBUTING.md") { ... on Blob { byteSize } }
+    docsContributing: object(expression: "HEAD:docs/CONTRIBUTING.md") { ... on Blob { byteSize } }
+  }
 }
+"""
+
+GUIDE_FILES_QUERY = """
+query GuideFiles($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    url
+    hasIssuesEnabled
+    hasWikiEnabled
+    defaultBranchRef { name }
+    root: object(expression: "HEAD:") { ... on Tree { entries { name type } } }
+    github: object(expression: "HEAD:.github") { ... on Tree { entries { name type } } }
+    docs: object(expression: "HEAD:docs") { ... on Tree { entries { name type } } }
+  }
+}
+"""
+
+class TrendingSnapshotService:
+	"""Serves trending crawls from versioned in-memory snapshots refreshed on a background thread"""
+
+	def __init__(self, crawler, acrawler=None, snapshots: BoundedCache = TRENDING_CACHE, interval: int = TRENDING_REFRESH_INTERVAL, max_pairs: int = TRENDING_MAX_PAIRS, popular_pairs: list = TRENDING_POPULAR_PAIRS):
+		self.crawler = crawler
+		self.acrawler = acrawler
+		self.interval = interval
+		self.max_pairs = max_pairs
+		self.popular_pairs = set(popular_pairs)
+		self.pairs = OrderedDict((pair, True) for pair in popular_pairs)
+		# Snapshots live in a cache namespace, which expires them after two refresh cycles
+		self.snapshots = snapshots
+		self.version = 0
+		self.flights = SingleFlight()
+		self.lock = threading.Lock()
+		self.stop_event = threading.Event()
+		self.thread = None
+
+	@staticmethod
+	def _key(topic: Optional[str], language: Optional[str]) -> tuple:
+		return ((language or "").lower().strip(), (topic or "").lower().strip())
+
+	@staticmethod
+	def _snapshot_key(key: tuple) -> str:
+		return "|".join(key)
+
+	def get(self, topic: Optional[str], language: Optional[str]) -> Optional[Dict[str, Any]]:
+		"""Latest snapshot for the pair, or None if there is none young enough to serve"""
+		if self.interval <= 0:
+			return None
+		return self.snapshots.get(self._touch(topic, language))
+
+	async def aget(self, topic: Optional[str], language: Optional[str]) -> Optional[Dict[str, Any]]:
+		if self.interval <= 0:
+			return None
+		return await self.snapshots.aget(self._touch(topic, language))
+
+	def _touch(self, topic: Optional[str], language: Optional[str]) -> str:
+		"""Mark the pair recently requested and return its snapshot key"""
+		key = self._key(topic, language)
+		with self.lock:
+			if key in self.pairs:
+				self.pairs.move_to_end(key)
+		return self._snapshot_key(key)
+
+	def track(self, topic: Optional[str], language: Optional[str]):
+		"""Add a pair to the refresh set, evicting the least recently requested uncommon pair"""
+		key = self._key(topic, language)
+		with self.lock:
+			self.pairs[key] = True
+			self.pairs.move_to_end(key)
+			while len(self.pairs) > self.max_pairs:
+				evicted = next((pair for pair in self.pairs if pair not in self.popular_pairs), None)
+				if evicted is None:
+					break
+				del self.pairs[evicted]
+				self.snapshots.pop(self._snapshot_key(evicted))
+
+	def store(self, topic: Optional[str], language: Optional[str], crawl: Dict[str, Any]) -> Dict[str, Any]:
+		snapshot_key = self._snapshot_key(self._key(topic, language))
+		current = self.snapshots.get(snapshot_key)
+		# Never replace a usable snapshot with an empty crawl
+		if not crawl["results"] and current:
+			return current
+
+		with self.lock:
+			# Versions keep increasing across restarts when snapshots come back from disk
+			self.version = max(self.version, (current or {}).get("version", 0)) + 1
+			snapshot = dict(crawl, version=self.version, timestamp=time.time())
+		self.snapshots.set(snapshot_key, snapshot)
+		return snapshot
+
+	def crawl(self, topic: Optional[str], language: Optional[str]) -> Dict[str, Any]:
+		"""Crawl a pair live and store the snapshot; concurrent crawls of one pair share a single run"""
+		key = self._key(topic, language)
+
+		def run():
+			return self.store(topic, language, self.crawler(topic=topic or None, language=language or None))
+
+		return self.flights.do(self._snapshot_key(key), run)
+
+	async def acrawl(self, topic: Optional[str], language: Optional[str]) -> Dict[str, Any]:
+		"""crawl() with the async crawler, for callers on the event loop"""
+		key = self._key(topic, language)
+
+		async def run():
+			crawl = await self.acrawler(topic=topic or None, language=language or None)
+			# store() reads and writes the snapshot cache, whose disk tier is blocking
+			return await asyncio.to_thread(self.store, topic, language, crawl)
+
+		return await self.flights.ado(self._snapshot_key(key), run)
+
+	def refresh_all(self):
+		with self.lock:
+			pairs = list(self.pairs)
+
+		for language, topic in pairs:
+			if self.stop_event.is_set():
+				return
+			try:
+				self.crawl(topic, language)
+			except Exception as e:
+				print(f"Error refreshing trending snapshot for {(language, topic)}: {str(e)}")
+
+	def _run(self):
+		while not self.stop_event.is_set():
+			self.refresh_all()
+			self.stop_event.wait(self.interval)
 
-REPO_CACHE = {}
-ISSUE_CACHE = {}
-GUIDE_CACHE = {}
+	def start(self):
+		if self.interval <= 0:
+			return
+		with self.lock:
+			if self.thread is not None:
+				return
+			self.thread = threading.Thread(target=self._run, name="trending-refresher", daemon=True)
+		self.thread.start()
+
+	def stop(self):
+		self.stop_event.set()
 
 class ChatRequestSchema(Schema):
 	conversation_id = fields.Str(required=True)
@@ -58,14 +1088,206 @@ class ChatRequestSchema(Schema):
 
 chat_request_schema = ChatRequestSchema()
 
-class OpenSourceChat:
+class IngestRequestSchema(Schema):
+	documents = fields.List(fields.Str(), required=True)
+	source = fields.Str(missing="admin")
+
+ingest_request_schema = IngestRequestSchema()
+
+class RemoveDocumentsSchema(Schema):
+	document_ids = fields.List(fields.Str(), required=True)
+
+remove_documents_schema = RemoveDocumentsSchema()
+
+def content_hash(text: str) -> str:
+	data = text.encode("utf-8")
+	if _XXHASH_AVAILABLE:
+		return xxhash.xxh3_128_hexdigest(data)
+	return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def embedding_model_id(embeddings) -> str:
+	model = getattr(embeddings, "model_name", None) or getattr(embeddings, "model", None)
+	return f"{type(embeddings).__name__}:{model}"
+
+class CachedEmbeddings(Embeddings):
+	"""Embeddings wrapper that only sends chunks it has never embedded with this model to the backend"""
+
+	def __init__(self, embeddings: Embeddings, path: str, batch_size: int = 500):
+		self.embeddings = embeddings
+		self.model_id = embedding_model_id(embeddings)
+		self.batch_size = batch_size
+		self.hits = 0
+		self.misses = 0
+		self.conn = sqlite3.connect(path, check_same_thread=False)
+		self.conn.execute("PRAGMA journal_mode=WAL")
+		self.conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+		self.conn.commit()
+		self.lock = threading.Lock()
+
+	def _key(self, text: str) -> str:
+		return content_hash(f"{self.model_id}\0{text}")
+
+	def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+		found = {}
+		with self.lock:
+			for start in range(0, len(keys), self.batch_size):
+				batch = keys[start:start + self.batch_size]
+				rows = self.conn.execute(
+					f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(batch))})", batch
+				).fetchall()
+				for key, vector in rows:
+					found[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+		return found
+
+	def _store(self, keyed_vectors: List[tuple]):
+		with self.lock:
+			self.conn.executemany(
+				"INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+				[(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in keyed_vectors]
+			)
+			self.conn.commit()
+
+	def embed_documents(self, texts: List[str]) -> List[List[float]]:
+		keys = [self._key(text) for text in texts]
+		found = self._lookup(list(set(keys)))
+
+		# Embed each missing text once, even if it repeats within the batch
+		missing = {}
+		for key, text in zip(keys, texts):
+			if key not in found:
+				missing.setdefault(key, text)
+
+		self.hits += len(texts) - len(missing)
+		self.misses += len(missing)
+		if missing:
+			vectors = self.embeddings.embed_documents(list(missing.values()))
+			keyed_vectors = list(zip(missing.keys(), vectors))
+			self._store(keyed_vectors)
+			for key, vector in keyed_vectors:
+				found[key] = np.asarray(vector, dtype=np.float32).tolist()
+
+		return [found[key] for key in keys]
+
+	def embed_query(self, text: str) -> List[float]:
+		# Query embeddings can differ from document ones (task type), so they pass straight through
+		return self.embeddings.embed_query(text)
+
+	def stats(self) -> Dict[str, Any]:
+		with self.lock:
+			stored = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+		return {"model": self.model_id, "stored": stored, "hits": self.hits, "misses": self.misses}
+
+class ReadWriteLock:
+	"""Many readers or one writer; a waiting writer holds off new readers so it is not starved"""
+
+	def __init__(self):
+		self.condition = threading.Condition()
+		self.readers = 0
+		self.writer = False
+		self.writers_waiting = 0
+
+	@contextmanager
+	def read(self):
+		with self.condition:
+			while self.writer or self.writers_waiting:
+				self.condition.wait()
+			self.readers += 1
+		try:
+			yield
+		finally:
+			with self.condition:
+				self.readers -= 1
+				if not self.readers:
+					self.condition.notify_all()
+
+	@contextmanager
+	def write(self):
+		with self.condition:
+			self.writers_waiting += 1
+			while self.writer or self.readers:
+				self.condition.wait()
+			self.writers_waiting -= 1
+			self.writer = True
+		try:
+			yield
+		finally:
+			with self.condition:
+				self.writer = False
+				self.condition.notify_all()
+
+class LiveFAISS(FAISS):
+	"""FAISS store changed in place: additions append to the index and removals are tombstoned (filtered
+	out of results) until enough pile up to be worth compacting. Searches hold the read lock, changes
+	the write lock, so a change costs in proportion to the documents it touches, not the corpus."""
+
+	COMPACT_RATIO = 0.25
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.rw_lock = ReadWriteLock()
+		self.tombstones = set()
+		# document_id -> chunk ids of ingested documents, so changes never scan the docstore
+		self.documents = {}
+		for chunk_id, doc in self.docstore._dict.items():
+			document_id = doc.metadata.get("document_id")
+			if document_id:
+				self.documents.setdefault(document_id, []).append(chunk_id)
+
+	def similarity_search_with_score_by_vector(self, embedding, k: int = 4, filter=None, fetch_k: int = 20, **kwargs):
+		with self.rw_lock.read():
+			tombstones = set(self.tombstones)
+			results = super().similarity_search_with_score_by_vector(
+				embedding, k + len(tombstones), filter=filter, fetch_k=fetch_k + len(tombstones), **kwargs
+			)
+		return [(doc, score) for doc, score in results if doc.metadata.get("chunk_id") not in tombstones][:k]
+
+	def max_marginal_relevance_search_with_score_by_vector(self, embedding, *, k: int = 4, fetch_k: int = 20, lambda_mult: float = 0.5, filter=None):
+		with self.rw_lock.read():
+			tombstones = set(self.tombstones)
+			results = super().max_marginal_relevance_search_with_score_by_vector(
+				embedding, k=k + len(tombstones), fetch_k=fetch_k + len(tombstones), lambda_mult=lambda_mult, filter=filter
+			)
+		return [(doc, score) for doc, score in results if doc.metadata.get("chunk_id") not in tombstones][:k]
+
+	def append(self, texts: List[str], vectors: List[List[float]], metadatas: List[dict], ids: List[str]):
+		# Reusing the ids of a tombstoned document needs its old entries gone first
+		if self.tombstones.intersection(ids):
+			self.compact()
+		with self.rw_lock.write():
+			self.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+			for chunk_id, metadata in zip(ids, metadatas):
+				self.documents.setdefault(metadata["document_id"], []).append(chunk_id)
+
+	def tombstone(self, document_ids: List[str]) -> bool:
+		"""Hide the documents from searches; True once tombstones are worth compacting away"""
+		with self.rw_lock.write():
+			for document_id in document_ids:
+				self.tombstones.update(self.documents.pop(document_id, []))
+			return len(self.tombstones) > self.COMPACT_RATIO * max(self.index.ntotal, 1)
+
+	def compact(self):
+		"""Physically delete tombstoned chunks; O(corpus), so only run once enough have piled up"""
+		with self.rw_lock.write():
+			if self.tombstones:
+				self.delete(list(self.tombstones))
+				self.tombstones.clear()
+
+class ChatResources:
+	"""Process-wide heavy objects shared by every conversation: LLM client, embeddings and vectorstore"""
+
+	# Saved index folders and their journals: the 32-hex-digit fingerprint, plus ".journal" for journals
+	INDEX_ENTRY = re.compile(r"([0-9a-f]{32})(\.journal)?")
+
 	def __init__(self):
 		self.llm = ChatGoogleGenerativeAI(
 			model="gemini-2.5-flash-lite",
 			google_api_key=GOOGLE_API_KEY,
 			temperature=0.7,
-			convert_system_message_to_human=True
+			convert_system_message_to_human=True,
+			# Retries happen in the LLM gateway, where they are jittered and bounded by the request deadline
+			max_retries=1
 		)
+		self.github = github_client
 		# Prefer FastEmbed (lightweight, no external quota). Fallback to Google embeddings.
 		self.embeddings = None
 		if _FASTEMBED_AVAILABLE:
@@ -81,31 +1303,26 @@ class OpenSourceChat:
 				)
 			except Exception:
 				self.embeddings = None
+		if self.embeddings is not None and EMBEDDING_CACHE_PATH:
+			try:
+				self.embeddings = CachedEmbeddings(self.embeddings, EMBEDDING_CACHE_PATH)
+			except Exception as e:
+				print(f"Embedding cache disabled, could not open {EMBEDDING_CACHE_PATH}: {str(e)}")
 		self.text_splitter = RecursiveCharacterTextSplitter(
 			chunk_size=1000,
 			chunk_overlap=200,
 			length_function=len
 		)
-
-		self.message_history = ChatMessageHistory()
-		self.memory = ConversationBufferMemory(
-			memory_key='chat_history',
-			output_key='answer',
-			return_messages=True,
-			chat_memory=self.message_history
+		self.guide_splitter = RecursiveCharacterTextSplitter.from_language(
+			Language.MARKDOWN,
+			chunk_size=GUIDE_CHUNK_SIZE,
+			chunk_overlap=GUIDE_CHUNK_SIZE // 8
 		)
 
 		self.vectorstore = None
-		self.conversation_chain = None
-
-		self.user_preferences = {
-			"languages": [],
-			"interests": [],
-			"previous_repos": [],
-			"skill_level": "beginner",
-			"last_queries": [],
-			"preferences_updated": {}
-		}
+		self.fingerprint = None
+		self.journal_entries = 0
+		self.lock = threading.Lock()
 
 	def initialize_vectorstore(self, curated_data: list[str] = None):
 		"""Initialize or update the vector store with curated data. Resilient to failures."""
@@ -113,7 +1330,6 @@ class OpenSourceChat:
 		# Allow disabling RAG via env for constrained deployments
 		if os.environ.get("DISABLE_RAG", "").lower() in {"1", "true", "yes"}:
 			self.vectorstore = None
-			self.conversation_chain = None
 			return
 
 		contributing_guides = [
@@ -169,206 +1385,1092 @@ class OpenSourceChat:
 		# If embeddings are unavailable (e.g., missing deps or API quota), skip RAG gracefully
 		if self.embeddings is None:
 			self.vectorstore = None
-			self.conversation_chain = None
 			return
 
 		chunks = self.text_splitter.split_text("\n".join(all_data))
+		fingerprint = self._vectorstore_fingerprint(chunks)
+		with self.lock:
+			self.fingerprint = fingerprint
+			self.journal_entries = 0
+			vectorstore = self._load_vectorstore(fingerprint)
+			if vectorstore is not None:
+				self.vectorstore = vectorstore
+				# Documents ingested while another corpus or model was in use
+				if self._reingest_documents(vectorstore):
+					self._save_vectorstore(fingerprint)
+				return
+
+			try:
+				self.vectorstore = LiveFAISS.from_texts(texts=chunks, embedding=self.embeddings)
+			except Exception:
+				# Any failure building the vectorstore should not take the server down
+				self.vectorstore = None
+				return
+
+			# Documents ingested into an earlier index come back: from this fingerprint's journal without
+			# re-embedding, otherwise from the ingested-documents log
+			self._replay_journal(self.vectorstore, fingerprint)
+			self._reingest_documents(self.vectorstore)
+			self._save_vectorstore(fingerprint)
+
+	def _ingested_path(self) -> str:
+		return os.path.join(VECTORSTORE_DIR, "ingested.jsonl")
+
+	def _append_ingested(self, record: Dict[str, Any]):
+		"""Log an ingested-document change apart from any index, so it outlives corpus and model changes"""
+		if not VECTORSTORE_DIR:
+			return
 		try:
-			self.vectorstore = FAISS.from_texts(texts=chunks, embedding=self.embeddings)
-			self.conversation_chain = ConversationalRetrievalChain.from_llm(
-				llm=self.llm,
-				retriever=self.vectorstore.as_retriever(search_kwargs={
-					'k': 7,
-					'fetch_k': 20,
-					'search_type': 'similarity',
-				}),
-				memory=self.memory,
-				return_source_documents=True,
-				verbose=True
-			)
-		except Exception:
-			# Any failure building the vectorstore should not take the server down
-			self.vectorstore = None
-			self.conversation_chain = None
+			os.makedirs(VECTORSTORE_DIR, exist_ok=True)
+			with open(self._ingested_path(), "a", encoding="utf-8") as log:
+				log.write(json.dumps(record) + "\n")
+		except Exception as e:
+			print(f"Error writing ingested documents log: {str(e)}")
 
-	def add_message_to_history(self, question: str, answer: str):
-		"""Add a message pair to the conversation history"""
-		self.message_history.add_user_message(question)
-		self.message_history.add_ai_message(answer)
+	def _ingested_documents(self) -> Dict[str, dict]:
+		"""document_id -> {text, source} of the documents ingested and not removed, in ingest order"""
+		documents = {}
+		if not VECTORSTORE_DIR or not os.path.exists(self._ingested_path()):
+			return documents
+		try:
+			with open(self._ingested_path(), encoding="utf-8") as log:
+				for line in log:
+					record = json.loads(line)
+					if record["op"] == "add":
+						documents[record["document_id"]] = {"text": record["text"], "source": record["source"]}
+					elif record["op"] == "remove":
+						for document_id in record["document_ids"]:
+							documents.pop(document_id, None)
+		except Exception as e:
+			print(f"Error reading ingested documents log: {str(e)}")
+		return documents
+
+	def _reingest_documents(self, vectorstore: "LiveFAISS") -> int:
+		"""Embed the logged documents the index is missing; returns how many were added"""
+		missing = [document for document_id, document in self._ingested_documents().items() if document_id not in vectorstore.documents]
+		count = 0
+		for source, group in itertools.groupby(missing, key=lambda document: document["source"]):
+			try:
+				added, _, _ = self._add_documents(vectorstore, [document["text"] for document in group], source)
+				count += len(added)
+			except Exception as e:
+				print(f"Error re-ingesting documents from {source}: {str(e)}")
+		if count:
+			print(f"Re-ingested {count} documents into vectorstore {self.fingerprint}")
+		return count
+
+	def _journal_path(self, fingerprint: str) -> str:
+		return os.path.join(VECTORSTORE_DIR, f"{fingerprint}.journal")
+
+	def _append_journal(self, record: Dict[str, Any]):
+		"""Persist one change as a line of the fingerprint's journal, replayed over the saved index on load;
+		every VECTORSTORE_CHECKPOINT_ENTRIES changes the index is saved instead, so replay stays short"""
+		if not VECTORSTORE_DIR or not self.fingerprint:
+			return
+		if self.journal_entries + 1 >= VECTORSTORE_CHECKPOINT_ENTRIES:
+			self._save_vectorstore(self.fingerprint)
+			return
+		try:
+			os.makedirs(VECTORSTORE_DIR, exist_ok=True)
+			with open(self._journal_path(self.fingerprint), "a", encoding="utf-8") as journal:
+				journal.write(json.dumps(record) + "\n")
+			self.journal_entries += 1
+		except Exception as e:
+			print(f"Error writing vectorstore journal: {str(e)}")
 
-	def get_chat_history(self) -> List[dict]:
-		"""Get the current chat history in a structured format"""
-		messages = self.message_history.messages
-		history = []
+	def _replay_journal(self, vectorstore: "LiveFAISS", fingerprint: str):
+		if not VECTORSTORE_DIR or not os.path.exists(self._journal_path(fingerprint)):
+			return
+		try:
+			with open(self._journal_path(fingerprint), encoding="utf-8") as journal:
+				for line in journal:
+					record = json.loads(line)
+					self.journal_entries += 1
+					if record["op"] == "add":
+						# Already in the saved index when a checkpoint landed before the journal was cleared
+						if record["ids"][0] in vectorstore.docstore._dict and record["ids"][0] not in vectorstore.tombstones:
+							continue
+						vectors = np.frombuffer(base64.b64decode(record["vectors"]), dtype=np.float32).reshape(len(record["ids"]), -1)
+						vectorstore.append(record["texts"], vectors.tolist(), record["metadatas"], record["ids"])
+					elif record["op"] == "remove":
+						vectorstore.tombstone(record["document_ids"])
+		except Exception as e:
+			print(f"Error replaying vectorstore journal {fingerprint}: {str(e)}")
+
+	def ingest_documents(self, texts: List[str], source: str = "admin") -> Dict[str, Any]:
+		"""Add documents to the live vectorstore, embedding only their chunks; documents already present are skipped"""
+		if self.vectorstore is None:
+			raise RuntimeError("The vectorstore is not available")
+
+		# Writers take the lock in turn; chats only wait on the brief in-place append, not on embedding
+		with self.lock:
+			added, skipped, record = self._add_documents(self.vectorstore, texts, source)
+			if record is None:
+				return {"added": [], "skipped": skipped, "chunks": 0}
+
+			for document_id, text in added.items():
+				self._append_ingested({"op": "add", "document_id": document_id, "source": source, "text": text})
+			self._append_journal(record)
+
+		print(f"Ingested {len(added)} documents ({len(record['ids'])} chunks) from {source}")
+		return {"added": list(added), "skipped": skipped, "chunks": len(record["ids"])}
+
+	def _add_documents(self, vectorstore: "LiveFAISS", texts: List[str], source: str) -> tuple:
+		"""Chunk, embed and append the texts the vectorstore does not hold yet.
+		Returns (document_id -> text added, ids skipped, journal record or None)."""
+		present = vectorstore.documents
+		added, skipped = {}, []
+		chunk_texts, metadatas, ids = [], [], []
+		for text in texts:
+			document_id = content_hash(text)
+			if document_id in present or document_id in added:
+				skipped.append(document_id)
+				continue
 
-		for message in messages:
-			if isinstance(message, HumanMessage):
-				history.append({"role": "human", "content": message.content})
-			elif isinstance(message, AIMessage):
-				history.append({"role": "ai", "content": message.content})
+			added[document_id] = text
+			for i, chunk in enumerate(self.text_splitter.split_text(text)):
+				chunk_texts.append(chunk)
+				metadatas.append({"document_id": document_id, "chunk_id": f"{document_id}:{i}", "source": source})
+				ids.append(f"{document_id}:{i}")
 
-		return history
+		if not chunk_texts:
+			return added, skipped, None
 
-	def _extract_language_preferences(self, question: str) -> List[str]:
-		"""Extract programming language preferences from user questions with confidence scoring"""
-		common_languages = [
-			"python", "javascript", "typescript", "java", "c#", "csharp", "c++", "go", "rust",
-			"ruby", "php", "kotlin", "swift", "html", "css", "shell", "scala", "r",
-			"dart", "lua", "perl", "haskell", "julia", "objective-c", "elixir"
-		]
+		vectors = self.embeddings.embed_documents(chunk_texts)
 
-		language_map = {
-			"js": "javascript",
-			"ts": "typescript",
-			"py": "python",
-			"csharp": "c#",
-			"golang": "go",
-			"rb": "ruby",
-			"objective-c": "objectivec",
-			"c++": "cpp",
-			"c plus plus": "cpp"
+		vectorstore.append(chunk_texts, vectors, metadatas, ids)
+		return added, skipped, {
+			"op": "add",
+			"texts": chunk_texts,
+			"metadatas": metadatas,
+			"ids": ids,
+			"vectors": base64.b64encode(np.asarray(vectors, dtype=np.float32).tobytes()).decode("ascii")
 		}
 
-		found_languages = []
+	def remove_documents(self, document_ids: List[str]) -> Dict[str, Any]:
+		"""Drop ingested documents (by the ids ingest_documents returned) from the live vectorstore"""
+		if self.vectorstore is None:
+			raise RuntimeError("The vectorstore is not available")
+
+		with self.lock:
+			vectorstore = self.vectorstore
+			removed = [document_id for document_id in document_ids if document_id in vectorstore.documents]
+			missing = [document_id for document_id in document_ids if document_id not in vectorstore.documents]
+			if not removed:
+				return {"removed": [], "missing": missing}
+
+			self._append_ingested({"op": "remove", "document_ids": removed})
+			if vectorstore.tombstone(removed):
+				# Enough dead chunks to be worth one full rewrite; the checkpoint also clears the journal
+				self._save_vectorstore(self.fingerprint)
+			else:
+				self._append_journal({"op": "remove", "document_ids": removed})
 
-		for lang in common_languages:
-			if re.search(r'\b' + re.escape(lang) + r'\b', question.lower()):
-				if lang in language_map:
-					found_languages.append(language_map[lang])
-				else:
-					found_languages.append(lang)
-
-		language_patterns = [
-			r'(\w+) projects',
-			r'(\w+) repositories',
-			r'(\w+) developers',
-			r'(\w+) programming',
-			r'coding in (\w+)',
-			r'develop in (\w+)',
-			r'(\w+) codebase',
-		]
+		print(f"Removed {len(removed)} ingested documents")
+		return {"removed": removed, "missing": missing}
 
-		for pattern in language_patterns:
-			matches = re.finditer(pattern, question.lower())
-			for match in matches:
-				lang = match.group(1)
-				if lang in common_languages or lang in language_map:
-					final_lang = language_map.get(lang, lang)
-					if final_lang not in found_languages:
-						found_languages.append(final_lang)
+	def list_documents(self) -> List[Dict[str, Any]]:
+		vectorstore = self.vectorstore
+		if vectorstore is None:
+			return []
 
-		return found_languages
+		documents = []
+		with vectorstore.rw_lock.read():
+			ingested = [(document_id, list(chunk_ids)) for document_id, chunk_ids in vectorstore.documents.items()]
+		for document_id, chunk_ids in ingested:
+			first = vectorstore.docstore._dict[chunk_ids[0]]
+			documents.append({
+				"document_id": document_id,
+				"source": first.metadata.get("source"),
+				"chunks": len(chunk_ids),
+				"preview": first.page_content[:120]
+			})
+		return documents
+
+	def _vectorstore_fingerprint(self, chunks: List[str]) -> str:
+		"""Hash of everything that shapes the index: chunk texts, splitter settings and embedding model"""
+		digest = hashlib.sha256()
+		digest.update(json.dumps({
+			"chunk_size": self.text_splitter._chunk_size,
+			"chunk_overlap": self.text_splitter._chunk_overlap,
+			"embedding_model": getattr(self.embeddings, "model_id", None) or embedding_model_id(self.embeddings)
+		}, sort_keys=True).encode("utf-8"))
+		for chunk in chunks:
+			digest.update(b"\0" + chunk.encode("utf-8"))
+		return digest.hexdigest()[:32]
+
+	def _load_vectorstore(self, fingerprint: str):
+		if not VECTORSTORE_DIR:
+			return None
+
+		folder = os.path.join(VECTORSTORE_DIR, fingerprint)
+		if not os.path.isdir(folder):
+			return None
 
-	def _extract_interests(self, question: str) -> List[str]:
-		"""Extract topic interests from user questions with improved pattern matching"""
-		common_interests = [
-			"web", "mobile", "data science", "machine learning", "ai", "game",
-			"database", "frontend", "backend", "fullstack", "devops", "cloud",
-			"security", "blockchain", "iot", "embedded", "desktop", "cli",
-			"networking", "visualization", "automation", "testing", "docs",
-			"documentation", "ui", "ux", "api", "microservices", "serverless",
-			"graphics", "audio", "video", "image processing", "nlp"
-		]
+		try:
+			# Only indexes this process saved itself live here, so unpickling the docstore is safe
+			vectorstore = LiveFAISS.load_local(folder, self.embeddings, allow_dangerous_deserialization=True)
+			self._replay_journal(vectorstore, fingerprint)
+			print(f"Loaded vectorstore {fingerprint} from {VECTORSTORE_DIR}")
+			return vectorstore
+		except Exception as e:
+			print(f"Error loading vectorstore {fingerprint}, rebuilding: {str(e)}")
+			return None
+
+	def _save_vectorstore(self, fingerprint: str):
+		"""Checkpoint: compact, write the full index and start an empty journal"""
+		if not VECTORSTORE_DIR:
+			return
 
-		interest_phrases = {
-			"web development": "web",
-			"web dev": "web",
-			"website": "web",
-			"front end": "frontend",
-			"front-end": "frontend",
-			"back end": "backend",
-			"back-end": "backend",
-			"full stack": "fullstack",
-			"full-stack": "fullstack",
-			"data analysis": "data science",
-			"data analytics": "data science",
-			"ml": "machine learning",
-			"artificial intelligence": "ai",
-			"game development": "game",
-			"game dev": "game",
-			"gaming": "game",
-			"devops": "devops",
-			"cloud computing": "cloud",
-			"cybersecurity": "security",
-			"crypto": "blockchain",
-			"internet of things": "iot",
-			"embedded systems": "embedded",
-			"desktop applications": "desktop",
-			"desktop app": "desktop",
-			"command line": "cli",
-			"command-line": "cli",
-			"terminal": "cli",
-			"network": "networking",
-			"data visualization": "visualization",
-			"automate": "automation",
-			"test": "testing",
-			"document": "documentation",
-			"docs": "documentation",
-			"user interface": "ui",
-			"user experience": "ux",
-			"apis": "api",
-			"rest": "api",
-			"graphql": "api",
-			"micro services": "microservices",
-			"micro-services": "microservices",
-			"serverless": "serverless",
-			"lambda": "serverless",
-			"computer graphics": "graphics",
-			"audio processing": "audio",
-			"video processing": "video",
-			"image": "image processing",
-			"natural language processing": "nlp",
-			"text processing": "nlp"
+		folder = os.path.join(VECTORSTORE_DIR, fingerprint)
+		staging = f"{folder}.{os.getpid()}.tmp"
+		try:
+			self.vectorstore.compact()
+			# Save beside the final folder and rename, so a crash never leaves a half-written index to load
+			with self.vectorstore.rw_lock.read():
+				self.vectorstore.save_local(staging)
+			shutil.rmtree(folder, ignore_errors=True)
+			os.replace(staging, folder)
+			if os.path.exists(self._journal_path(fingerprint)):
+				os.remove(self._journal_path(fingerprint))
+			self.journal_entries = 0
+			self._compact_ingested()
+
+			# Indexes and journals for older corpora or models are never loaded again; anything else in the
+			# directory (the ingested-documents log, staging folders, files that are not ours) is left alone
+			for name in os.listdir(VECTORSTORE_DIR):
+				match = self.INDEX_ENTRY.fullmatch(name)
+				if not match or match.group(1) == fingerprint:
+					continue
+				path = os.path.join(VECTORSTORE_DIR, name)
+				if match.group(2):
+					if os.path.isfile(path):
+						os.remove(path)
+				elif os.path.isdir(path):
+					shutil.rmtree(path, ignore_errors=True)
+			print(f"Saved vectorstore {fingerprint} to {VECTORSTORE_DIR}")
+		except Exception as e:
+			print(f"Error saving vectorstore {fingerprint}: {str(e)}")
+			shutil.rmtree(staging, ignore_errors=True)
+
+	def _compact_ingested(self):
+		"""Rewrite the ingested-documents log without the removed documents"""
+		if not os.path.exists(self._ingested_path()):
+			return
+		staging = f"{self._ingested_path()}.{os.getpid()}.tmp"
+		with open(staging, "w", encoding="utf-8") as log:
+			for document_id, document in self._ingested_documents().items():
+				log.write(json.dumps({"op": "add", "document_id": document_id, **document}) + "\n")
+		os.replace(staging, self._ingested_path())
+
+def estimate_tokens(text: str) -> int:
+	# Gemini averages about four characters per token on English prose and markdown
+	return (len(text) + 3) // 4
+
+class PromptAssembler:
+	"""Fits prompt sections into a token budget, giving the space to the highest-priority sections first"""
+
+	def __init__(self, budget: int = PROMPT_TOKEN_BUDGET, min_section_tokens: int = 40):
+		self.budget = budget
+		self.min_section_tokens = min_section_tokens
+
+	@staticmethod
+	def _trim_note(count: int, unit: str) -> str:
+		return f"\n[... {count} more {unit} trimmed to fit the prompt budget]"
+
+	def _trim(self, text: str, max_tokens: int) -> str:
+		"""Whole lines of text up to max_tokens (or, when not even the first line fits, as many of its
+		characters), with a note of how much was cut; empty when nothing fits"""
+		lines = text.split("\n")
+		# The note's room is reserved for its longest possible count
+		room = max_tokens - estimate_tokens(self._trim_note(len(lines), "lines"))
+		kept = []
+		used = 0
+		for line in lines:
+			cost = estimate_tokens(line + "\n")
+			if used + cost > room:
+				break
+			kept.append(line)
+			used += cost
+		if kept:
+			return "\n".join(kept) + self._trim_note(len(lines) - len(kept), "lines")
+
+		room = max_tokens - estimate_tokens(self._trim_note(len(text), "characters"))
+		head = text[:max(room, 0) * 4]
+		if not head.strip():
+			return ""
+		return head + self._trim_note(len(text) - len(head), "characters")
+
+	def assemble(self, header: str, sections: List[Dict[str, Any]], footer: str) -> tuple:
+		"""Return (prompt, report). Sections are dicts with name, title, text and priority (lower goes first)
+		and keep their given order in the prompt; header and footer are always included."""
+		remaining = self.budget - estimate_tokens(header) - estimate_tokens(footer)
+		rendered = {}
+		report = {"budget": self.budget, "sections": {}, "trimmed": [], "dropped": []}
+
+		for section in sorted(sections, key=lambda section: section["priority"]):
+			name = section["name"]
+			block = f"\n{section['title']}:\n{section['text']}\n"
+			cost = estimate_tokens(block)
+			if cost > remaining:
+				if remaining < self.min_section_tokens:
+					report["dropped"].append(name)
+					continue
+				trimmed = self._trim(section["text"], remaining - estimate_tokens(f"\n{section['title']}:\n\n"))
+				if not trimmed:
+					report["dropped"].append(name)
+					continue
+				block = f"\n{section['title']}:\n{trimmed}\n"
+				cost = estimate_tokens(block)
+				report["trimmed"].append(name)
+			rendered[name] = block
+			report["sections"][name] = cost
+			remaining -= cost
+
+		prompt = header + "".join(rendered[section["name"]] for section in sections if section["name"] in rendered) + footer
+		report["tokens"] = estimate_tokens(prompt)
+		return prompt, report
+
+prompt_assembler = PromptAssembler()
+
+# The retrieval chain answers with the assembled system prompt and the passages it retrieved
+RETRIEVAL_PROMPT = ChatPromptTemplate.from_messages([
+	("system", "{system_message}\n\nKNOWLEDGE BASE:\n{context}"),
+	("human", "{question}")
+])
+
+class BudgetedRetrievalChain(ConversationalRetrievalChain):
+	"""Retrieval chain that only stuffs the passages fitting the room the assembled prompt left,
+	given as the knowledge_tokens input"""
+
+	@staticmethod
+	def _fit(docs: list, inputs: Dict[str, Any]) -> list:
+		room = inputs.get("knowledge_tokens")
+		if room is None:
+			return docs
+		kept = []
+		for doc in docs:
+			room -= estimate_tokens(doc.page_content + "\n")
+			if room < 0:
+				break
+			kept.append(doc)
+		return kept
+
+	def _get_docs(self, question, inputs, *, run_manager):
+		return self._fit(super()._get_docs(question, inputs, run_manager=run_manager), inputs)
+
+	async def _aget_docs(self, question, inputs, *, run_manager):
+		return self._fit(await super()._aget_docs(question, inputs, run_manager=run_manager), inputs)
+
+class AnswerCache:
+	"""LLM answers to earlier questions, bucketed by a fingerprint of the profile and real-time context
+	they were answered against, and matched by question embedding within a bucket"""
+
+	def __init__(self, store: BoundedCache, similarity: float = ANSWER_CACHE_SIMILARITY, max_per_context: int = 20):
+		self.store = store
+		self.similarity = similarity
+		self.max_per_context = max_per_context
+		self.hits = 0
+		self.semantic_hits = 0
+		self.misses = 0
+		self.lock = threading.Lock()
+		self.store_lock = threading.Lock()
+
+	@property
+	def enabled(self) -> bool:
+		return self.similarity > 0
+
+	@staticmethod
+	def normalize(question: str) -> str:
+		return " ".join(re.sub(r"[^\w\s/#+.-]", " ", question.lower()).split())
+
+	def _live_items(self, fingerprint: str) -> List[dict]:
+		entry = self.store.get(fingerprint)
+		if entry is None:
+			return []
+		oldest = time.time() - self.store.expiry
+		return [item for item in entry["data"] if item["timestamp"] > oldest]
+
+	def lookup(self, fingerprint: str, question: str, embeddings=None) -> tuple:
+		"""(answer or None, question vector or None); the vector is handed back to store() on a miss"""
+		normalized = self.normalize(question)
+		items = self._live_items(fingerprint)
+
+		for item in items:
+			if item["question"] == normalized:
+				with self.lock:
+					self.hits += 1
+				return item["answer"], None
+
+		vector = None
+		if embeddings is not None:
+			try:
+				vector = np.asarray(embeddings.embed_query(normalized), dtype=np.float32)
+			except Exception as e:
+				print(f"Error embedding question for the answer cache: {str(e)}")
+
+		if vector is not None and items:
+			stored = [item for item in items if item.get("vector")]
+			if stored:
+				matrix = np.stack([np.frombuffer(base64.b64decode(item["vector"]), dtype=np.float32) for item in stored])
+				norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(vector) or 1.0)
+				scores = (matrix @ vector) / np.where(norms == 0, 1.0, norms)
+				best = int(np.argmax(scores))
+				if scores[best] >= self.similarity:
+					with self.lock:
+						self.hits += 1
+						self.semantic_hits += 1
+					print(f"Answer cache hit ({scores[best]:.3f}) for: {normalized}")
+					return stored[best]["answer"], vector
+
+		with self.lock:
+			self.misses += 1
+		return None, vector
+
+	def store_answer(self, fingerprint: str, question: str, answer: str, vector=None):
+		item = {
+			"question": self.normalize(question),
+			"answer": answer,
+			"vector": base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii") if vector is not None else None,
+			"timestamp": time.time()
 		}
+		# Read-modify-write of the bucket; concurrent stores to one fingerprint would otherwise drop answers
+		with self.store_lock:
+			items = self._live_items(fingerprint)
+			items.append(item)
+			self.store.set(fingerprint, {"data": items[-self.max_per_context:], "timestamp": time.time()})
+
+	def stats(self) -> Dict[str, Any]:
+		with self.lock:
+			return {
+				"enabled": self.enabled,
+				"similarity": self.similarity,
+				"hits": self.hits,
+				"semantic_hits": self.semantic_hits,
+				"misses": self.misses
+			}
 
-		found_interests = []
+answer_cache = AnswerCache(ANSWER_CACHE)
+
+class LLMOverloaded(Exception):
+	"""The LLM queue is full, or the request's deadline passed before a slot or retry came up"""
+
+	def __init__(self, message: str, retry_after: int = 5):
+		super().__init__(message)
+		self.retry_after = retry_after
+
+class LLMGateway:
+	"""Admission control in front of the LLM: at most `max_concurrency` calls in flight, a bounded
+	FIFO queue (shared by threads and event loops) behind them, and rate-limited calls retried with
+	jittered exponential backoff inside each request's deadline"""
+
+	def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, queue_size: int = LLM_QUEUE_SIZE, deadline: float = LLM_REQUEST_DEADLINE, max_retries: int = LLM_MAX_RETRIES, base_backoff: float = 1.0, max_backoff: float = 20.0):
+		self.max_concurrency = max_concurrency
+		self.queue_size = queue_size
+		self.deadline = deadline
+		self.max_retries = max_retries
+		self.base_backoff = base_backoff
+		self.max_backoff = max_backoff
+		self.lock = threading.Lock()
+		self.in_flight = 0
+		# (waiter, wake) pairs; a released slot is handed straight to the oldest waiter
+		self.waiters = deque()
+		self.wait_times = deque(maxlen=500)
+		self.admitted = 0
+		self.shed = 0
+		self.timeouts = 0
+		self.retries = 0
+		self.rate_limited = 0
+		self.failures = 0
+
+	def _admit(self, waiter, wake) -> bool:
+		"""Take a free slot (True) or join the queue (False); raises when the queue is full"""
+		with self.lock:
+			if self.in_flight < self.max_concurrency and not self.waiters:
+				self.in_flight += 1
+				self.admitted += 1
+				self.wait_times.append(0.0)
+				return True
+			if len(self.waiters) >= self.queue_size:
+				self.shed += 1
+				raise LLMOverloaded(f"LLM queue is full ({self.queue_size} waiting)")
+			self.waiters.append((waiter, wake))
+			return False
+
+	def _abandon(self, waiter) -> bool:
+		"""Leave the queue; False if a slot was handed over in the meantime (the caller now holds it)"""
+		with self.lock:
+			for index, (queued, _) in enumerate(self.waiters):
+				if queued is waiter:
+					del self.waiters[index]
+					return True
+			return False
+
+	def _admitted_after(self, started: float):
+		with self.lock:
+			self.admitted += 1
+			self.wait_times.append(time.time() - started)
+
+	def _release(self):
+		with self.lock:
+			if self.waiters:
+				_, wake = self.waiters.popleft()
+				wake()
+			else:
+				self.in_flight -= 1
 
-		for interest in common_interests:
-			if interest in question.lower():
-				found_interests.append(interest)
+	def _acquire(self, deadline: float):
+		waiter = threading.Event()
+		if self._admit(waiter, waiter.set):
+			return
+		started = time.time()
+		if not waiter.wait(max(deadline - started, 0)) and self._abandon(waiter):
+			with self.lock:
+				self.timeouts += 1
+			raise LLMOverloaded("Timed out waiting for the LLM")
+		self._admitted_after(started)
 
-		for phrase, canonical in interest_phrases.items():
-			if phrase in question.lower() and canonical not in found_interests:
-				found_interests.append(canonical)
+	async def _aacquire(self, deadline: float):
+		loop = asyncio.get_running_loop()
+		waiter = loop.create_future()
 
-		return found_interests
+		def wake():
+			loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
 
-	def _extract_skill_level(self, question: str) -> str:
-		"""Extract skill level indicators from user questions"""
+		if self._admit(waiter, wake):
+			return
+		started = time.time()
+		try:
+			await asyncio.wait_for(asyncio.shield(waiter), max(deadline - started, 0))
+		except asyncio.TimeoutError:
+			if self._abandon(waiter):
+				with self.lock:
+					self.timeouts += 1
+				raise LLMOverloaded("Timed out waiting for the LLM")
+		except asyncio.CancelledError:
+			if not self._abandon(waiter):
+				self._release()
+			raise
+		self._admitted_after(started)
+
+	@staticmethod
+	def is_rate_limited(e: Exception) -> bool:
+		code = getattr(e, "code", None) or getattr(e, "status_code", None)
+		text = str(e).lower()
+		return code == 429 or "429" in text or "resource exhausted" in text or "resourceexhausted" in type(e).__name__.lower() or "quota" in text
+
+	def _retry_delay(self, e: Exception, attempt: int, deadline: float) -> Optional[float]:
+		"""Seconds to back off before retrying, or None when the error should surface"""
+		if not self.is_rate_limited(e):
+			with self.lock:
+				self.failures += 1
+			return None
+		with self.lock:
+			self.rate_limited += 1
+		if attempt >= self.max_retries:
+			return None
+		delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+		if time.time() + delay >= deadline:
+			return None
+		with self.lock:
+			self.retries += 1
+		print(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+		return delay
+
+	def call(self, fn, *args, deadline: Optional[float] = None, **kwargs):
+		"""Run a blocking LLM call (invoke, a chain) under the gateway"""
+		deadline = deadline or time.time() + self.deadline
+		attempt = 0
+		while True:
+			self._acquire(deadline)
+			try:
+				return fn(*args, **kwargs)
+			except Exception as e:
+				delay = self._retry_delay(e, attempt, deadline)
+				if delay is None:
+					raise
+			finally:
+				self._release()
+			attempt += 1
+			time.sleep(delay)
+
+	def invoke(self, llm, messages, **kwargs):
+		return self.call(llm.invoke, messages, **kwargs)
+
+	def stream(self, llm, messages, deadline: Optional[float] = None):
+		"""llm.stream under the gateway; only failures before the first chunk are retried"""
+		deadline = deadline or time.time() + self.deadline
+		attempt = 0
+		while True:
+			self._acquire(deadline)
+			started = False
+			try:
+				for chunk in llm.stream(messages):
+					started = True
+					yield chunk
+				return
+			except Exception as e:
+				delay = None if started else self._retry_delay(e, attempt, deadline)
+				if delay is None:
+					raise
+			finally:
+				self._release()
+			attempt += 1
+			time.sleep(delay)
+
+	async def acall(self, fn, *args, deadline: Optional[float] = None, **kwargs):
+		"""Await an async LLM call (ainvoke, a chain's ainvoke) under the gateway"""
+		deadline = deadline or time.time() + self.deadline
+		attempt = 0
+		while True:
+			await self._aacquire(deadline)
+			try:
+				return await fn(*args, **kwargs)
+			except Exception as e:
+				delay = self._retry_delay(e, attempt, deadline)
+				if delay is None:
+					raise
+			finally:
+				self._release()
+			attempt += 1
+			await asyncio.sleep(delay)
+
+	async def ainvoke(self, llm, messages, **kwargs):
+		return await self.acall(llm.ainvoke, messages, **kwargs)
+
+	async def astream(self, llm, messages, deadline: Optional[float] = None):
+		deadline = deadline or time.time() + self.deadline
+		attempt = 0
+		while True:
+			await self._aacquire(deadline)
+			started = False
+			try:
+				async for chunk in llm.astream(messages):
+					started = True
+					yield chunk
+				return
+			except Exception as e:
+				delay = None if started else self._retry_delay(e, attempt, deadline)
+				if delay is None:
+					raise
+			finally:
+				self._release()
+			attempt += 1
+			await asyncio.sleep(delay)
+
+	def stats(self) -> Dict[str, Any]:
+		with self.lock:
+			waits = sorted(self.wait_times)
+			return {
+				"max_concurrency": self.max_concurrency,
+				"in_flight": self.in_flight,
+				"queue_depth": len(self.waiters),
+				"queue_size": self.queue_size,
+				"admitted": self.admitted,
+				"shed": self.shed,
+				"timeouts": self.timeouts,
+				"retries": self.retries,
+				"rate_limited": self.rate_limited,
+				"failures": self.failures,
+				"wait_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+				"wait_p95": round(waits[int(len(waits) * 0.95) - 1 if len(waits) >= 20 else -1], 3) if waits else 0.0,
+				"wait_max": round(waits[-1], 3) if waits else 0.0
+			}
 
-		current_level = self.user_preferences.get("skill_level", "beginner")
+llm_gateway = LLMGateway()
+
+# Vocabulary for extract_entities. Each phrase maps to one or more (kind, value) entities.
+COMMON_LANGUAGES = [
+	"python", "javascript", "typescript", "java", "c#", "csharp", "c++", "go", "rust",
+	"ruby", "php", "kotlin", "swift", "html", "css", "shell", "scala", "r",
+	"dart", "lua", "perl", "haskell", "julia", "objective-c", "elixir"
+]
+
+LANGUAGE_MAP = {
+	"js": "javascript",
+	"ts": "typescript",
+	"py": "python",
+	"csharp": "c#",
+	"golang": "go",
+	"rb": "ruby",
+	"objective-c": "objectivec",
+	"c++": "cpp",
+	"c plus plus": "cpp"
+}
 
-		beginner_phrases = [
-			"new to", "beginner", "starting out", "first time", "never contributed",
-			"no experience", "newbie", "noob", "just learning", "just started",
-			"learning to code", "new developer", "learning programming", "novice"
-		]
+# Aliases outside COMMON_LANGUAGES only count as a language in these contexts ("js projects", "coding in py")
+LANGUAGE_CONTEXT_SUFFIXES = ["projects", "repositories", "developers", "programming", "codebase"]
+LANGUAGE_CONTEXT_PREFIXES = ["coding in", "develop in"]
+
+COMMON_INTERESTS = [
+	"web", "mobile", "data science", "machine learning", "ai", "game",
+	"database", "frontend", "backend", "fullstack", "devops", "cloud",
+	"security", "blockchain", "iot", "embedded", "desktop", "cli",
+	"networking", "visualization", "automation", "testing", "docs",
+	"documentation", "ui", "ux", "api", "microservices", "serverless",
+	"graphics", "audio", "video", "image processing", "nlp"
+]
+
+INTEREST_PHRASES = {
+	"web development": "web",
+	"web dev": "web",
+	"website": "web",
+	"front end": "frontend",
+	"front-end": "frontend",
+	"back end": "backend",
+	"back-end": "backend",
+	"full stack": "fullstack",
+	"full-stack": "fullstack",
+	"data analysis": "data science",
+	"data analytics": "data science",
+	"ml": "machine learning",
+	"artificial intelligence": "ai",
+	"game development": "game",
+	"game dev": "game",
+	"gaming": "game",
+	"devops": "devops",
+	"cloud computing": "cloud",
+	"cybersecurity": "security",
+	"crypto": "blockchain",
+	"internet of things": "iot",
+	"embedded systems": "embedded",
+	"desktop applications": "desktop",
+	"desktop app": "desktop",
+	"command line": "cli",
+	"command-line": "cli",
+	"terminal": "cli",
+	"network": "networking",
+	"data visualization": "visualization",
+	"automate": "automation",
+	"test": "testing",
+	"document": "documentation",
+	"docs": "documentation",
+	"user interface": "ui",
+	"user experience": "ux",
+	"apis": "api",
+	"rest": "api",
+	"graphql": "api",
+	"micro services": "microservices",
+	"micro-services": "microservices",
+	"serverless": "serverless",
+	"lambda": "serverless",
+	"computer graphics": "graphics",
+	"audio processing": "audio",
+	"video processing": "video",
+	"image": "image processing",
+	"natural language processing": "nlp",
+	"text processing": "nlp"
+}
 
-		intermediate_phrases = [
-			"some experience", "intermediate", "familiar with", "worked with",
-			"contributed before", "have experience", "comfortable with",
-			"have used", "know how to", "proficient"
-		]
+# Checked in this order; the first level with a matching phrase wins
+SKILL_PHRASES = {
+	"beginner": [
+		"new to", "beginner", "starting out", "first time", "never contributed",
+		"no experience", "newbie", "noob", "just learning", "just started",
+		"learning to code", "new developer", "learning programming", "novice"
+	],
+	"intermediate": [
+		"some experience", "intermediate", "familiar with", "worked with",
+		"contributed before", "have experience", "comfortable with",
+		"have used", "know how to", "proficient"
+	],
+	"advanced": [
+		"advanced", "expert", "very experienced", "senior", "professional",
+		"extensive experience", "many years", "maintain", "core contributor",
+		"lead developer", "architect"
+	]
+}
 
-		advanced_phrases = [
-			"advanced", "expert", "very experienced", "senior", "professional",
-			"extensive experience", "many years", "maintain", "core contributor",
-			"lead developer", "architect"
-		]
+INTENT_KEYWORDS = {
+	"repositories": ["repository", "repositories", "repos", "projects"],
+	"issues": ["issue"],
+	"contribute": ["contribute", "contributing", "contribution"],
+	"guide": ["guide", "how to", "steps", "process"],
+	"trending": ["trend", "trending", "popular", "new", "latest", "crawl"],
+	"insights": ["insight", "activity", "stats", "statistics", "health"],
+	"help": ["help", "assistance", "stuck", "problem", "error"]
+}
+
+REPO_PATTERN = re.compile(r'([a-zA-Z0-9][a-zA-Z0-9\-]*/[a-zA-Z0-9\.\-_]+)')
+
+def _build_entity_matcher():
+	"""One alternation over every phrase, plus the table mapping matched text to its entities"""
+	table = {}
+	endings = {}
+
+	def add(phrase: str, kind: str, value: str, rank: int, ending: str = ""):
+		table.setdefault(phrase, {})
+		table[phrase][(kind, value)] = min(rank, table[phrase].get((kind, value), rank))
+		if ending:
+			endings[phrase] = ending
+
+	for rank, lang in enumerate(COMMON_LANGUAGES):
+		add(lang, "languages", LANGUAGE_MAP.get(lang, lang), rank)
+	context_rank = len(COMMON_LANGUAGES)
+	for alias, lang in LANGUAGE_MAP.items():
+		if alias in COMMON_LANGUAGES or not re.fullmatch(r"\w+", alias):
+			continue
+		for suffix in LANGUAGE_CONTEXT_SUFFIXES:
+			add(f"{alias} {suffix}", "languages", lang, context_rank)
+		for prefix in LANGUAGE_CONTEXT_PREFIXES:
+			add(f"{prefix} {alias}", "languages", lang, context_rank)
+
+	# Intent keywords and interests are stems that also match their inflections ("contributed", "guidelines",
+	# "newest", "tests"); stems this short would match unrelated words ("cli" in "client"), so they only pluralize
+	def stem_ending(phrase: str) -> str:
+		return ENTITY_INFLECTED if len(phrase) >= 4 else ENTITY_PLURAL
+
+	for rank, interest in enumerate(COMMON_INTERESTS):
+		add(interest, "interests", interest, rank, stem_ending(interest))
+	for rank, (phrase, interest) in enumerate(INTEREST_PHRASES.items(), start=len(COMMON_INTERESTS)):
+		add(phrase, "interests", interest, rank, stem_ending(phrase))
+
+	for rank, (level, phrases) in enumerate(SKILL_PHRASES.items()):
+		for phrase in phrases:
+			add(phrase, "skill_level", level, rank)
+
+	for intent, keywords in INTENT_KEYWORDS.items():
+		for keyword in keywords:
+			add(keyword, "intents", intent, 0, ENTITY_INFLECTED)
+
+	# Longest alternatives first means a match is the longest phrase starting there, so a phrase
+	# also carries the entities of every shorter phrase inside it ("new to" is still "new", "apis" is "api")
+	for phrase, entities in table.items():
+		for other, other_entities in table.items():
+			inside = f" {other} " in f" {phrase} "
+			plural_of = other in endings and phrase in (f"{other}s", f"{other}es")
+			if other != phrase and (inside or plural_of):
+				for entity, rank in other_entities.items():
+					entities[entity] = min(rank, entities.get(entity, rank))
+
+	alternatives = []
+	for phrase in sorted(table, key=len, reverse=True):
+		alternatives.append(re.escape(phrase) + endings.get(phrase, ""))
+	pattern = re.compile(r"(?<!\w)(?=(" + "|".join(alternatives) + r")(?!\w))")
+	return pattern, table, {phrase: re.compile(ending) for phrase, ending in endings.items()}
+
+ENTITY_INFLECTED = r"\w*"
+ENTITY_PLURAL = r"(?:e?s)?"
+ENTITY_PATTERN, ENTITY_TABLE, ENTITY_ENDINGS = _build_entity_matcher()
+
+def _entity_phrase(text: str) -> Optional[str]:
+	"""The table phrase a match is, or is an inflection of: the longest one the rest is a valid ending for"""
+	if text in ENTITY_TABLE:
+		return text
+	for end in range(len(text) - 1, 0, -1):
+		ending = ENTITY_ENDINGS.get(text[:end])
+		if ending is not None and ending.fullmatch(text[end:]):
+			return text[:end]
+	return None
+
+@functools.lru_cache(maxsize=4096)
+def extract_entities(question: str) -> Dict[str, Any]:
+	"""Languages, interests, skill level, intents and repo named in a question, from one scan. Treat the result as read-only."""
+	found = {}
+	for match in ENTITY_PATTERN.finditer(question.lower()):
+		phrase = _entity_phrase(match.group(1))
+		entities = ENTITY_TABLE[phrase] if phrase else {}
+		for entity, rank in entities.items():
+			found[entity] = min(rank, found.get(entity, rank))
+
+	def ranked(kind: str) -> tuple:
+		return tuple(value for (k, value), _ in sorted(found.items(), key=lambda item: item[1]) if k == kind)
+
+	skill_levels = ranked("skill_level")
+	repo = REPO_PATTERN.search(question)
+	return {
+		"languages": ranked("languages"),
+		"interests": ranked("interests"),
+		"skill_level": skill_levels[0] if skill_levels else None,
+		"intents": frozenset(ranked("intents")),
+		"repo": repo.group(1) if repo else None
+	}
+
+class OpenSourceChat:
+	"""One conversation: history, memory and preferences over the shared ChatResources"""
+
+	def __init__(self, resources: Optional[ChatResources] = None):
+		self.resources = resources or chat_resources
+		self.llm = self.resources.llm
+		self.embeddings = self.resources.embeddings
+		self.github = self.resources.github
+
+		# Memory for the LLM: the recent window of turns plus a summary, written only by add_message_to_history
+		self.message_history = ChatMessageHistory()
+
+		# The memory above only holds the recent window (plus a summary); this is what the client is shown
+		self.history_lock = threading.Lock()
+		self.transcript = deque(maxlen=HISTORY_MAX_MESSAGES)
+		self.history_cursor = 0
+		self.summary = ""
+		self._summarizing = False
+
+		self._conversation_chain = None
+		self._chain_vectorstore = None
+
+		self.user_preferences = self._default_preferences()
+
+	@staticmethod
+	def _default_preferences() -> dict:
+		return {
+			"languages": [],
+			"interests": [],
+			"previous_repos": [],
+			"skill_level": "beginner",
+			"last_queries": [],
+			"preferences_updated": {}
+		}
+
+	@property
+	def vectorstore(self):
+		return self.resources.vectorstore
+
+	@property
+	def conversation_chain(self):
+		"""This conversation's retrieval chain over the shared vectorstore, rebuilt only if the store changes"""
+		vectorstore = self.resources.vectorstore
+		if vectorstore is None:
+			return None
+
+		if self._chain_vectorstore is not vectorstore:
+			self._conversation_chain = BudgetedRetrievalChain.from_llm(
+				llm=self.llm,
+				retriever=vectorstore.as_retriever(search_kwargs={
+					'k': 7,
+					'fetch_k': 20,
+					'search_type': 'similarity',
+				}),
+				combine_docs_chain_kwargs={"prompt": RETRIEVAL_PROMPT},
+				return_source_documents=True,
+				verbose=True
+			)
+			self._chain_vectorstore = vectorstore
+		return self._conversation_chain
+
+	def initialize_vectorstore(self, curated_data: list[str] = None):
+		"""Initialize or update the shared vector store with curated data"""
+		self.resources.initialize_vectorstore(curated_data)
+
+	def reset(self):
+		"""Forget this conversation's history and preferences; shared resources are untouched"""
+		with self.history_lock:
+			self.message_history.clear()
+			self.transcript.clear()
+			self.summary = ""
+		self.user_preferences = self._default_preferences()
+
+	def add_message_to_history(self, question: str, answer: str):
+		"""Add a message pair to the conversation history"""
+		with self.history_lock:
+			for role, content in (("human", question), ("ai", answer)):
+				self.transcript.append({"id": self.history_cursor, "role": role, "content": content})
+				self.history_cursor += 1
+
+			self.message_history.add_user_message(question)
+			self.message_history.add_ai_message(answer)
+
+			fold = (
+				MEMORY_WINDOW_TURNS > 0
+				and not self._summarizing
+				and len(self._memory_window()) > 2 * MEMORY_WINDOW_TURNS
+			)
+			if fold:
+				self._summarizing = True
+
+		if fold:
+			refresh_executor.submit(self._fold_into_summary)
+
+	def _memory_window(self) -> list:
+		return [message for message in self.message_history.messages if not isinstance(message, SystemMessage)]
 
-		for phrase in beginner_phrases:
-			if re.search(r'\b' + re.escape(phrase) + r'\b', question.lower()):
-				return "beginner"
+	def _chain_history(self) -> list:
+		"""chat_history for the retrieval chain: the summary message (once folded) and the recent window"""
+		with self.history_lock:
+			return list(self.message_history.messages)
 
-		for phrase in intermediate_phrases:
-			if re.search(r'\b' + re.escape(phrase) + r'\b', question.lower()):
-				return "intermediate"
+	def _fold_into_summary(self):
+		"""Summarize the turns that fell out of the memory window, off the request path"""
+		try:
+			# Turns added while the LLM was summarizing are folded on the next pass
+			while self._fold_once():
+				pass
+		except Exception as e:
+			print(f"Error folding conversation memory: {str(e)}")
+		finally:
+			with self.history_lock:
+				self._summarizing = False
+
+	def _fold_once(self) -> bool:
+		with self.history_lock:
+			window = self._memory_window()
+			overflow = window[:len(window) - 2 * MEMORY_WINDOW_TURNS]
+			summary = self.summary
+		if not overflow:
+			return False
+
+		lines = "\n".join(
+			f"{'User' if isinstance(message, HumanMessage) else 'Assistant'}: {message.content}"
+			for message in overflow
+		)
+		try:
+			response = llm_gateway.invoke(self.llm, [
+				{"role": "system", "content": "Progressively summarize the conversation between a user and an open-source contribution assistant. Keep the user's goals, preferences and the repositories discussed. Reply with the new summary only."},
+				{"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew lines of conversation:\n{lines}"}
+			])
+			summary = response.content.strip()
+		except Exception as e:
+			print(f"Error summarizing conversation: {str(e)}")
+			summary = f"{summary}\n{lines}".strip()
+		summary = summary[-MEMORY_SUMMARY_MAX_CHARS:]
+
+		with self.history_lock:
+			window = self._memory_window()
+			# A reset while summarizing leaves nothing to fold
+			if len(window) < len(overflow) or any(a is not b for a, b in zip(window, overflow)):
+				return False
+			self.summary = summary
+			self.message_history.clear()
+			self.message_history.add_messages(
+				[SystemMessage(content=f"Summary of the earlier conversation: {summary}")] + window[len(overflow):]
+			)
+		return True
+
+	def get_chat_history(self, since: int = 0, limit: Optional[int] = None) -> List[dict]:
+		"""Get the retained chat history from message id `since` onwards in a structured format"""
+		with self.history_lock:
+			start = max(since - (self.history_cursor - len(self.transcript)), 0)
+			end = None if limit is None else start + limit
+			return list(itertools.islice(self.transcript, start, end))
+
+	def history_page(self, cursor: int = 0, limit: int = HISTORY_PAGE_SIZE) -> Dict[str, Any]:
+		"""One page of history for /api/history; pass next_cursor back to continue"""
+		messages = self.get_chat_history(cursor, limit)
+		with self.history_lock:
+			first_cursor = self.history_cursor - len(self.transcript)
+			history_cursor = self.history_cursor
+			summary = self.summary
+		next_cursor = messages[-1]["id"] + 1 if messages else max(cursor, first_cursor)
+
+		return {
+			"messages": messages,
+			"summary": summary,
+			"first_cursor": first_cursor,
+			"next_cursor": next_cursor,
+			"history_cursor": history_cursor,
+			"has_more": next_cursor < history_cursor
+		}
+
+	def _extract_language_preferences(self, question: str) -> List[str]:
+		"""Extract programming language preferences from user questions"""
+		return list(extract_entities(question)["languages"])
 
-		for phrase in advanced_phrases:
-			if re.search(r'\b' + re.escape(phrase) + r'\b', question.lower()):
-				return "advanced"
+	def _extract_interests(self, question: str) -> List[str]:
+		"""Extract topic interests from user questions"""
+		return list(extract_entities(question)["interests"])
 
-		return current_level
+	def _extract_skill_level(self, question: str) -> str:
+		"""Extract skill level indicators from user questions"""
+		return extract_entities(question)["skill_level"] or self.user_preferences.get("skill_level", "beginner")
 
 	def _update_user_preferences(self, question: str):
 		current_time = time.time()
@@ -401,21 +2503,50 @@ class OpenSourceChat:
 			self.user_preferences["skill_level"] = skill_level
 
 	def search_repositories(self, query: str = "", language: str = "", force_refresh: bool = False) -> list[dict]:
-		normalized_query = query.lower().strip() if query else ""
-		normalized_language = language.lower().strip() if language else ""
-		cache_key = f"{normalized_query}_{normalized_language}"
+		# The cache is shared across sessions, so it is keyed on the query this session's preferences produced
+		full_query, params = self._repository_search(query.strip() if query else "", language.strip() if language else "")
+		cache_key = f"repos_{full_query.lower()}"
+
+		return REPO_CACHE.get_or_load(cache_key, lambda: self._fetch_repositories(full_query, params, cache_key), force_refresh)
+
+	async def asearch_repositories(self, query: str = "", language: str = "", force_refresh: bool = False) -> list[dict]:
+		"""search_repositories with the upstream fetch awaited on the event loop"""
+		full_query, params = self._repository_search(query.strip() if query else "", language.strip() if language else "")
+		cache_key = f"repos_{full_query.lower()}"
+
+		return await REPO_CACHE.aget_or_load(
+			cache_key,
+			lambda: self._afetch_repositories(full_query, params, cache_key),
+			lambda: self._fetch_repositories(full_query, params, cache_key),
+			force_refresh
+		)
+
+	def _fetch_repositories(self, full_query: str, params: dict, cache_key: str) -> list[dict]:
+		current_time = time.time()
+
+		try:
+			print(f"Fetching repositories with query: {full_query}")
+			response = self.github.get("/search/repositories", params=params)
+			return self._store_repositories(response, full_query, cache_key, current_time)
+		except Exception as e:
+			print(f"GitHub API error in search_repositories: {str(e)}")
+
+			return []
+
+	async def _afetch_repositories(self, full_query: str, params: dict, cache_key: str) -> list[dict]:
 		current_time = time.time()
 
-		if not force_refresh and cache_key in REPO_CACHE and current_time - REPO_CACHE[cache_key]["timestamp"] < CACHE_CONFIG["repo"]["expiry"]:
-			print(f"Using cached repositories for: {cache_key}")
-			return REPO_CACHE[cache_key]["data"]
+		try:
+			print(f"Fetching repositories with query: {full_query}")
+			response = await self.github.aget("/search/repositories", params=params)
+			return await run_in_threadpool(self._store_repositories, response, full_query, cache_key, current_time)
+		except Exception as e:
+			print(f"GitHub API error in search_repositories: {str(e)}")
 
-		headers = {
-			"Authorization": f"token {GITHUB_TOKEN}",
-			"Accept": "application/vnd.github.v3+json"
-		}
-		url = "https://api.github.com/search/repositories"
+			return []
 
+	def _repository_search(self, query: str, language: str) -> tuple:
+		"""(full query, request params) for a repository search shaped by the user's preferences"""
 		query_parts = []
 
 		if query:
@@ -462,76 +2593,104 @@ class OpenSourceChat:
 			"per_page": GITHUB_PER_PAGE
 		}
 
-		try:
-			print(f"Fetching repositories with query: {full_query}")
-			response = requests.get(url, headers=headers, params=params, timeout=10)
-			response.raise_for_status()
-
-			remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-			if remaining < 10:
-				print("WARNING: GitHub API rate limit approaching exhaustion")
-
-			repos_data = response.json()
-			if "items" not in repos_data:
-				print(f"GitHub API response missing 'items': {repos_data}")
-				return []
-
-			repos = repos_data.get("items", [])
-
-			processed_repos = []
-			for repo in repos:
-
-				repo_language = repo.get("language") or "Various"
-
-				processed_repo = {
-					"name": repo["full_name"],
-					"description": repo["description"] or "No description available",
-					"url": repo["html_url"],
-					"stars": repo["stargazers_count"],
-					"forks": repo.get("forks_count", 0),
-					"language": repo_language,
-					"updated_at": repo["updated_at"],
-					"created_at": repo["created_at"],
-					"open_issues_count": repo["open_issues_count"],
-					"has_issues": repo["has_issues"],
-					"topics": repo.get("topics", []),
-					"default_branch": repo.get("default_branch", "main")
-				}
-
-				processed_repos.append(processed_repo)
-
-			REPO_CACHE[cache_key] = {
-				"data": processed_repos,
-				"timestamp": current_time,
-				"query": full_query
-			}
+		return full_query, params
 
-			for repo in processed_repos:
-				if repo["name"] not in self.user_preferences["previous_repos"]:
-					self.user_preferences["previous_repos"].append(repo["name"])
-					if len(self.user_preferences["previous_repos"]) > 15:
-						self.user_preferences["previous_repos"].pop(0)
-
-			return processed_repos
-		except Exception as e:
-			print(f"GitHub API error in search_repositories: {str(e)}")
+	def _store_repositories(self, response: GitHubResponse, full_query: str, cache_key: str, current_time: float) -> list[dict]:
+		response.raise_for_status()
 
+		repos_data = response.json()
+		if "items" not in repos_data:
+			print(f"GitHub API response missing 'items': {repos_data}")
 			return []
 
+		repos = repos_data.get("items", [])
+
+		processed_repos = []
+		for repo in repos:
+
+			repo_language = repo.get("language") or "Various"
+
+			processed_repo = {
+				"name": repo["full_name"],
+				"description": repo["description"] or "No description available",
+				"url": repo["html_url"],
+				"stars": repo["stargazers_count"],
+				"forks": repo.get("forks_count", 0),
+				"language": repo_language,
+				"updated_at": repo["updated_at"],
+				"created_at": repo["created_at"],
+				"open_issues_count": repo["open_issues_count"],
+				"has_issues": repo["has_issues"],
+				"topics": repo.get("topics", []),
+				"default_branch": repo.get("default_branch", "main")
+			}
+
+			processed_repos.append(processed_repo)
+
+		REPO_CACHE.set(cache_key, {
+			"data": processed_repos,
+			"timestamp": current_time,
+			"query": full_query
+		})
+
+		for repo in processed_repos:
+			if repo["name"] not in self.user_preferences["previous_repos"]:
+				self.user_preferences["previous_repos"].append(repo["name"])
+				if len(self.user_preferences["previous_repos"]) > 15:
+					self.user_preferences["previous_repos"].pop(0)
+
+		return processed_repos
+
 	def search_issues(self, repo_full_name: str, force_refresh: bool = False) -> list[dict]:
 		"""Search for issues with improved caching and label targeting"""
-		cache_key = f"issues_{repo_full_name}"
+		# Keyed on the search itself: the labels depend on this session's skill level
+		queries = self._issue_queries(repo_full_name)
+		cache_key = f"issues_{queries[2]} label:{queries[3]}"
+
+		return ISSUE_CACHE.get_or_load(cache_key, lambda: self._fetch_issues(repo_full_name, queries, cache_key), force_refresh)
+
+	async def asearch_issues(self, repo_full_name: str, force_refresh: bool = False) -> list[dict]:
+		"""search_issues with the upstream fetch awaited on the event loop"""
+		queries = self._issue_queries(repo_full_name)
+		cache_key = f"issues_{queries[2]} label:{queries[3]}"
+
+		return await ISSUE_CACHE.aget_or_load(
+			cache_key,
+			lambda: self._afetch_issues(repo_full_name, queries, cache_key),
+			lambda: self._fetch_issues(repo_full_name, queries, cache_key),
+			force_refresh
+		)
+
+	def _fetch_issues(self, repo_full_name: str, queries: tuple, cache_key: str) -> list[dict]:
 		current_time = time.time()
+		skill_level, beginner_labels, base_query, label_query = queries
 
-		if not force_refresh and cache_key in ISSUE_CACHE and current_time - ISSUE_CACHE[cache_key]["timestamp"] < CACHE_CONFIG["issue"]["expiry"]:
-			print(f"Using cached issues for: {repo_full_name}")
-			return ISSUE_CACHE[cache_key]["data"]
+		try:
+			print(f"Searching {skill_level} issues for {repo_full_name}")
+			# One search per load: an unlabelled fallback would spend a second call of the 30/min search budget
+			issues = self._search_issue_items(f"{base_query} label:{label_query}", 15)
 
-		headers = {
-			"Authorization": f"token {GITHUB_TOKEN}",
-			"Accept": "application/vnd.github.v3+json"
-		}
+			return self._store_issues(issues, beginner_labels, cache_key, current_time)
+		except Exception as e:
+			print(f"GitHub API error for issues: {str(e)}")
+			return []
+
+	async def _afetch_issues(self, repo_full_name: str, queries: tuple, cache_key: str) -> list[dict]:
+		current_time = time.time()
+		skill_level, beginner_labels, base_query, label_query = queries
+
+		try:
+			print(f"Searching {skill_level} issues for {repo_full_name}")
+			# One search per load: an unlabelled fallback would spend a second call of the 30/min search budget
+			issues = await self._asearch_issue_items(f"{base_query} label:{label_query}", 15)
+
+			return await run_in_threadpool(self._store_issues, issues, beginner_labels, cache_key, current_time)
+		except Exception as e:
+			print(f"GitHub API error for issues: {str(e)}")
+			return []
 
+	def _issue_queries(self, repo_full_name: str) -> tuple:
+		"""(skill level, beginner labels, base search query, label filter) for the user's skill level"""
 		skill_level = self.user_preferences.get("skill_level", "beginner")
 
 		beginner_labels = [
@@ -553,127 +2712,265 @@ class OpenSourceChat:
 			"improvement"
 		]
 
-		url = f"https://api.github.com/repos/{repo_full_name}/issues"
+		target_labels = beginner_labels if skill_level == "beginner" else intermediate_labels
 
-		if skill_level == "beginner":
+		# The search API ORs comma-separated label values and filters PRs and stale issues server-side,
+		# where the issues endpoint ANDs its labels and leaves both to us
+		six_months_ago = (datetime.datetime.utcnow() - datetime.timedelta(days=180)).strftime("%Y-%m-%d")
+		base_query = f"repo:{repo_full_name} is:issue is:open updated:>={six_months_ago}"
+		label_query = ",".join(f'"{label}"' for label in target_labels)
 
-			labels_str = ",".join(beginner_labels)
-			params = {
-				"labels": labels_str,
-				"state": "open",
-				"per_page": GITHUB_PER_PAGE
-			}
-		else:
+		return skill_level, beginner_labels, base_query, label_query
 
-			labels_str = ",".join(intermediate_labels)
-			params = {
-				"labels": labels_str,
-				"state": "open",
-				"per_page": GITHUB_PER_PAGE
-			}
+	def _store_issues(self, issues: list[dict], beginner_labels: List[str], cache_key: str, current_time: float) -> list[dict]:
+		processed_issues = []
+		for issue in issues:
 
-		try:
-			print(f"Fetching issues for {repo_full_name} with params: {params}")
-			response = requests.get(url, headers=headers, params=params, timeout=10)
-			response.raise_for_status()
-
-			remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-			if remaining < 10:
-				print("WARNING: GitHub API rate limit approaching exhaustion")
-
-			targeted_issues = response.json()
-
-			if len(targeted_issues) < 5:
-				print(f"Not enough {skill_level} issues found, fetching regular issues")
-				regular_params = {
-					"state": "open",
-					"per_page": GITHUB_PER_PAGE
-				}
-				regular_response = requests.get(url, headers=headers, params=regular_params, timeout=10)
-				regular_response.raise_for_status()
-				regular_issues = regular_response.json()
-
-				targeted_ids = {issue["id"] for issue in targeted_issues}
-				combined_issues = targeted_issues + [issue for issue in regular_issues if issue["id"] not in targeted_ids]
+			labels = []
+			for label in issue.get("labels", []):
+				if isinstance(label, dict):
+					labels.append({
+						"name": label.get("name", ""),
+						"color": label.get("color", "")
+					})
+				else:
+					labels.append({"name": str(label), "color": ""})
+
+			description = issue.get("body", "")
+			if description:
+
+				description = re.sub(r'!\[.*?\]\(.*?\)', '[image]', description)
+				description = re.sub(r'```.*?```', '[code block]', description, flags=re.DOTALL)
+				description = re.sub(r'\n+', ' ', description)
+				description = description[:300] + "..." if len(description) > 300 else description
 			else:
-				combined_issues = targeted_issues
+				description = "No description available"
+
+			processed_issue = {
+				"title": issue["title"],
+				"number": issue["number"],
+				"url": issue["html_url"],
+				"labels": labels,
+				"created_at": issue["created_at"],
+				"updated_at": issue["updated_at"],
+				"comments": issue["comments"],
+				"description": description,
+				"user": issue["user"]["login"] if "user" in issue else "Unknown",
+				"is_beginner_friendly": any(label["name"].lower() in [bl.lower() for bl in beginner_labels]
+										  for label in labels)
+			}
 
-			processed_issues = []
-			for issue in combined_issues:
+			processed_issues.append(processed_issue)
 
-				if "pull_request" in issue:
-					continue
+		processed_issues.sort(key=lambda x: (not x["is_beginner_friendly"],
+											 -datetime.datetime.strptime(x["updated_at"], "%Y-%m-%dT%H:%M:%SZ").timestamp()))
 
-				last_updated = datetime.datetime.strptime(issue["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
-				six_months_ago = datetime.datetime.now() - datetime.timedelta(days=180)
-				if last_updated < six_months_ago:
-					continue
+		processed_issues = processed_issues[:15]
 
-				labels = []
-				for label in issue.get("labels", []):
-					if isinstance(label, dict):
-						labels.append({
-							"name": label.get("name", ""),
-							"color": label.get("color", "")
-						})
-					else:
-						labels.append({"name": str(label), "color": ""})
+		ISSUE_CACHE.set(cache_key, {
+			"data": processed_issues,
+			"timestamp": current_time
+		})
 
-				description = issue.get("body", "")
-				if description:
+		return processed_issues
 
-					description = re.sub(r'!\[.*?\]\(.*?\)', '[image]', description)
-					description = re.sub(r'```.*?```', '[code block]', description, flags=re.DOTALL)
-					description = re.sub(r'\n+', ' ', description)
-					description = description[:300] + "..." if len(description) > 300 else description
-				else:
-					description = "No description available"
-
-				processed_issue = {
-					"title": issue["title"],
-					"number": issue["number"],
-					"url": issue["html_url"],
-					"labels": labels,
-					"created_at": issue["created_at"],
-					"updated_at": issue["updated_at"],
-					"comments": issue["comments"],
-					"description": description,
-					"user": issue["user"]["login"] if "user" in issue else "Unknown",
-					"is_beginner_friendly": any(label["name"].lower() in [bl.lower() for bl in beginner_labels]
-											  for label in labels)
-				}
-
-				processed_issues.append(processed_issue)
-
-			processed_issues.sort(key=lambda x: (not x["is_beginner_friendly"],
-												 -datetime.datetime.strptime(x["updated_at"], "%Y-%m-%dT%H:%M:%SZ").timestamp()))
-
-			processed_issues = processed_issues[:15]
-
-			ISSUE_CACHE[cache_key] = {
-				"data": processed_issues,
-				"timestamp": current_time
-			}
+	@staticmethod
+	def _issue_search_params(query: str, page: int) -> dict:
+		return {
+			"q": query,
+			"sort": "updated",
+			"order": "desc",
+			"per_page": GITHUB_PER_PAGE,
+			"page": page
+		}
+
+	@staticmethod
+	def _add_issue_page(items: list[dict], response: GitHubResponse) -> bool:
+		"""Append one search page to items; True when there are no more pages worth fetching"""
+		response.raise_for_status()
+
+		data = response.json()
+		batch = data.get("items", [])
+		items.extend(batch)
+		return len(batch) < GITHUB_PER_PAGE or len(items) >= data.get("total_count", 0)
+
+	def _search_issue_items(self, query: str, wanted: int) -> list[dict]:
+		"""Page through issue search results (most recently updated first) until `wanted` are in hand"""
+		items = []
+		page = 1
+
+		while len(items) < wanted:
+			if self._add_issue_page(items, self.github.get("/search/issues", params=self._issue_search_params(query, page))):
+				break
+			page += 1
 
-			return processed_issues
+		return items
+
+	async def _asearch_issue_items(self, query: str, wanted: int) -> list[dict]:
+		items = []
+		page = 1
+
+		while len(items) < wanted:
+			if self._add_issue_page(items, await self.github.aget("/search/issues", params=self._issue_search_params(query, page))):
+				break
+			page += 1
+
+		return items
+
+	def _list_guide_candidates(self, repo_full_name: str):
+		"""List the files in the root, .github and docs directories in as few calls as possible.
+
+		Returns (existing_paths, repo_data); existing_paths is None when nothing could be listed.
+		"""
+		try:
+			# GraphQL needs a token; anonymous clients go straight to the contents listings
+			owner, name = repo_full_name.split('/', 1)
+			repo = self.github.graphql(GUIDE_FILES_QUERY, {"owner": owner, "name": name}).get("repository") if self.github.authenticated else None
+			if repo:
+				return self._guide_files_from_graphql(repo)
 		except Exception as e:
-			print(f"GitHub API error for issues: {str(e)}")
-			return []
+			print(f"GraphQL guide listing failed for {repo_full_name}, using contents listings: {str(e)}")
+
+		try:
+			root_response = self.github.get(f"/repos/{repo_full_name}/contents")
+			if root_response.status_code != 200:
+				return None, None
+
+			existing_paths, directories = self._listed_guide_files(root_response)
+			for directory in directories:
+				dir_response = self.github.get(f"/repos/{repo_full_name}/contents/{directory}")
+				if dir_response.status_code == 200:
+					existing_paths.update(self._listed_guide_files(dir_response)[0])
+			return existing_paths, None
+		except Exception as e:
+			print(f"Error listing guide files for {repo_full_name}: {str(e)}")
+			return None, None
+
+	async def _alist_guide_candidates(self, repo_full_name: str):
+		try:
+			owner, name = repo_full_name.split('/', 1)
+			repo = (await self.github.agraphql(GUIDE_FILES_QUERY, {"owner": owner, "name": name})).get("repository") if self.github.authenticated else None
+			if repo:
+				return self._guide_files_from_graphql(repo)
+		except Exception as e:
+			print(f"GraphQL guide listing failed for {repo_full_name}, using contents listings: {str(e)}")
+
+		try:
+			root_response = await self.github.aget(f"/repos/{repo_full_name}/contents")
+			if root_response.status_code != 200:
+				return None, None
+
+			existing_paths, directories = self._listed_guide_files(root_response)
+			for directory in directories:
+				dir_response = await self.github.aget(f"/repos/{repo_full_name}/contents/{directory}")
+				if dir_response.status_code == 200:
+					existing_paths.update(self._listed_guide_files(dir_response)[0])
+			return existing_paths, None
+		except Exception as e:
+			print(f"Error listing guide files for {repo_full_name}: {str(e)}")
+			return None, None
+
+	@staticmethod
+	def _guide_files_from_graphql(repo: dict) -> tuple:
+		existing_paths = set()
+		for alias, prefix in (("root", ""), ("github", ".github/"), ("docs", "docs/")):
+			for entry in (repo.get(alias) or {}).get("entries") or []:
+				if entry.get("type") == "blob":
+					existing_paths.add(prefix + entry["name"])
+
+		repo_data = {
+			"default_branch": (repo.get("defaultBranchRef") or {}).get("name", "main"),
+			"has_issues": repo.get("hasIssuesEnabled", True),
+			"has_wiki": repo.get("hasWikiEnabled", False),
+			"html_url": repo.get("url")
+		}
+		return existing_paths, repo_data
+
+	@staticmethod
+	def _listed_guide_files(response: GitHubResponse) -> tuple:
+		"""(file paths, subdirectories that may hold a guide) from a contents listing"""
+		existing_paths = set()
+		directories = []
+		for entry in response.json():
+			if entry.get("type") == "file":
+				existing_paths.add(entry["path"])
+			elif entry.get("type") == "dir" and entry.get("name") in (".github", "docs"):
+				directories.append(entry["name"])
+		return existing_paths, directories
 
 	def get_contribution_guide(self, repo_full_name: str, force_refresh: bool = False) -> str:
 		"""Get contribution guide with improved caching and processing"""
 		cache_key = f"guide_{repo_full_name}"
+
+		return GUIDE_CACHE.get_or_load(cache_key, lambda: self._fetch_contribution_guide(repo_full_name, cache_key), force_refresh)
+
+	async def aget_contribution_guide(self, repo_full_name: str, force_refresh: bool = False) -> str:
+		"""get_contribution_guide with the upstream fetches awaited on the event loop"""
+		cache_key = f"guide_{repo_full_name}"
+
+		return await GUIDE_CACHE.aget_or_load(
+			cache_key,
+			lambda: self._afetch_contribution_guide(repo_full_name, cache_key),
+			lambda: self._fetch_contribution_guide(repo_full_name, cache_key),
+			force_refresh
+		)
+
+	def _fetch_contribution_guide(self, repo_full_name: str, cache_key: str) -> str:
 		current_time = time.time()
 
-		if not force_refresh and cache_key in GUIDE_CACHE and current_time - GUIDE_CACHE[cache_key]["timestamp"] < CACHE_CONFIG["guide"]["expiry"]:
-			print(f"Using cached contribution guide for: {repo_full_name}")
-			return GUIDE_CACHE[cache_key]["data"]
+		# Work out which guide exists from one listing, then fetch only that file.
+		# If the listing is unavailable, fall back to probing every path.
+		existing_paths, repo_data = self._list_guide_candidates(repo_full_name)
 
-		headers = {
-			"Authorization": f"token {GITHUB_TOKEN}",
-			"Accept": "application/vnd.github.v3+json"
-		}
+		guide_content = None
+		for path in self._guide_candidates(existing_paths):
+			try:
+				guide_content = self._guide_content(repo_full_name, path, self.github.get(f"/repos/{repo_full_name}/contents/{path}"))
+				if guide_content:
+					break
+			except Exception as e:
+				print(f"Error fetching {path} for {repo_full_name}: {str(e)}")
+				continue
 
+		if not guide_content:
+			try:
+				if repo_data is None:
+					repo_data = self.github.get(f"/repos/{repo_full_name}").json()
+				guide_content = self._generic_guide(repo_full_name, repo_data)
+			except Exception as e:
+				print(f"Error creating generic guide for {repo_full_name}: {str(e)}")
+				guide_content = self._fallback_guide()
+
+		return self._store_guide(cache_key, guide_content, current_time)
+
+	async def _afetch_contribution_guide(self, repo_full_name: str, cache_key: str) -> str:
+		current_time = time.time()
+		existing_paths, repo_data = await self._alist_guide_candidates(repo_full_name)
+
+		guide_content = None
+		for path in self._guide_candidates(existing_paths):
+			try:
+				guide_content = self._guide_content(repo_full_name, path, await self.github.aget(f"/repos/{repo_full_name}/contents/{path}"))
+				if guide_content:
+					break
+			except Exception as e:
+				print(f"Error fetching {path} for {repo_full_name}: {str(e)}")
+				continue
+
+		if not guide_content:
+			try:
+				if repo_data is None:
+					repo_data = (await self.github.aget(f"/repos/{repo_full_name}")).json()
+				guide_content = self._generic_guide(repo_full_name, repo_data)
+			except Exception as e:
+				print(f"Error creating generic guide for {repo_full_name}: {str(e)}")
+				guide_content = self._fallback_guide()
+
+		return await run_in_threadpool(self._store_guide, cache_key, guide_content, current_time)
+
+	@staticmethod
+	def _guide_candidates(existing_paths: Optional[set]) -> List[str]:
+		"""Guide files in preference order, narrowed to the listed ones when there is a listing"""
 		guide_paths = [
 			"CONTRIBUTING.md",
 			".github/CONTRIBUTING.md",
@@ -687,292 +2984,705 @@ class OpenSourceChat:
 			".github/PULL_REQUEST_TEMPLATE.md"
 		]
 
-		guide_content = ""
-		found_guide = False
+		if existing_paths is None:
+			return guide_paths
+		return [path for path in guide_paths if path in existing_paths]
 
-		for path in guide_paths:
-			try:
-				url = f"https://api.github.com/repos/{repo_full_name}/contents/{path}"
-				response = requests.get(url, headers=headers, timeout=10)
+	def _guide_content(self, repo_full_name: str, path: str, response: GitHubResponse) -> Optional[str]:
+		"""The guide text from a contents response, or None if the file is missing or not base64"""
+		if response.status_code != 200:
+			return None
 
-				if response.status_code == 200:
-					content_data = response.json()
-					if "content" in content_data and content_data["encoding"] == "base64":
-						content = base64.b64decode(content_data["content"]).decode("utf-8")
+		content_data = response.json()
+		if "content" not in content_data or content_data["encoding"] != "base64":
+			return None
 
-						content = re.sub(r'!\[.*?\]\(.*?\)', '[image]', content)
+		content = base64.b64decode(content_data["content"]).decode("utf-8")
 
-						if path == "README.md":
+		content = re.sub(r'!\[.*?\]\(.*?\)', '[image]', content)
 
-							contribution_sections = re.findall(r'(?:##?#?\s+(?:Contribut|Develop|Getting Started|How to|Set up).*?(?=##)|$)(.*?)(?=##|$)',
-														   content, re.DOTALL | re.IGNORECASE)
-							if contribution_sections:
-								content = "\n\n".join(section.strip() for section in contribution_sections if section.strip())
-							else:
+		if path == "README.md":
 
-								content = content[:3000] if len(content) > 3000 else content
+			contribution_sections = re.findall(r'(?:##?#?\s+(?:Contribut|Develop|Getting Started|How to|Set up).*?(?=##)|$)(.*?)(?=##|$)',
+											   content, re.DOTALL | re.IGNORECASE)
+			if contribution_sections:
+				content = "\n\n".join(section.strip() for section in contribution_sections if section.strip())
+			else:
 
-						if len(content) > 5000:
-							content = content[:5000] + "\n...\n[Guide truncated. See full guide at the repository]"
+				content = content[:3000] if len(content) > 3000 else content
 
-						file_type = path.split('/')[-1]
-						guide_content = f"Contribution guide for {repo_full_name} (from {file_type}):\n\n{content}"
-						found_guide = True
-						break
-			except Exception as e:
-				print(f"Error fetching {path} for {repo_full_name}: {str(e)}")
-				continue
+		if len(content) > GUIDE_MAX_CHARS:
+			content = content[:GUIDE_MAX_CHARS] + "\n...\n[Guide truncated. See full guide at the repository]"
 
-		if not found_guide:
+		file_type = path.split('/')[-1]
+		return f"Contribution guide for {repo_full_name} (from {file_type}):\n\n{content}"
 
-			try:
-				repo_url = f"https://api.github.com/repos/{repo_full_name}"
-				repo_response = requests.get(repo_url, headers=headers, timeout=10)
-				repo_data = repo_response.json()
-
-				default_branch = repo_data.get("default_branch", "main")
-				has_issues = repo_data.get("has_issues", True)
-				has_wiki = repo_data.get("has_wiki", False)
-
-				guide_content = f"No specific contribution guide found for {repo_full_name}. Here are general steps to contribute:\n\n"
-				guide_content += f"This repository uses '{default_branch}' as its default branch.\n\n"
-				guide_content += "1. Fork the repository\n"
-				guide_content += "2. Clone your fork locally\n"
-				guide_content += f"3. Create a new branch from '{default_branch}' for your feature or bugfix\n"
-				guide_content += "4. Make your changes with clear commit messages\n"
-				guide_content += "5. Push to your fork\n"
-				guide_content += f"6. Submit a pull request to the '{default_branch}' branch of the original repository\n\n"
-
-				if has_issues:
-					guide_content += "This repository has Issues enabled. Look for issues labeled 'good first issue' or 'help wanted' for beginner-friendly tasks.\n"
-				if has_wiki:
-					guide_content += f"This repository has a Wiki which may contain additional documentation: {repo_data.get('html_url')}/wiki\n"
+	@staticmethod
+	def _generic_guide(repo_full_name: str, repo_data: dict) -> str:
+		default_branch = repo_data.get("default_branch", "main")
+		has_issues = repo_data.get("has_issues", True)
+		has_wiki = repo_data.get("has_wiki", False)
 
-			except Exception as e:
-				print(f"Error creating generic guide for {repo_full_name}: {str(e)}")
+		guide_content = f"No specific contribution guide found for {repo_full_name}. Here are general steps to contribute:\n\n"
+		guide_content += f"This repository uses '{default_branch}' as its default branch.\n\n"
+		guide_content += "1. Fork the repository\n"
+		guide_content += "2. Clone your fork locally\n"
+		guide_content += f"3. Create a new branch from '{default_branch}' for your feature or bugfix\n"
+		guide_content += "4. Make your changes with clear commit messages\n"
+		guide_content += "5. Push to your fork\n"
+		guide_content += f"6. Submit a pull request to the '{default_branch}' branch of the original repository\n\n"
 
-				guide_content = "No specific contribution guide found. Here are general steps to contribute:\n\n"
-				guide_content += "1. Fork the repository\n"
-				guide_content += "2. Clone your fork locally\n"
-				guide_content += "3. Create a new branch for your feature or bugfix\n"
-				guide_content += "4. Make your changes with clear commit messages\n"
-				guide_content += "5. Push to your fork\n"
-				guide_content += "6. Submit a pull request to the original repository\n\n"
-				guide_content += "Look for issues labeled 'good first issue' or 'help wanted' for beginner-friendly tasks."
+		if has_issues:
+			guide_content += "This repository has Issues enabled. Look for issues labeled 'good first issue' or 'help wanted' for beginner-friendly tasks.\n"
+		if has_wiki:
+			guide_content += f"This repository has a Wiki which may contain additional documentation: {repo_data.get('html_url')}/wiki\n"
 
-		GUIDE_CACHE[cache_key] = {
+		return guide_content
+
+	@staticmethod
+	def _fallback_guide() -> str:
+		guide_content = "No specific contribution guide found. Here are general steps to contribute:\n\n"
+		guide_content += "1. Fork the repository\n"
+		guide_content += "2. Clone your fork locally\n"
+		guide_content += "3. Create a new branch for your feature or bugfix\n"
+		guide_content += "4. Make your changes with clear commit messages\n"
+		guide_content += "5. Push to your fork\n"
+		guide_content += "6. Submit a pull request to the original repository\n\n"
+		guide_content += "Look for issues labeled 'good first issue' or 'help wanted' for beginner-friendly tasks."
+		return guide_content
+
+	@staticmethod
+	def _store_guide(cache_key: str, guide_content: str, current_time: float) -> str:
+		GUIDE_CACHE.set(cache_key, {
 			"data": guide_content,
 			"timestamp": current_time
-		}
+		})
 
 		return guide_content
 
-	def _extract_repo_from_question(self, question: str) -> str:
-		"""Extract repository name from question with improved pattern matching"""
-
-		repo_pattern = r'([a-zA-Z0-9][a-zA-Z0-9\-]*/[a-zA-Z0-9\.\-_]+)'
-		repos = re.findall(repo_pattern, question)
+	def _guide_index(self, repo_full_name: str, guide: str) -> Dict[str, Any]:
+		"""Chunks of a guide with their embeddings (float32, base64) so the index can sit in the JSON caches"""
+		cache_key = f"guide_index_{repo_full_name}_{GUIDE_CHUNK_SIZE}_{content_hash(guide)}"
+
+		def load():
+			chunks = self.resources.guide_splitter.split_text(guide)
+			vectors = np.asarray(self.embeddings.embed_documents(chunks), dtype=np.float32)
+			index = {
+				"chunks": chunks,
+				"dimensions": int(vectors.shape[1]),
+				"vectors": base64.b64encode(vectors.tobytes()).decode("ascii")
+			}
+			GUIDE_INDEX_CACHE.set(cache_key, {"data": index, "timestamp": time.time()})
+			return index
 
-		if repos:
-			return repos[0]
+		return GUIDE_INDEX_CACHE.get_or_load(cache_key, load)
 
-		contribute_match = re.search(r'contribute to\s+([a-zA-Z0-9][a-zA-Z0-9\-]*/[a-zA-Z0-9\.\-_]+)', question, re.IGNORECASE)
-		if contribute_match:
-			return contribute_match.group(1)
+	def _guide_excerpt(self, repo_full_name: str, guide: str, question: str, k: int = GUIDE_TOP_K) -> str:
+		"""Up to k guide chunks closest to the question, in guide order and within GUIDE_EXCERPT_MAX_CHARS;
+		short guides are returned whole"""
+		if len(guide) <= GUIDE_EXCERPT_MAX_CHARS:
+			return guide
+		if self.embeddings is None:
+			return guide[:GUIDE_EXCERPT_MAX_CHARS] + "..."
 
-		issues_match = re.search(r'issues in\s+([a-zA-Z0-9][a-zA-Z0-9\-]*/[a-zA-Z0-9\.\-_]+)', question, re.IGNORECASE)
-		if issues_match:
-			return issues_match.group(1)
+		try:
+			index = self._guide_index(repo_full_name, guide)
+			vectors = np.frombuffer(base64.b64decode(index["vectors"]), dtype=np.float32).reshape(-1, index["dimensions"])
+			query = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+		except Exception as e:
+			print(f"Error indexing contribution guide for {repo_full_name}: {str(e)}")
+			return guide[:GUIDE_EXCERPT_MAX_CHARS] + "..."
+
+		# Cosine similarity against every chunk; guides are small enough that a flat scan is the index
+		norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+		scores = (vectors @ query) / np.where(norms == 0, 1.0, norms)
+		title = guide.split("\n", 1)[0][:200]
+		separator = "\n...\n"
+
+		# Best chunks first until the character budget is spent, whatever k allows
+		top = []
+		used = len(title)
+		for i in np.argsort(-scores)[:k].tolist():
+			cost = len(separator) + len(index["chunks"][i])
+			if used + cost <= GUIDE_EXCERPT_MAX_CHARS:
+				top.append(i)
+				used += cost
+		if not top:
+			return index["chunks"][int(np.argmax(scores))][:GUIDE_EXCERPT_MAX_CHARS] + "..."
+
+		top.sort()
+		excerpt = [index["chunks"][i] for i in top]
+		if top[0] != 0:
+			excerpt.insert(0, title)
+		return separator.join(excerpt)
 
-		repo_name_match = re.search(r'([a-zA-Z0-9][a-zA-Z0-9\-]*/[a-zA-Z0-9\.\-_]+)\s+(?:repo|repository)', question, re.IGNORECASE)
-		if repo_name_match:
-			return repo_name_match.group(1)
+	def _extract_repo_from_question(self, question: str) -> str:
+		"""Extract repository name from question, else the last one discussed"""
+		repo = extract_entities(question)["repo"]
+		if repo:
+			return repo
 
 		if self.user_preferences["previous_repos"]:
 			return self.user_preferences["previous_repos"][-1]
 
 		return ""
 
-	def crawl_for_open_source_info(self, topic: str = None, language: str = None) -> List[Dict[str, Any]]:
-		"""Crawl relevant websites for real-time information about open source projects"""
-		import requests
+	def _parse_github_trending(self, response) -> List[Dict[str, Any]]:
 		from bs4 import BeautifulSoup
-		import feedparser
-		import json
-		from urllib.parse import urljoin
 
 		results = []
+		if response.status_code != 200:
+			return results
 
-		if not topic and self.user_preferences["interests"]:
-			topic = self.user_preferences["interests"][0]
-		if not language and self.user_preferences["languages"]:
-			language = self.user_preferences["languages"][0]
+		soup = BeautifulSoup(response.text, 'html.parser')
+		repo_articles = soup.select('article.Box-row')
+
+		for repo in repo_articles[:5]:
+			try:
+				repo_link = repo.select_one('h2 a')
+				if repo_link:
+					href = repo_link.get('href', '').strip('/')
+					if href and '/' in href:
+						name = href
+
+						desc_elem = repo.select_one('p')
+						description = desc_elem.text.strip() if desc_elem else "No description available"
+
+						stars_elem = repo.select_one('a[href$="stargazers"]')
+						stars = stars_elem.text.strip() if stars_elem else "N/A"
+
+						results.append({
+							"source": "GitHub Trending",
+							"name": name,
+							"url": f"https://github.com/{name}",
+							"description": description,
+							"popularity": stars,
+							"type": "repository"
+						})
+			except Exception as e:
+				print(f"Error parsing trending repo: {e}")
+				continue
+
+		return results
+
+	def _parse_devto(self, response) -> List[Dict[str, Any]]:
+		from bs4 import BeautifulSoup
+
+		results = []
+		if response.status_code != 200:
+			return results
+
+		soup = BeautifulSoup(response.text, 'html.parser')
+		article_cards = soup.select('.crayons-story')
+
+		for article in article_cards[:3]:
+			try:
+				title_elem = article.select_one('h3.crayons-story__title a')
+				if title_elem:
+					title = title_elem.text.strip()
+					article_url = urljoin("https://dev.to", title_elem.get('href', ''))
+
+					date_elem = article.select_one('time')
+					pub_date = date_elem.get('datetime', 'N/A') if date_elem else 'N/A'
+
+					results.append({
+						"source": "DEV.to",
+						"title": title,
+						"url": article_url,
+						"published_date": pub_date,
+						"type": "article"
+					})
+			except Exception as e:
+				print(f"Error parsing DEV.to article: {e}")
+				continue
+
+		return results
+
+	def _parse_rss_feed(self, response) -> List[Dict[str, Any]]:
+		import feedparser
+
+		# feedparser.parse(url) has no timeout, so the feed is downloaded first and its bytes parsed here
+		response.raise_for_status()
+		feed = feedparser.parse(response.content)
+		source = feed.feed.title if hasattr(feed, 'feed') and hasattr(feed.feed, 'title') else "RSS Feed"
+
+		return [
+			{
+				"source": source,
+				"title": entry.title if hasattr(entry, 'title') else "No title",
+				"url": entry.link if hasattr(entry, 'link') else "#",
+				"published_date": entry.published if hasattr(entry, 'published') else "N/A",
+				"type": "article"
+			}
+			for entry in feed.entries[:2]
+		]
+
+	def _parse_reddit(self, subreddit: str, response) -> List[Dict[str, Any]]:
+		if response.status_code != 200:
+			return []
+
+		posts = response.json().get('data', {}).get('children', [])
+		results = []
+		for post in posts:
+			post_data = post.get('data', {})
+			results.append({
+				"source": f"Reddit r/{subreddit}",
+				"title": post_data.get('title', 'No title'),
+				"url": f"https://www.reddit.com{post_data.get('permalink', '')}",
+				"upvotes": post_data.get('score', 0),
+				"type": "discussion"
+			})
+		return results
 
+	def _crawl_requests(self, topic: Optional[str], language: Optional[str]) -> List[tuple]:
+		"""(name, url, headers, parser) for every trending source; parsers take a requests or httpx response"""
 		search_query = "open source"
 		if topic:
 			search_query += f" {topic}"
 		if language:
 			search_query += f" {language}"
 
+		github_trending_url = "https://github.com/trending"
+		if language:
+			github_trending_url += f"/{language}"
+
+		sources = [
+			("GitHub Trending", github_trending_url, None, self._parse_github_trending),
+			("DEV.to", f"https://dev.to/search?q={search_query}", None, self._parse_devto)
+		]
+		sources += [(feed_url, feed_url, None, self._parse_rss_feed) for feed_url in RSS_FEEDS]
+
+		subreddits = []
+		if language:
+			language_subreddit = language.lower()
+
+			if language_subreddit == "c#":
+				language_subreddit = "csharp"
+			elif language_subreddit == "c++":
+				language_subreddit = "cpp"
+
+			subreddits.append(language_subreddit)
+		subreddits.append("opensource")
+
+		reddit_headers = {
+			"User-Agent": "Mozilla/5.0 OpenSourceGuide/1.0"
+		}
+		for subreddit in subreddits:
+			sources.append((
+				f"Reddit r/{subreddit}",
+				f"https://www.reddit.com/r/{subreddit}/top.json?t=week&limit=3",
+				reddit_headers,
+				functools.partial(self._parse_reddit, subreddit)
+			))
+
+		return sources
+
+	def _crawl_sources(self, topic: Optional[str] = None, language: Optional[str] = None, deadline: float = CRAWL_DEADLINE) -> Dict[str, Any]:
+		"""Fetch every trending source concurrently, keeping whatever arrives before the deadline"""
+		sources = self._crawl_requests(topic, language)
+
+		start_time = time.time()
+		deadline_at = start_time + deadline
+		futures = [crawl_executor.submit(self._crawl_source_before, name, url, headers, parse, deadline_at) for name, url, headers, parse in sources]
+		concurrent.futures.wait(futures, timeout=deadline)
+
+		outcomes = []
+		for future in futures:
+			if not future.done():
+				future.cancel()
+				outcomes.append(None)
+			else:
+				outcomes.append(future.exception() or future.result())
+
+		return self._crawl_report(sources, outcomes, start_time)
+
+	async def _acrawl_sources(self, topic: Optional[str] = None, language: Optional[str] = None, deadline: float = CRAWL_DEADLINE) -> Dict[str, Any]:
+		"""_crawl_sources on the event loop: every source is a task on the shared httpx client"""
+		sources = self._crawl_requests(topic, language)
+
+		start_time = time.time()
+		deadline_at = start_time + deadline
+		tasks = [asyncio.ensure_future(self._acrawl_source(name, url, headers, parse, deadline_at)) for name, url, headers, parse in sources]
 		try:
+			await asyncio.wait(tasks, timeout=deadline)
+		finally:
+			for task in tasks:
+				if not task.done():
+					task.cancel()
+		# A task can finish between the wait and the cancel; its outcome still counts
+		outcomes = [(task.exception() or task.result()) if task.done() and not task.cancelled() else None for task in tasks]
+
+		return self._crawl_report(sources, outcomes, start_time)
+
+	@staticmethod
+	def _crawl_source_before(name: str, url: str, headers: Optional[dict], parse, deadline_at: float) -> List[Dict[str, Any]]:
+		"""Run one source with only the time left before the crawl deadline, so stragglers free the pool"""
+		remaining = deadline_at - time.time()
+		if remaining <= 0:
+			raise TimeoutError("crawl deadline passed before the source started")
+
+		print(f"Crawling {name}: {url}")
+		return parse(web_session.get(url, headers=headers, timeout=min(10, remaining)))
+
+	@staticmethod
+	async def _acrawl_source(name: str, url: str, headers: Optional[dict], parse, deadline_at: float) -> List[Dict[str, Any]]:
+		print(f"Crawling {name}: {url}")
+		response = await async_http.get(url, headers=headers, timeout=min(10, max(deadline_at - time.time(), 0.01)))
+		# HTML and feed parsing is CPU-bound, so it stays off the event loop
+		return await run_in_threadpool(parse, response)
+
+	def _crawl_report(self, sources: List[tuple], outcomes: List[Any], start_time: float) -> Dict[str, Any]:
+		"""Assemble in source order so the prompt stays stable regardless of completion order;
+		a None outcome means the source missed the deadline"""
+		results = []
+		skipped_sources = []
+		for (name, _, _, _), outcome in zip(sources, outcomes):
+			if outcome is None:
+				skipped_sources.append({"source": name, "reason": "deadline"})
+			elif isinstance(outcome, Exception):
+				print(f"Error crawling {name}: {outcome}")
+				skipped_sources.append({"source": name, "reason": "error"})
+			else:
+				results.extend(outcome)
 
-			github_trending_url = "https://github.com/trending"
-			if language:
-				github_trending_url += f"/{language}"
+		if skipped_sources:
+			print(f"Crawl skipped sources: {', '.join(s['source'] for s in skipped_sources)}")
 
-			print(f"Crawling GitHub trending: {github_trending_url}")
-			response = requests.get(github_trending_url, timeout=10)
-			if response.status_code == 200:
-				soup = BeautifulSoup(response.text, 'html.parser')
-				repo_articles = soup.select('article.Box-row')
+		return {
+			"results": results,
+			"skipped_sources": skipped_sources,
+			"elapsed": round(time.time() - start_time, 2)
+		}
 
-				for repo in repo_articles[:5]:
-					try:
-						repo_link = repo.select_one('h2 a')
-						if repo_link:
-							href = repo_link.get('href', '').strip('/')
-							if href and '/' in href:
-								name = href
-
-								desc_elem = repo.select_one('p')
-								description = desc_elem.text.strip() if desc_elem else "No description available"
-
-								stars_elem = repo.select_one('a[href$="stargazers"]')
-								stars = stars_elem.text.strip() if stars_elem else "N/A"
-
-								results.append({
-									"source": "GitHub Trending",
-									"name": name,
-									"url": f"https://github.com/{name}",
-									"description": description,
-									"popularity": stars,
-									"type": "repository"
-								})
-					except Exception as e:
-						print(f"Error parsing trending repo: {e}")
-						continue
+	def _trending_pair(self, topic: Optional[str], language: Optional[str]) -> tuple:
+		"""(topic, language) with the user's first interest/language filling in whichever is missing"""
+		if not topic and self.user_preferences["interests"]:
+			topic = self.user_preferences["interests"][0]
+		if not language and self.user_preferences["languages"]:
+			language = self.user_preferences["languages"][0]
+		return topic, language
 
-			dev_url = f"https://dev.to/search?q={search_query}"
-			print(f"Crawling DEV.to: {dev_url}")
-			response = requests.get(dev_url, timeout=10)
-			if response.status_code == 200:
-				soup = BeautifulSoup(response.text, 'html.parser')
-				article_cards = soup.select('.crayons-story')
+	def crawl_trending_sources(self, topic: str = None, language: str = None, track: bool = True) -> Dict[str, Any]:
+		"""Crawl trending sources for the topic/language (or the user's preferences) with a source report.
 
-				for article in article_cards[:3]:
-					try:
-						title_elem = article.select_one('h3.crayons-story__title a')
-						if title_elem:
-							title = title_elem.text.strip()
-							article_url = urljoin("https://dev.to", title_elem.get('href', ''))
-
-							date_elem = article.select_one('time')
-							pub_date = date_elem.get('datetime', 'N/A') if date_elem else 'N/A'
-
-							results.append({
-								"source": "DEV.to",
-								"title": title,
-								"url": article_url,
-								"published_date": pub_date,
-								"type": "article"
-							})
-					except Exception as e:
-						print(f"Error parsing DEV.to article: {e}")
-						continue
+		With track=False a missing snapshot is crawled once without joining the background refresh set.
+		"""
+		topic, language = self._trending_pair(topic, language)
+
+		snapshot = trending_snapshots.get(topic, language)
+		if snapshot:
+			print(f"Using trending snapshot v{snapshot['version']} for: {(language, topic)}")
+			return snapshot
+
+		if not track:
+			return self._crawl_sources(topic=topic, language=language)
+
+		# Uncommon pair: crawl live now and keep it warm from here on
+		trending_snapshots.track(topic, language)
+		return trending_snapshots.crawl(topic, language)
+
+	async def acrawl_trending_sources(self, topic: str = None, language: str = None, track: bool = True) -> Dict[str, Any]:
+		"""crawl_trending_sources with a missing snapshot crawled on the event loop"""
+		topic, language = self._trending_pair(topic, language)
+
+		snapshot = await trending_snapshots.aget(topic, language)
+		if snapshot:
+			print(f"Using trending snapshot v{snapshot['version']} for: {(language, topic)}")
+			return snapshot
+
+		if not track:
+			return await self._acrawl_sources(topic=topic, language=language)
+
+		# Tracking may evict a snapshot, which deletes it from the disk tier
+		await asyncio.to_thread(trending_snapshots.track, topic, language)
+		return await trending_snapshots.acrawl(topic, language)
+
+	def crawl_for_open_source_info(self, topic: str = None, language: str = None, track: bool = True) -> List[Dict[str, Any]]:
+		"""Crawl relevant websites for real-time information about open source projects"""
+		return self.crawl_trending_sources(topic=topic, language=language, track=track)["results"]
+
+	def _commit_frequency(self, commit_count: int) -> str:
+		if commit_count > 50:
+			return "Very Active (50+ commits in last month)"
+		elif commit_count > 20:
+			return "Active (20-50 commits in last month)"
+		elif commit_count > 5:
+			return "Moderately Active (5-20 commits in last month)"
+		return "Low Activity (< 5 commits in last month)"
+
+	def _summarize_closed_pulls(self, closed_pulls: List[dict]) -> Dict[str, Any]:
+		"""Merge rate and response time from closed PRs carrying created_at/merged_at/closed_at"""
+		if not closed_pulls:
+			return {}
+
+		pull_requests = {}
+		merged_count = sum(1 for pr in closed_pulls if pr.get("merged_at") is not None)
+		pull_requests["merged_rate"] = round((merged_count / len(closed_pulls)) * 100, 1)
+
+		response_times = []
+		for pr in closed_pulls[:20]:
+			created = datetime.datetime.strptime(pr["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+			if pr.get("merged_at"):
+				closed = datetime.datetime.strptime(pr["merged_at"], "%Y-%m-%dT%H:%M:%SZ")
+			else:
+				closed = datetime.datetime.strptime(pr["closed_at"], "%Y-%m-%dT%H:%M:%SZ")
+
+			response_times.append((closed - created).total_seconds() / 3600)
+
+		if response_times:
+			avg_time = sum(response_times) / len(response_times)
+			if avg_time < 24:
+				pull_requests["response_time"] = "Fast (< 24 hours)"
+			elif avg_time < 72:
+				pull_requests["response_time"] = "Medium (1-3 days)"
+			else:
+				pull_requests["response_time"] = "Slow (> 3 days)"
+
+		return pull_requests
+
+	def _technologies(self, languages_data: Dict[str, int]) -> List[dict]:
+		total_bytes = sum(languages_data.values())
+		if total_bytes <= 0:
+			return []
+
+		return [
+			{"name": lang, "percentage": round((bytes_count / total_bytes) * 100, 1)}
+			for lang, bytes_count in sorted(languages_data.items(), key=lambda x: x[1], reverse=True)
+		]
 
-			rss_feeds = [
-				"https://opensource.com/feed",
-				"https://changelog.com/feed"
+	def _insights_requests(self, repo_full_name: str) -> List[tuple]:
+		"""(path, request options, parser) for each REST sub-fetch, so both clients send the same requests"""
+		one_month_ago = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime("%Y-%m-%d")
+
+		return [
+			(f"/repos/{repo_full_name}", {}, self._insights_repo),
+			(f"/repos/{repo_full_name}/contributors", {"params": {"per_page": 5}}, self._insights_contributors),
+			(f"/repos/{repo_full_name}/commits", {"params": {"since": one_month_ago, "per_page": 100}}, self._insights_commits),
+			(f"/repos/{repo_full_name}/pulls", {"params": {"state": "open", "per_page": 100}}, self._insights_open_pulls),
+			(f"/repos/{repo_full_name}/pulls", {"params": {"state": "closed", "per_page": 100}}, self._insights_closed_pulls),
+			(f"/repos/{repo_full_name}/community/profile", {"headers": {"Accept": "application/vnd.github.black-panther-preview+json"}}, self._insights_community),
+			(f"/repos/{repo_full_name}/languages", {}, self._insights_languages)
+		]
+
+	def _insights_rest(self, path: str, options: dict, parse) -> Dict[str, Any]:
+		return parse(self.github.get(path, **options))
+
+	async def _ainsights_rest(self, path: str, options: dict, parse) -> Dict[str, Any]:
+		return parse(await self.github.aget(path, **options))
+
+	def _insights_repo(self, response: GitHubResponse) -> Dict[str, Any]:
+		repo_data = response.json()
+
+		return {
+			"stars": repo_data.get("stargazers_count", 0),
+			"forks": repo_data.get("forks_count", 0),
+			"watchers": repo_data.get("subscribers_count", 0) if "subscribers_count" in repo_data else 0,
+			"open_issues": repo_data.get("open_issues_count", 0),
+			"default_branch": repo_data.get("default_branch", "main"),
+			"license": repo_data.get("license", {}).get("name", "Unknown") if repo_data.get("license") else "Unknown"
+		}
+
+	def _insights_contributors(self, contributors_response: GitHubResponse) -> Dict[str, Any]:
+		contributors_data = contributors_response.json()
+
+		if not isinstance(contributors_data, list):
+			return {}
+
+		return {
+			"contributors": [
+				{"login": c.get("login"), "contributions": c.get("contributions"), "url": c.get("html_url")}
+				for c in contributors_data
 			]
+		}
 
-			for feed_url in rss_feeds:
-				try:
-					print(f"Fetching RSS feed: {feed_url}")
-					feed = feedparser.parse(feed_url)
-					source = feed.feed.title if hasattr(feed, 'feed') and hasattr(feed.feed, 'title') else "RSS Feed"
+	def _insights_commits(self, commits_response: GitHubResponse) -> Dict[str, Any]:
+		if commits_response.status_code != 200:
+			return {}
 
-					for entry in feed.entries[:2]:
-						results.append({
-							"source": source,
-							"title": entry.title if hasattr(entry, 'title') else "No title",
-							"url": entry.link if hasattr(entry, 'link') else "#",
-							"published_date": entry.published if hasattr(entry, 'published') else "N/A",
-							"type": "article"
-						})
-				except Exception as e:
-					print(f"Error fetching RSS feed {feed_url}: {e}")
-					continue
+		return {"commit_frequency": self._commit_frequency(len(commits_response.json()))}
 
-			if language:
-				language_subreddit = language.lower()
-
-				if language_subreddit == "c#":
-					language_subreddit = "csharp"
-				elif language_subreddit == "c++":
-					language_subreddit = "cpp"
-
-				reddit_url = f"https://www.reddit.com/r/{language_subreddit}/top.json?t=week&limit=3"
-				headers = {
-					"User-Agent": "Mozilla/5.0 OpenSourceGuide/1.0"
-				}
-
-				try:
-					print(f"Fetching Reddit data: {reddit_url}")
-					response = requests.get(reddit_url, headers=headers, timeout=10)
-					if response.status_code == 200:
-						data = response.json()
-						posts = data.get('data', {}).get('children', [])
-
-						for post in posts:
-							post_data = post.get('data', {})
-							results.append({
-								"source": f"Reddit r/{language_subreddit}",
-								"title": post_data.get('title', 'No title'),
-								"url": f"https://www.reddit.com{post_data.get('permalink', '')}",
-								"upvotes": post_data.get('score', 0),
-								"type": "discussion"
-							})
-				except Exception as e:
-					print(f"Error fetching Reddit data: {e}")
+	def _insights_open_pulls(self, pulls_response: GitHubResponse) -> Dict[str, Any]:
+		if pulls_response.status_code != 200:
+			return {}
 
-			try:
-				opensource_reddit_url = "https://www.reddit.com/r/opensource/top.json?t=week&limit=3"
-				headers = {
-					"User-Agent": "Mozilla/5.0 OpenSourceGuide/1.0"
-				}
-
-				print(f"Fetching Reddit opensource data")
-				response = requests.get(opensource_reddit_url, headers=headers, timeout=10)
-				if response.status_code == 200:
-					data = response.json()
-					posts = data.get('data', {}).get('children', [])
-
-					for post in posts:
-						post_data = post.get('data', {})
-						results.append({
-							"source": "Reddit r/opensource",
-							"title": post_data.get('title', 'No title'),
-							"url": f"https://www.reddit.com{post_data.get('permalink', '')}",
-							"upvotes": post_data.get('score', 0),
-							"type": "discussion"
-						})
-			except Exception as e:
-				print(f"Error fetching Reddit opensource data: {e}")
+		return {"pull_requests": {"open": len(pulls_response.json())}}
 
-		except Exception as e:
-			print(f"Error in web crawling: {str(e)}")
+	def _insights_closed_pulls(self, closed_pulls_response: GitHubResponse) -> Dict[str, Any]:
+		if closed_pulls_response.status_code != 200:
+			return {}
 
-		return results
+		pull_requests = self._summarize_closed_pulls(closed_pulls_response.json())
+		return {"pull_requests": pull_requests} if pull_requests else {}
+
+	def _insights_community(self, community_response: GitHubResponse) -> Dict[str, Any]:
+		if community_response.status_code != 200:
+			return {}
+
+		community_data = community_response.json()
+		files = community_data.get("files", {})
+
+		return {
+			"community_profile": {
+				"has_readme": files.get("readme") is not None,
+				"has_contributing": files.get("contributing") is not None,
+				"has_code_of_conduct": files.get("code_of_conduct") is not None,
+				"has_issue_template": files.get("issue_template") is not None,
+				"has_pull_request_template": files.get("pull_request_template") is not None,
+				"health_percentage": community_data.get("health_percentage", 0)
+			}
+		}
+
+	def _insights_languages(self, languages_response: GitHubResponse) -> Dict[str, Any]:
+		if languages_response.status_code != 200:
+			return {}
+
+		technologies = self._technologies(languages_response.json())
+		return {"technologies": technologies} if technologies else {}
+
+	def _insights_related_resources(self, repo_full_name: str) -> Dict[str, Any]:
+		repo_parts = repo_full_name.split('/')
+		if len(repo_parts) != 2:
+			return {}
+
+		org_name, repo_name = repo_parts
+		# One-off repository names would crowd the pairs users asked for out of the refresh set
+		related_resources = self.crawl_for_open_source_info(topic=repo_name, track=False)
+		return {"related_resources": related_resources[:5]}
+
+	async def _ainsights_related_resources(self, repo_full_name: str) -> Dict[str, Any]:
+		repo_parts = repo_full_name.split('/')
+		if len(repo_parts) != 2:
+			return {}
+
+		org_name, repo_name = repo_parts
+		crawl = await self.acrawl_trending_sources(topic=repo_name, track=False)
+		return {"related_resources": crawl["results"][:5]}
+
+	@staticmethod
+	def _insights_graphql_variables(repo_full_name: str) -> dict:
+		owner, name = repo_full_name.split('/', 1)
+		since = (datetime.datetime.utcnow() - datetime.timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+		return {"owner": owner, "name": name, "since": since}
+
+	def _insights_graphql(self, repo_full_name: str) -> Dict[str, Any]:
+		"""Every GitHub-side insight in one GraphQL round trip, shaped like the REST sub-fetches"""
+		return self._insights_from_graphql(repo_full_name, self.github.graphql(PROJECT_INSIGHTS_QUERY, self._insights_graphql_variables(repo_full_name)))
+
+	async def _ainsights_graphql(self, repo_full_name: str) -> Dict[str, Any]:
+		return self._insights_from_graphql(repo_full_name, await self.github.agraphql(PROJECT_INSIGHTS_QUERY, self._insights_graphql_variables(repo_full_name)))
+
+	def _insights_from_graphql(self, repo_full_name: str, data: dict) -> Dict[str, Any]:
+		repo = data.get("repository")
+		if not repo:
+			raise ValueError(f"Repository {repo_full_name} not found")
+
+		partial = {
+			"stars": repo.get("stargazerCount", 0),
+			"forks": repo.get("forkCount", 0),
+			"watchers": (repo.get("watchers") or {}).get("totalCount", 0),
+			# REST's open_issues_count includes open pull requests
+			"open_issues": (repo.get("issues") or {}).get("totalCount", 0) + (repo.get("openPullRequests") or {}).get("totalCount", 0),
+			"license": (repo.get("licenseInfo") or {}).get("name", "Unknown") if repo.get("licenseInfo") else "Unknown"
+		}
+
+		branch = repo.get("defaultBranchRef") or {}
+		partial["default_branch"] = branch.get("name", "main")
+
+		# Top contributors come from commit authors inside the activity window
+		history = (branch.get("target") or {}).get("history")
+		if history is not None:
+			partial["commit_frequency"] = self._commit_frequency(history.get("totalCount", 0))
+
+			contributions = {}
+			for node in history.get("nodes") or []:
+				user = (node.get("author") or {}).get("user")
+				if not user:
+					continue
+				entry = contributions.setdefault(user["login"], {"login": user["login"], "contributions": 0, "url": user.get("url")})
+				entry["contributions"] += 1
+			partial["contributors"] = sorted(contributions.values(), key=lambda c: c["contributions"], reverse=True)[:5]
+
+		closed_pulls = [
+			{"created_at": pr["createdAt"], "merged_at": pr.get("mergedAt"), "closed_at": pr.get("closedAt")}
+			for pr in (repo.get("closedPullRequests") or {}).get("nodes") or []
+		]
+		partial["pull_requests"] = {"open": (repo.get("openPullRequests") or {}).get("totalCount", 0)}
+		partial["pull_requests"].update(self._summarize_closed_pulls(closed_pulls))
+
+		community_profile = {
+			"has_readme": repo.get("readme") is not None,
+			"has_contributing": any(repo.get(alias) is not None for alias in ("contributing", "githubContributing", "docsContributing")),
+			"has_code_of_conduct": repo.get("codeOfConduct") is not None,
+			"has_issue_template": bool(repo.get("issueTemplates")),
+			"has_pull_request_template": bool(repo.get("pullRequestTemplates"))
+		}
+		# GraphQL has no health score, so approximate GitHub's checklist-based percentage
+		checks = list(community_profile.values()) + [bool(repo.get("description")), repo.get("licenseInfo") is not None]
+		community_profile["health_percentage"] = round(100 * sum(checks) / len(checks))
+		partial["community_profile"] = community_profile
+
+		languages_data = {
+			edge["node"]["name"]: edge["size"]
+			for edge in (repo.get("languages") or {}).get("edges") or []
+		}
+		technologies = self._technologies(languages_data)
+		if technologies:
+			partial["technologies"] = technologies
+
+		return partial
 
 	def get_project_insights(self, repo_full_name: str, force_refresh: bool = False) -> Dict[str, Any]:
 		"""Get deeper insights about a project using GitHub API and web crawling"""
 		cache_key = f"insights_{repo_full_name}"
+
+		return INSIGHTS_CACHE.get_or_load(cache_key, lambda: self._fetch_project_insights(repo_full_name, cache_key), force_refresh)
+
+	async def aget_project_insights(self, repo_full_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		"""get_project_insights with the sub-fetches awaited side by side on the event loop"""
+		cache_key = f"insights_{repo_full_name}"
+
+		return await INSIGHTS_CACHE.aget_or_load(
+			cache_key,
+			lambda: self._afetch_project_insights(repo_full_name, cache_key),
+			lambda: self._fetch_project_insights(repo_full_name, cache_key),
+			force_refresh
+		)
+
+	def _fetch_project_insights(self, repo_full_name: str, cache_key: str) -> Dict[str, Any]:
+		current_time = time.time()
+
+		if INSIGHTS_BACKEND == "graphql":
+			sub_fetches = [(self._insights_graphql.__name__, functools.partial(self._insights_graphql, repo_full_name))]
+		else:
+			sub_fetches = [
+				(parse.__name__, functools.partial(self._insights_rest, path, options, parse))
+				for path, options, parse in self._insights_requests(repo_full_name)
+			]
+		sub_fetches.append((self._insights_related_resources.__name__, functools.partial(self._insights_related_resources, repo_full_name)))
+
+		# The sub-fetches are independent, so run them side by side and merge each part as it lands
+		priority = current_priority()
+		futures = {insights_executor.submit(run_with_priority, priority, fetch): name for name, fetch in sub_fetches}
+
+		return self._store_insights(repo_full_name, cache_key, current_time, (
+			(futures[future], future.exception() or future.result())
+			for future in concurrent.futures.as_completed(futures)
+		))
+
+	async def _afetch_project_insights(self, repo_full_name: str, cache_key: str) -> Dict[str, Any]:
 		current_time = time.time()
 
-		if not force_refresh and cache_key in REPO_CACHE and current_time - REPO_CACHE[cache_key]["timestamp"] < CACHE_CONFIG["repo"]["expiry"]:
-			print(f"Using cached insights for: {repo_full_name}")
-			return REPO_CACHE[cache_key]["data"]
+		if INSIGHTS_BACKEND == "graphql":
+			sub_fetches = [(self._insights_graphql.__name__, self._ainsights_graphql(repo_full_name))]
+		else:
+			sub_fetches = [(parse.__name__, self._ainsights_rest(path, options, parse)) for path, options, parse in self._insights_requests(repo_full_name)]
+		sub_fetches.append((self._insights_related_resources.__name__, self._ainsights_related_resources(repo_full_name)))
 
+		outcomes = await asyncio.gather(*(fetch for _, fetch in sub_fetches), return_exceptions=True)
+		return await run_in_threadpool(self._store_insights, repo_full_name, cache_key, current_time, zip((name for name, _ in sub_fetches), outcomes))
+
+	def _store_insights(self, repo_full_name: str, cache_key: str, current_time: float, outcomes) -> Dict[str, Any]:
+		"""Merge the (sub-fetch name, partial or exception) outcomes; cache only when every part arrived"""
 		insights = {
 			"repo_name": repo_full_name,
 			"contributors": [],
@@ -986,461 +3696,773 @@ class OpenSourceChat:
 			"technologies": [],
 			"related_resources": []
 		}
+		failed = []
+
+		for name, partial in outcomes:
+			if isinstance(partial, Exception):
+				print(f"Error getting project insights ({name}): {str(partial)}")
+				failed.append(name)
+				continue
+
+			for key, value in partial.items():
+				if isinstance(value, dict) and isinstance(insights.get(key), dict):
+					insights[key].update(value)
+				else:
+					insights[key] = value
 
-		headers = {
-			"Authorization": f"token {GITHUB_TOKEN}",
-			"Accept": "application/vnd.github.v3+json"
+		if not failed:
+			INSIGHTS_CACHE.set(cache_key, {
+				"data": insights,
+				"timestamp": current_time
+			})
+
+		return insights
+
+	def _stackoverflow_params(self, repo_name: str = None, topic: str = None) -> Dict[str, Any]:
+		if not repo_name and not topic:
+			if self.user_preferences["languages"]:
+				topic = self.user_preferences["languages"][0]
+			elif self.user_preferences["interests"]:
+				topic = self.user_preferences["interests"][0]
+			else:
+				topic = "open source"
+
+		search_term = repo_name if repo_name else topic
+		return {
+			"order": "desc",
+			"sort": "votes",
+			"intitle": search_term.replace("/", " "),
+			"site": "stackoverflow",
+			"pagesize": 5
 		}
 
+	def _parse_stackoverflow_questions(self, response) -> List[Dict[str, Any]]:
+		"""Questions from a Stack Exchange search response (requests or httpx)"""
+		if response.status_code != 200:
+			print(f"Stack Overflow API returned status {response.status_code}")
+			return []
+
+		questions = []
+		for item in response.json().get("items", []):
+			questions.append({
+				"title": item.get("title"),
+				"link": item.get("link"),
+				"score": item.get("score"),
+				"answer_count": item.get("answer_count"),
+				"tags": item.get("tags"),
+				"is_answered": item.get("is_answered")
+			})
+
+		return questions
+
+	def get_stackoverflow_questions(self, repo_name: str = None, topic: str = None) -> List[Dict[str, Any]]:
+		"""Get relevant Stack Overflow questions about a repository or topic"""
+		try:
+			response = requests.get(STACKEXCHANGE_API_URL, params=self._stackoverflow_params(repo_name, topic), timeout=10)
+			return self._parse_stackoverflow_questions(response)
+		except Exception as e:
+			print(f"Error fetching Stack Overflow questions: {str(e)}")
+			return []
+
+	async def aget_stackoverflow_questions(self, repo_name: str = None, topic: str = None) -> List[Dict[str, Any]]:
+		"""get_stackoverflow_questions over the non-blocking client"""
 		try:
+			response = await async_http.get(STACKEXCHANGE_API_URL, params=self._stackoverflow_params(repo_name, topic), timeout=10)
+			return self._parse_stackoverflow_questions(response)
+		except Exception as e:
+			print(f"Error fetching Stack Overflow questions: {str(e)}")
+			return []
 
-			repo_url = f"https://api.github.com/repos/{repo_full_name}"
-			repo_response = requests.get(repo_url, headers=headers, timeout=10)
-			repo_data = repo_response.json()
-
-			insights["stars"] = repo_data.get("stargazers_count", 0)
-			insights["forks"] = repo_data.get("forks_count", 0)
-			insights["watchers"] = repo_data.get("subscribers_count", 0) if "subscribers_count" in repo_data else 0
-			insights["open_issues"] = repo_data.get("open_issues_count", 0)
-			insights["default_branch"] = repo_data.get("default_branch", "main")
-			insights["license"] = repo_data.get("license", {}).get("name", "Unknown") if repo_data.get("license") else "Unknown"
-
-			contributors_url = f"https://api.github.com/repos/{repo_full_name}/contributors"
-			contributors_response = requests.get(contributors_url, headers=headers, params={"per_page": 5}, timeout=10)
-			contributors_data = contributors_response.json()
-
-			if isinstance(contributors_data, list):
-				insights["contributors"] = [
-					{"login": c.get("login"), "contributions": c.get("contributions"), "url": c.get("html_url")}
-					for c in contributors_data
-				]
-
-			commits_url = f"https://api.github.com/repos/{repo_full_name}/commits"
-			current_date = datetime.datetime.now()
-			one_month_ago = (current_date - datetime.timedelta(days=30)).strftime("%Y-%m-%d")
-
-			commits_response = requests.get(
-				commits_url,
-				headers=headers,
-				params={"since": one_month_ago, "per_page": 100},
-				timeout=10
-			)
+	def _context_trending(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		topic, language = self._trending_target(question)
+		return self._trending_context(self.crawl_trending_sources(topic=topic, language=language))
+
+	async def _acontext_trending(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		topic, language = self._trending_target(question)
+		return self._trending_context(await self.acrawl_trending_sources(topic=topic, language=language))
+
+	def _trending_target(self, question: str) -> tuple:
+		"""(topic, language) for the trending crawl: the question's own, else the user's preferences"""
+		language = None
+		topic = None
+
+		if self.user_preferences["languages"]:
+			language = self.user_preferences["languages"][0]
+
+		if self.user_preferences["interests"]:
+			topic = self.user_preferences["interests"][0]
+
+		extracted_langs = self._extract_language_preferences(question)
+		if extracted_langs:
+			language = extracted_langs[0]
+
+		extracted_interests = self._extract_interests(question)
+		if extracted_interests:
+			topic = extracted_interests[0]
+
+		return topic, language
+
+	def _trending_context(self, crawl: Dict[str, Any]) -> Dict[str, Any]:
+		context_data = {}
+
+		trending_data = crawl["results"]
+		if crawl["skipped_sources"]:
+			context_data["trending_skipped_sources"] = crawl["skipped_sources"]
+		if trending_data:
+			context_data["trending"] = trending_data
+
+			trending_text = []
+
+			sources = {}
+			for item in trending_data:
+				source = item.get("source", "Unknown")
+				if source not in sources:
+					sources[source] = []
+				sources[source].append(item)
+
+			for source, items in sources.items():
+				trending_text.append(f"From {source}:")
+				for item in items:
+					if item.get("type") == "repository":
+						trending_text.append(f"- Repository: [{item.get('name')}]({item.get('url')})")
+						if "description" in item:
+							trending_text.append(f"  Description: {item.get('description')}")
+						if "popularity" in item:
+							trending_text.append(f"  Popularity: {item.get('popularity')}")
+					else:
+						trending_text.append(f"- [{item.get('title')}]({item.get('url')})")
+						if "published_date" in item:
+							trending_text.append(f"  Published: {item.get('published_date')}")
+						if "upvotes" in item:
+							trending_text.append(f"  Upvotes: {item.get('upvotes')}")
+					trending_text.append("")
+
+			context_data["trending_text"] = "\n".join(trending_text)
+
+		return context_data
+
+	def _context_repositories(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		query, language = self._repositories_target()
+		return self._repositories_context(self.search_repositories(query=query, language=language, force_refresh=force_refresh))
+
+	async def _acontext_repositories(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		query, language = self._repositories_target()
+		return self._repositories_context(await self.asearch_repositories(query=query, language=language, force_refresh=force_refresh))
+
+	def _repositories_target(self) -> tuple:
+		language = ""
+		if self.user_preferences["languages"]:
+			language = self.user_preferences["languages"][0]
+
+		query = "good first issue"
+		if self.user_preferences["interests"]:
+			query += " " + " ".join(self.user_preferences["interests"][:2])
+
+		return query, language
+
+	def _repositories_context(self, repos: list[dict]) -> Dict[str, Any]:
+		context_data = {}
+
+		if repos:
+			repo_list = []
+			for i, repo in enumerate(repos[:7]):
+				repo_list.append(f"- {repo['name']}: {repo['description'][:100]}..." if len(repo['description']) > 100 else f"- {repo['name']}: {repo['description']}")
+				repo_list.append(f"  Language: {repo['language']}, Stars: {repo['stars']}, Open Issues: {repo['open_issues_count']}")
 
-			if commits_response.status_code == 200:
-				commits_data = commits_response.json()
-				if len(commits_data) > 50:
-					insights["commit_frequency"] = "Very Active (50+ commits in last month)"
-				elif len(commits_data) > 20:
-					insights["commit_frequency"] = "Active (20-50 commits in last month)"
-				elif len(commits_data) > 5:
-					insights["commit_frequency"] = "Moderately Active (5-20 commits in last month)"
-				else:
-					insights["commit_frequency"] = "Low Activity (< 5 commits in last month)"
-
-			pulls_url = f"https://api.github.com/repos/{repo_full_name}/pulls"
-			pulls_response = requests.get(
-				pulls_url,
-				headers=headers,
-				params={"state": "open", "per_page": 100},
-				timeout=10
-			)
+			context_data["repositories"] = repos
+			context_data["repo_list"] = "\n".join(repo_list)
 
-			if pulls_response.status_code == 200:
-				open_pulls = pulls_response.json()
-				insights["pull_requests"]["open"] = len(open_pulls)
+		return context_data
 
-				closed_pulls_response = requests.get(
-					pulls_url,
-					headers=headers,
-					params={"state": "closed", "per_page": 100},
-					timeout=10
-				)
+	def _context_issues(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._issues_context(self.search_issues(repo_name, force_refresh=force_refresh))
 
-				if closed_pulls_response.status_code == 200:
-					closed_pulls = closed_pulls_response.json()
-					merged_count = sum(1 for pr in closed_pulls if pr.get("merged_at") is not None)
-
-					if closed_pulls:
-						insights["pull_requests"]["merged_rate"] = round((merged_count / len(closed_pulls)) * 100, 1)
-
-					if closed_pulls:
-						response_times = []
-						for pr in closed_pulls[:20]:
-							created = datetime.datetime.strptime(pr["created_at"], "%Y-%m-%dT%H:%M:%SZ")
-							if pr.get("merged_at"):
-								closed = datetime.datetime.strptime(pr["merged_at"], "%Y-%m-%dT%H:%M:%SZ")
-							else:
-								closed = datetime.datetime.strptime(pr["closed_at"], "%Y-%m-%dT%H:%M:%SZ")
-
-							response_time = (closed - created).total_seconds() / 3600
-							response_times.append(response_time)
-
-						if response_times:
-							avg_time = sum(response_times) / len(response_times)
-							if avg_time < 24:
-								insights["pull_requests"]["response_time"] = f"Fast (< 24 hours)"
-							elif avg_time < 72:
-								insights["pull_requests"]["response_time"] = f"Medium (1-3 days)"
-							else:
-								insights["pull_requests"]["response_time"] = f"Slow (> 3 days)"
-
-			community_url = f"https://api.github.com/repos/{repo_full_name}/community/profile"
-			community_headers = {
-				"Authorization": f"token {GITHUB_TOKEN}",
-				"Accept": "application/vnd.github.black-panther-preview+json"
-			}
+	async def _acontext_issues(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._issues_context(await self.asearch_issues(repo_name, force_refresh=force_refresh))
 
-			community_response = requests.get(community_url, headers=community_headers, timeout=10)
-			if community_response.status_code == 200:
-				community_data = community_response.json()
-				files = community_data.get("files", {})
-
-				community_profile = {
-					"has_readme": files.get("readme") is not None,
-					"has_contributing": files.get("contributing") is not None,
-					"has_code_of_conduct": files.get("code_of_conduct") is not None,
-					"has_issue_template": files.get("issue_template") is not None,
-					"has_pull_request_template": files.get("pull_request_template") is not None,
-					"health_percentage": community_data.get("health_percentage", 0)
-				}
-
-				insights["community_profile"] = community_profile
-
-			languages_url = f"https://api.github.com/repos/{repo_full_name}/languages"
-			languages_response = requests.get(languages_url, headers=headers, timeout=10)
-			if languages_response.status_code == 200:
-				languages_data = languages_response.json()
-
-				total_bytes = sum(languages_data.values())
-				if total_bytes > 0:
-					insights["technologies"] = [
-						{"name": lang, "percentage": round((bytes_count / total_bytes) * 100, 1)}
-						for lang, bytes_count in sorted(languages_data.items(), key=lambda x: x[1], reverse=True)
-					]
-
-			repo_parts = repo_full_name.split('/')
-			if len(repo_parts) == 2:
-				org_name, repo_name = repo_parts
-				related_resources = self.crawl_for_open_source_info(topic=repo_name)
-				insights["related_resources"] = related_resources[:5]
-
-			REPO_CACHE[cache_key] = {
-				"data": insights,
-				"timestamp": current_time
-			}
+	def _issues_context(self, issues: list[dict]) -> Dict[str, Any]:
+		context_data = {}
 
-			return insights
+		if issues:
+			issue_list = []
+			for i, issue in enumerate(issues[:5]):
+				label_text = ", ".join([label["name"] for label in issue["labels"][:3]])
+				issue_list.append(f"- Issue #{issue['number']}: {issue['title']}")
+				issue_list.append(f"  Labels: {label_text if label_text else 'None'}")
+				issue_list.append(f"  URL: {issue['url']}")
 
-		except Exception as e:
-			print(f"Error getting project insights: {str(e)}")
-			return insights
+			context_data["issues"] = issues
+			context_data["issue_list"] = "\n".join(issue_list)
 
-	def get_stackoverflow_questions(self, repo_name: str = None, topic: str = None) -> List[Dict[str, Any]]:
-		"""Get relevant Stack Overflow questions about a repository or topic"""
-		if not repo_name and not topic:
-			if self.user_preferences["languages"]:
-				topic = self.user_preferences["languages"][0]
-			elif self.user_preferences["interests"]:
-				topic = self.user_preferences["interests"][0]
-			else:
-				topic = "open source"
+		return context_data
 
-		search_term = repo_name if repo_name else topic
-		search_term = search_term.replace("/", " ")
+	def _context_guide(self, repo_name: str, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		guide = self.get_contribution_guide(repo_name, force_refresh=force_refresh)
+		# Only the excerpt travels with the response; the full guide is at /api/contribution_guide
+		return {
+			"guide_excerpt": self._guide_excerpt(repo_name, guide, question)
+		}
 
-		url = "https://api.stackexchange.com/2.3/search"
-		params = {
-			"order": "desc",
-			"sort": "votes",
-			"intitle": search_term,
-			"site": "stackoverflow",
-			"pagesize": 5
+	async def _acontext_guide(self, repo_name: str, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		guide = await self.aget_contribution_guide(repo_name, force_refresh=force_refresh)
+		# Ranking the chunks may call the (blocking) embeddings client
+		return {
+			"guide_excerpt": await run_in_threadpool(self._guide_excerpt, repo_name, guide, question)
 		}
 
-		try:
-			response = requests.get(url, params=params, timeout=10)
-			if response.status_code == 200:
-				data = response.json()
-				questions = []
-
-				for item in data.get("items", []):
-					questions.append({
-						"title": item.get("title"),
-						"link": item.get("link"),
-						"score": item.get("score"),
-						"answer_count": item.get("answer_count"),
-						"tags": item.get("tags"),
-						"is_answered": item.get("is_answered")
-					})
+	def _context_insights(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._insights_context(repo_name, self.get_project_insights(repo_name, force_refresh=force_refresh))
+
+	async def _acontext_insights(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._insights_context(repo_name, await self.aget_project_insights(repo_name, force_refresh=force_refresh))
+
+	def _insights_context(self, repo_name: str, insights: Dict[str, Any]) -> Dict[str, Any]:
+		context_data = {}
+
+		if insights:
+			insight_text = [f"Insights for {repo_name}:"]
+			insight_text.append(f"- Stars: {insights.get('stars', 'N/A')}")
+			insight_text.append(f"- Forks: {insights.get('forks', 'N/A')}")
+			insight_text.append(f"- Open Issues: {insights.get('open_issues', 'N/A')}")
+			insight_text.append(f"- Activity: {insights.get('commit_frequency', 'Unknown')}")
+			insight_text.append(f"- Pull Request Merge Rate: {insights.get('pull_requests', {}).get('merged_rate', 0)}%")
+			insight_text.append(f"- PR Response Time: {insights.get('pull_requests', {}).get('response_time', 'Unknown')}")
+
+			community = insights.get('community_profile', {})
+			health_score = community.get('health_percentage', 0)
+			health_rating = "Excellent" if health_score > 80 else "Good" if health_score > 60 else "Fair" if health_score > 40 else "Poor"
+			insight_text.append(f"- Community Health: {health_rating} ({health_score}%)")
+
+			docs = []
+			if community.get('has_readme'):
+				docs.append("README")
+			if community.get('has_contributing'):
+				docs.append("CONTRIBUTING")
+			if community.get('has_code_of_conduct'):
+				docs.append("CODE_OF_CONDUCT")
+			doc_status = ", ".join(docs) if docs else "Minimal"
+			insight_text.append(f"- Documentation: {doc_status}")
+
+			techs = insights.get('technologies', [])
+			if techs:
+				tech_list = ", ".join([f"{t['name']} ({t['percentage']}%)" for t in techs[:3]])
+				insight_text.append(f"- Top Technologies: {tech_list}")
+
+			context_data["insights"] = insights
+			context_data["insight_text"] = "\n".join(insight_text)
+
+		return context_data
+
+	def _context_stackoverflow(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._stackoverflow_context(self.get_stackoverflow_questions(repo_name=repo_name))
+
+	async def _acontext_stackoverflow(self, repo_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+		return self._stackoverflow_context(await self.aget_stackoverflow_questions(repo_name=repo_name))
+
+	def _stackoverflow_context(self, stack_questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+		context_data = {}
+
+		if stack_questions:
+			question_text = ["Relevant Stack Overflow questions:"]
+			for q in stack_questions:
+				answered = "✓" if q.get("is_answered") else "✗"
+				question_text.append(f"- [{answered}] {q.get('title')}")
+				question_text.append(f"  Score: {q.get('score')}, Answers: {q.get('answer_count')}")
+				question_text.append(f"  Link: {q.get('link')}")
+
+			context_data["stackoverflow"] = stack_questions
+			context_data["stackoverflow_text"] = "\n".join(question_text)
+
+		return context_data
+
+	def _context_fetchers(self, question: str) -> List[tuple]:
+		"""(fetcher, arguments) pairs for the real-time data that the question's intents call for"""
+		intents = extract_entities(question)["intents"]
+		repo_name = self._extract_repo_from_question(question)
+
+		fetchers = []
+		if "trending" in intents:
+			fetchers.append((self._context_trending, (question,)))
+		if "repositories" in intents:
+			fetchers.append((self._context_repositories, (question,)))
+		if "issues" in intents and repo_name:
+			fetchers.append((self._context_issues, (repo_name,)))
+		if ("contribute" in intents or "guide" in intents) and repo_name:
+			fetchers.append((self._context_guide, (repo_name, question)))
+		if "insights" in intents and repo_name:
+			fetchers.append((self._context_insights, (repo_name,)))
+		if "help" in intents:
+			fetchers.append((self._context_stackoverflow, (repo_name,)))
+
+		return fetchers
+
+	def _gather_context(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		"""Fetch the real-time data that the question's intents call for"""
+		fetchers = self._context_fetchers(question)
+
+		# The fetchers are independent, so the context costs the slowest one rather than their sum
+		futures = [context_executor.submit(fetch, *args, force_refresh=force_refresh) for fetch, args in fetchers]
+		concurrent.futures.wait(futures)
+
+		return self._merge_context(fetchers, [future.exception() or future.result() for future in futures])
+
+	async def _agather_context(self, question: str, force_refresh: bool = False) -> Dict[str, Any]:
+		"""_gather_context for the event loop: every fetcher's async twin is awaited side by side"""
+		fetchers = self._context_fetchers(question)
+		native = {
+			self._context_trending.__name__: self._acontext_trending,
+			self._context_repositories.__name__: self._acontext_repositories,
+			self._context_issues.__name__: self._acontext_issues,
+			self._context_guide.__name__: self._acontext_guide,
+			self._context_insights.__name__: self._acontext_insights,
+			self._context_stackoverflow.__name__: self._acontext_stackoverflow
+		}
 
-				return questions
-			else:
-				print(f"Stack Overflow API returned status {response.status_code}")
-				return []
-		except Exception as e:
-			print(f"Error fetching Stack Overflow questions: {str(e)}")
-			return []
+		pending = [native[fetch.__name__](*args, force_refresh=force_refresh) for fetch, args in fetchers]
+		return self._merge_context(fetchers, await asyncio.gather(*pending, return_exceptions=True))
+
+	def _merge_context(self, fetchers: List[tuple], outcomes: List[Any]) -> Dict[str, Any]:
+		# Merge in dispatch order; one failing source only drops its own section of the prompt
+		context_data = {}
+		failed = []
+		for (fetch, _), outcome in zip(fetchers, outcomes):
+			if isinstance(outcome, Exception):
+				print(f"Error gathering context ({fetch.__name__}): {str(outcome)}")
+				failed.append(fetch.__name__)
+				continue
+			context_data.update(outcome)
+
+		if failed:
+			context_data["context_errors"] = failed
+
+		return context_data
+
+	# Real-time sections in prompt order: (context key, text key, title, intents that make it a priority)
+	PROMPT_SECTIONS = [
+		("repositories", "repo_list", "REPOSITORIES FOUND", ("repositories",)),
+		("issues", "issue_list", "ISSUES FOUND", ("issues",)),
+		("guide_excerpt", "guide_excerpt", "CONTRIBUTION GUIDE (most relevant sections)", ("contribute", "guide")),
+		("insights", "insight_text", "REPOSITORY INSIGHTS", ("insights",)),
+		("stackoverflow_text", "stackoverflow_text", "RELEVANT QUESTIONS", ("help",)),
+		("trending_text", "trending_text", "TRENDING DATA", ("trending",))
+	]
+
+	def _build_system_message(self, context_data: Dict[str, Any], question: str = "", knowledge: str = "") -> tuple:
+		"""Assemble the system prompt from the user profile, the real-time data and knowledge-base passages
+		within the token budget. Returns (system_message, report)."""
+		header = """You are GitHelpDesk, an expert assistant specializing in helping users contribute to open source projects.
+		Your primary goal is to help users find suitable projects, understand contribution processes, and solve technical issues
+		related to open source contribution. Be practical, direct, and provide specific actionable guidance.
+
+		Current User Profile:
+		"""
+
+		if self.user_preferences["languages"]:
+			header += f"\nLanguages: {', '.join(self.user_preferences['languages'])}"
+		if self.user_preferences["interests"]:
+			header += f"\nInterests: {', '.join(self.user_preferences['interests'])}"
+		if self.user_preferences["skill_level"]:
+			header += f"\nSkill Level: {self.user_preferences['skill_level']}"
+		if self.user_preferences["previous_repos"]:
+			header += f"\nPreviously Discussed Repos: {', '.join(self.user_preferences['previous_repos'][-3:])}"
+
+		header += "\n\n--- REAL-TIME DATA ---\n"
+
+		# What the question asks about is kept whole first; the rest shares what is left, in prompt order
+		intents = extract_entities(question)["intents"]
+		sections = []
+		for order, (key, text_key, title, section_intents) in enumerate(self.PROMPT_SECTIONS):
+			if key in context_data:
+				sections.append({
+					"name": key,
+					"title": title,
+					"text": context_data[text_key],
+					"priority": (0 if intents.intersection(section_intents) else 2, order)
+				})
+		if knowledge:
+			sections.append({"name": "knowledge", "title": "KNOWLEDGE BASE", "text": knowledge, "priority": (1, 0)})
+
+		footer = "\n\nProvide a helpful, informative response based on the real-time data above and your expertise. When recommending repositories or issues, be specific and give actual names and links. If asked about contribution steps, provide detailed guidance tailored to the user's skill level and the specific repository."
+
+		return prompt_assembler.assemble(header, sections, footer)
+
+	def _conversation_messages(self, system_message: str, question: str) -> List[dict]:
+		"""The prompt, then the rolling summary and the recent window of turns, then the question"""
+		with self.history_lock:
+			summary = self.summary
+			window = self._memory_window()
+
+		if summary:
+			system_message += f"\n\nSummary of the earlier conversation: {summary}"
+		messages = [{"role": "system", "content": system_message}]
+		for message in window:
+			messages.append({"role": "user" if isinstance(message, HumanMessage) else "assistant", "content": message.content})
+		messages.append({"role": "user", "content": question})
+		return messages
+
+	def _answer_fingerprint(self, context_data: Dict[str, Any]) -> str:
+		"""Everything besides the question that shapes a direct LLM answer: profile, conversation so far
+		and real-time sections"""
+		with self.history_lock:
+			conversation = [self.summary] + [message.content for message in self._memory_window()]
+		return content_hash(json.dumps({
+			"conversation": conversation,
+			"profile": {
+				"languages": self.user_preferences["languages"],
+				"interests": self.user_preferences["interests"],
+				"skill_level": self.user_preferences["skill_level"],
+				"previous_repos": self.user_preferences["previous_repos"][-3:]
+			},
+			"context": {text_key: context_data[key] and context_data[text_key] for key, text_key, _, _ in self.PROMPT_SECTIONS if key in context_data}
+		}, sort_keys=True, default=str))
 
 	def get_response(self, question: str, use_realtime: bool = True, force_refresh: bool = False):
 		"""Process questions and generate responses with dynamic data and web crawling"""
 
 		self._update_user_preferences(question)
 
-		is_repo_question = any(x in question.lower() for x in ["repository", "repositories", "repos", "projects"])
-		is_issue_question = "issue" in question.lower()
-		is_contribute_question = any(x in question.lower() for x in ["contribute", "contributing", "contribution"])
-		is_guide_question = any(x in question.lower() for x in ["guide", "how to", "steps", "process"])
-		is_trend_question = any(x in question.lower() for x in ["trend", "trending", "popular", "new", "latest"])
-		is_insight_question = any(x in question.lower() for x in ["insight", "activity", "stats", "statistics", "health"])
-		is_help_question = any(x in question.lower() for x in ["help", "assistance", "stuck", "problem", "error"])
-
 		try:
 
-			context_data = {}
-
-			repo_name = self._extract_repo_from_question(question)
-
-			if is_trend_question or "crawl" in question.lower():
-				language = None
-				topic = None
-
-				if self.user_preferences["languages"]:
-					language = self.user_preferences["languages"][0]
-
-				if self.user_preferences["interests"]:
-					topic = self.user_preferences["interests"][0]
-
-				extracted_langs = self._extract_language_preferences(question)
-				if extracted_langs:
-					language = extracted_langs[0]
-
-				extracted_interests = self._extract_interests(question)
-				if extracted_interests:
-					topic = extracted_interests[0]
-
-				trending_data = self.crawl_for_open_source_info(topic=topic, language=language)
-				if trending_data:
-					context_data["trending"] = trending_data
-
-					trending_text = []
-
-					sources = {}
-					for item in trending_data:
-						source = item.get("source", "Unknown")
-						if source not in sources:
-							sources[source] = []
-						sources[source].append(item)
-
-					for source, items in sources.items():
-						trending_text.append(f"From {source}:")
-						for item in items:
-							if item.get("type") == "repository":
-								trending_text.append(f"- Repository: [{item.get('name')}]({item.get('url')})")
-								if "description" in item:
-									trending_text.append(f"  Description: {item.get('description')}")
-								if "popularity" in item:
-									trending_text.append(f"  Popularity: {item.get('popularity')}")
-							else:
-								trending_text.append(f"- [{item.get('title')}]({item.get('url')})")
-								if "published_date" in item:
-									trending_text.append(f"  Published: {item.get('published_date')}")
-								if "upvotes" in item:
-									trending_text.append(f"  Upvotes: {item.get('upvotes')}")
-							trending_text.append("")
-
-					context_data["trending_text"] = "\n".join(trending_text)
-
-			if is_repo_question:
-
-				language = ""
-				if self.user_preferences["languages"]:
-					language = self.user_preferences["languages"][0]
-
-				query = "good first issue"
-				if self.user_preferences["interests"]:
-					query += " " + " ".join(self.user_preferences["interests"][:2])
-
-				repos = self.search_repositories(query=query, language=language, force_refresh=force_refresh)
-				if repos:
-					repo_list = []
-					for i, repo in enumerate(repos[:7]):
-						repo_list.append(f"- {repo['name']}: {repo['description'][:100]}..." if len(repo['description']) > 100 else f"- {repo['name']}: {repo['description']}")
-						repo_list.append(f"  Language: {repo['language']}, Stars: {repo['stars']}, Open Issues: {repo['open_issues_count']}")
-
-					context_data["repositories"] = repos
-					context_data["repo_list"] = "\n".join(repo_list)
-
-			if is_issue_question and repo_name:
-				issues = self.search_issues(repo_name, force_refresh=force_refresh)
-				if issues:
-					issue_list = []
-					for i, issue in enumerate(issues[:5]):
-						label_text = ", ".join([label["name"] for label in issue["labels"][:3]])
-						issue_list.append(f"- Issue #{issue['number']}: {issue['title']}")
-						issue_list.append(f"  Labels: {label_text if label_text else 'None'}")
-						issue_list.append(f"  URL: {issue['url']}")
-
-					context_data["issues"] = issues
-					context_data["issue_list"] = "\n".join(issue_list)
-
-			if is_contribute_question or is_guide_question:
-				if repo_name:
-					guide_content = self.get_contribution_guide(repo_name, force_refresh=force_refresh)
-					context_data["contribution_guide"] = guide_content
-
-			if is_insight_question and repo_name:
-				insights = self.get_project_insights(repo_name, force_refresh=force_refresh)
-				if insights:
-					insight_text = [f"Insights for {repo_name}:"]
-					insight_text.append(f"- Stars: {insights.get('stars', 'N/A')}")
-					insight_text.append(f"- Forks: {insights.get('forks', 'N/A')}")
-					insight_text.append(f"- Open Issues: {insights.get('open_issues', 'N/A')}")
-					insight_text.append(f"- Activity: {insights.get('commit_frequency', 'Unknown')}")
-					insight_text.append(f"- Pull Request Merge Rate: {insights.get('pull_requests', {}).get('merged_rate', 0)}%")
-					insight_text.append(f"- PR Response Time: {insights.get('pull_requests', {}).get('response_time', 'Unknown')}")
-
-					community = insights.get('community_profile', {})
-					health_score = community.get('health_percentage', 0)
-					health_rating = "Excellent" if health_score > 80 else "Good" if health_score > 60 else "Fair" if health_score > 40 else "Poor"
-					insight_text.append(f"- Community Health: {health_rating} ({health_score}%)")
-
-					docs = []
-					if community.get('has_readme'):
-						docs.append("README")
-					if community.get('has_contributing'):
-						docs.append("CONTRIBUTING")
-					if community.get('has_code_of_conduct'):
-						docs.append("CODE_OF_CONDUCT")
-					doc_status = ", ".join(docs) if docs else "Minimal"
-					insight_text.append(f"- Documentation: {doc_status}")
-
-					techs = insights.get('technologies', [])
-					if techs:
-						tech_list = ", ".join([f"{t['name']} ({t['percentage']}%)" for t in techs[:3]])
-						insight_text.append(f"- Top Technologies: {tech_list}")
-
-					context_data["insights"] = insights
-					context_data["insight_text"] = "\n".join(insight_text)
-
-			if is_help_question:
-
-				stack_questions = self.get_stackoverflow_questions(repo_name=repo_name)
-				if stack_questions:
-					question_text = ["Relevant Stack Overflow questions:"]
-					for q in stack_questions:
-						answered = "✓" if q.get("is_answered") else "✗"
-						question_text.append(f"- [{answered}] {q.get('title')}")
-						question_text.append(f"  Score: {q.get('score')}, Answers: {q.get('answer_count')}")
-						question_text.append(f"  Link: {q.get('link')}")
-
-					context_data["stackoverflow"] = stack_questions
-					context_data["stackoverflow_text"] = "\n".join(question_text)
-
-			system_message = """You are GitHelpDesk, an expert assistant specializing in helping users contribute to open source projects.
-			Your primary goal is to help users find suitable projects, understand contribution processes, and solve technical issues
-			related to open source contribution. Be practical, direct, and provide specific actionable guidance.
-
-			Current User Profile:
-			"""
+			context_data = self._gather_context(question, force_refresh)
+			system_message, prompt_report = self._build_system_message(context_data, question)
 
-			if self.user_preferences["languages"]:
-				system_message += f"\nLanguages: {', '.join(self.user_preferences['languages'])}"
-			if self.user_preferences["interests"]:
-				system_message += f"\nInterests: {', '.join(self.user_preferences['interests'])}"
-			if self.user_preferences["skill_level"]:
-				system_message += f"\nSkill Level: {self.user_preferences['skill_level']}"
-			if self.user_preferences["previous_repos"]:
-				system_message += f"\nPreviously Discussed Repos: {', '.join(self.user_preferences['previous_repos'][-3:])}"
+			# A near-identical question against the same context, profile and conversation reuses an
+			# earlier answer, whichever path produced it
+			fingerprint = self._answer_fingerprint(context_data)
+			answer, vector = answer_cache.lookup(fingerprint, question, self.embeddings) if answer_cache.enabled else (None, None)
+			cached = answer is not None
+			source_documents = []
+
+			if not cached:
+				if self.conversation_chain:
+					try:
+						result = llm_gateway.call(self.conversation_chain, self._chain_inputs(question, system_message, prompt_report))
+						answer = result["answer"]
+						prompt_report = self._chain_prompt_report(prompt_report, result.get("source_documents", []))
+						source_documents = [
+							{"content": doc.page_content, "metadata": doc.metadata}
+							for doc in result.get("source_documents", [])
+						]
+					except LLMOverloaded:
+						raise
+					except Exception as e:
+						print(f"Error using conversation chain: {str(e)}")
+				elif not self.vectorstore:
+					self.initialize_vectorstore()
+
+				if answer is None:
+					messages = self._conversation_messages(system_message, question)
+
+					response = llm_gateway.invoke(self.llm, messages)
+					answer = response.content
+				if answer_cache.enabled:
+					answer_cache.store_answer(fingerprint, question, answer, vector)
+
+			self.add_message_to_history(question, answer)
+
+			return {
+				"answer": answer,
+				"source_documents": source_documents,
+				"cached": cached,
+				"context_data": context_data,
+				"prompt": prompt_report
+			}
+		except Exception as e:
 
-			system_message += "\n\n--- REAL-TIME DATA ---\n"
+			print(f"Error in get_response: {str(e)}")
 
-			if "repositories" in context_data:
-				system_message += f"\nREPOSITORIES FOUND:\n{context_data['repo_list']}\n"
+			return self._error_payload(e)
 
-			if "issues" in context_data:
-				system_message += f"\nISSUES FOUND:\n{context_data['issue_list']}\n"
+	def _chain_inputs(self, question: str, system_message: str, prompt_report: Dict[str, Any]) -> Dict[str, Any]:
+		"""Retrieval chain inputs: the assembled prompt, and what is left of the budget for its passages"""
+		return {
+			"question": question,
+			"chat_history": self._chain_history(),
+			"system_message": system_message,
+			"knowledge_tokens": max(prompt_report["budget"] - prompt_report["tokens"], 0)
+		}
 
-			if "contribution_guide" in context_data:
-				system_message += f"\nCONTRIBUTION GUIDE:\n{context_data['contribution_guide'][:1000]}...\n"
+	@staticmethod
+	def _chain_prompt_report(prompt_report: Dict[str, Any], source_documents: list) -> Dict[str, Any]:
+		"""The prompt report with the passages the chain stuffed in as the knowledge section"""
+		knowledge = sum(estimate_tokens(doc.page_content + "\n") for doc in source_documents)
+		return dict(
+			prompt_report,
+			sections=dict(prompt_report["sections"], knowledge=knowledge),
+			tokens=prompt_report["tokens"] + knowledge
+		)
 
-			if "insights" in context_data:
-				system_message += f"\nREPOSITORY INSIGHTS:\n{context_data['insight_text']}\n"
+	def _error_payload(self, e: Exception) -> Dict[str, Any]:
+		payload = {
+			"answer": self._error_message(e),
+			"error": str(e)
+		}
+		if isinstance(e, LLMOverloaded):
+			payload["status"] = "overloaded"
+			payload["retry_after"] = e.retry_after
+		return payload
+
+	def _error_message(self, e: Exception) -> str:
+		error_message = "I apologize, but I encountered an error while processing your request. "
+
+		if isinstance(e, LLMOverloaded):
+			error_message += "The assistant is handling too many requests right now. Please try again in a few seconds."
+		elif "rate limit" in str(e).lower():
+			error_message += "It seems we've hit GitHub API rate limits. Please try again in a few minutes."
+		elif "timeout" in str(e).lower():
+			error_message += "There was a timeout while fetching data. Please try again or consider a more specific question."
+		else:
+			error_message += "Please try a more specific question or check if the repository name is correct."
 
-			if "stackoverflow_text" in context_data:
-				system_message += f"\nRELEVANT QUESTIONS:\n{context_data['stackoverflow_text']}\n"
+		return error_message
 
-			if "trending_text" in context_data:
-				system_message += f"\nTRENDING DATA:\n{context_data['trending_text']}\n"
+	def _retrieve_knowledge(self, question: str, k: int = 7) -> str:
+		"""Curated knowledge-base passages for prompts that bypass the retrieval chain"""
+		if self.vectorstore is None:
+			return ""
 
-			system_message += "\n\nProvide a helpful, informative response based on the real-time data above and your expertise. When recommending repositories or issues, be specific and give actual names and links. If asked about contribution steps, provide detailed guidance tailored to the user's skill level and the specific repository."
+		try:
+			docs = self.vectorstore.similarity_search(question, k=k)
+		except Exception as e:
+			print(f"Error retrieving knowledge base passages: {str(e)}")
+			return ""
 
-			if self.conversation_chain:
-				try:
+		return "\n".join(doc.page_content for doc in docs)
 
-					result = self.conversation_chain({"question": question, "system_message": system_message})
-					answer = result["answer"]
+	def stream_response(self, question: str, use_realtime: bool = True, force_refresh: bool = False):
+		"""Yield (event, data) pairs: context gathering, answer tokens as they arrive, then a summary"""
+		start_time = time.time()
+		yield "context", {"status": "gathering"}
 
-					self.add_message_to_history(question, answer)
+		self._update_user_preferences(question)
 
-					return {
-						"answer": answer,
-						"source_documents": result.get("source_documents", []),
-						"context_data": context_data
-					}
-				except Exception as e:
-					print(f"Error using conversation chain: {str(e)}")
+		try:
+			context_data = self._gather_context(question, force_refresh)
 
-					messages = [
-						{"role": "system", "content": system_message},
-						{"role": "user", "content": question}
-					]
+			if not self.vectorstore:
+				self.initialize_vectorstore()
+			fingerprint = self._answer_fingerprint(context_data)
+			answer, vector = answer_cache.lookup(fingerprint, question, self.embeddings) if answer_cache.enabled else (None, None)
+			cached = answer is not None
 
-					response = self.llm.invoke(messages)
-					answer = response.content
+			knowledge = "" if cached else self._retrieve_knowledge(question)
+			system_message, prompt_report = self._build_system_message(context_data, question, knowledge)
 
-					self.add_message_to_history(question, answer)
+			context_time = round(time.time() - start_time, 2)
+			yield "context", {"status": "ready", "context_time": context_time}
 
-					return {
-						"answer": answer,
-						"context_data": context_data
-					}
+			first_token_time = None
+			if cached:
+				first_token_time = round(time.time() - start_time, 2)
+				yield "token", {"text": answer}
 			else:
+				messages = self._conversation_messages(system_message, question)
 
-				if not self.vectorstore:
-					self.initialize_vectorstore()
+				parts = []
+				for chunk in llm_gateway.stream(self.llm, messages):
+					if not chunk.content:
+						continue
+					if first_token_time is None:
+						first_token_time = round(time.time() - start_time, 2)
+					parts.append(chunk.content)
+					yield "token", {"text": chunk.content}
+
+				answer = "".join(parts)
+				if answer_cache.enabled and answer:
+					answer_cache.store_answer(fingerprint, question, answer, vector)
+
+			self.add_message_to_history(question, answer)
+
+			yield "done", {
+				"context_data": context_data,
+				"user_preferences": self.user_preferences,
+				"context_time": context_time,
+				"first_token_time": first_token_time,
+				"cached": cached,
+				"prompt": prompt_report,
+				"history_cursor": self.history_cursor,
+				"processing_time": round(time.time() - start_time, 2)
+			}
+		except Exception as e:
+			print(f"Error in stream_response: {str(e)}")
+			yield "error", self._error_payload(e)
+
+	async def aget_response(self, question: str, use_realtime: bool = True, force_refresh: bool = False):
+		"""get_response without holding a thread while waiting on upstream APIs and the LLM"""
+		self._update_user_preferences(question)
+
+		try:
+			context_data = await self._agather_context(question, force_refresh)
+			system_message, prompt_report = self._build_system_message(context_data, question)
+
+			# A near-identical question against the same context, profile and conversation reuses an
+			# earlier answer, whichever path produced it
+			fingerprint = self._answer_fingerprint(context_data)
+			answer, vector = await run_in_threadpool(answer_cache.lookup, fingerprint, question, self.embeddings) if answer_cache.enabled else (None, None)
+			cached = answer is not None
+			source_documents = []
+
+			if not cached:
+				if self.conversation_chain:
+					try:
+						result = await llm_gateway.acall(self.conversation_chain.ainvoke, self._chain_inputs(question, system_message, prompt_report))
+						answer = result["answer"]
+						prompt_report = self._chain_prompt_report(prompt_report, result.get("source_documents", []))
+						source_documents = [
+							{"content": doc.page_content, "metadata": doc.metadata}
+							for doc in result.get("source_documents", [])
+						]
+					except LLMOverloaded:
+						raise
+					except Exception as e:
+						print(f"Error using conversation chain: {str(e)}")
+				elif not self.vectorstore:
+					await run_in_threadpool(self.initialize_vectorstore)
 
-				messages = [
-					{"role": "system", "content": system_message},
-					{"role": "user", "content": question}
-				]
+				if answer is None:
+					messages = self._conversation_messages(system_message, question)
 
-				response = self.llm.invoke(messages)
-				answer = response.content
+					response = await llm_gateway.ainvoke(self.llm, messages)
+					answer = response.content
+				if answer_cache.enabled:
+					await run_in_threadpool(answer_cache.store_answer, fingerprint, question, answer, vector)
 
-				self.add_message_to_history(question, answer)
+			self.add_message_to_history(question, answer)
 
-				return {
-					"answer": answer,
-					"context_data": context_data
-				}
+			return {
+				"answer": answer,
+				"source_documents": source_documents,
+				"cached": cached,
+				"context_data": context_data,
+				"prompt": prompt_report
+			}
 		except Exception as e:
+			print(f"Error in aget_response: {str(e)}")
 
-			print(f"Error in get_response: {str(e)}")
-			error_message = "I apologize, but I encountered an error while processing your request. "
+			return self._error_payload(e)
+
+	async def astream_response(self, question: str, use_realtime: bool = True, force_refresh: bool = False):
+		"""Async generator with the same (event, data) pairs as stream_response"""
+		start_time = time.time()
+		yield "context", {"status": "gathering"}
+
+		self._update_user_preferences(question)
 
-			if "rate limit" in str(e).lower():
-				error_message += "It seems we've hit GitHub API rate limits. Please try again in a few minutes."
-			elif "timeout" in str(e).lower():
-				error_message += "There was a timeout while fetching data. Please try again or consider a more specific question."
+		try:
+			context_data = await self._agather_context(question, force_refresh)
+
+			if not self.vectorstore:
+				await run_in_threadpool(self.initialize_vectorstore)
+			fingerprint = self._answer_fingerprint(context_data)
+			answer, vector = await run_in_threadpool(answer_cache.lookup, fingerprint, question, self.embeddings) if answer_cache.enabled else (None, None)
+			cached = answer is not None
+
+			knowledge = "" if cached else await run_in_threadpool(self._retrieve_knowledge, question)
+			system_message, prompt_report = self._build_system_message(context_data, question, knowledge)
+
+			context_time = round(time.time() - start_time, 2)
+			yield "context", {"status": "ready", "context_time": context_time}
+
+			first_token_time = None
+			if cached:
+				first_token_time = round(time.time() - start_time, 2)
+				yield "token", {"text": answer}
 			else:
-				error_message += "Please try a more specific question or check if the repository name is correct."
+				messages = self._conversation_messages(system_message, question)
 
+				parts = []
+				async for chunk in llm_gateway.astream(self.llm, messages):
+					if not chunk.content:
+						continue
+					if first_token_time is None:
+						first_token_time = round(time.time() - start_time, 2)
+					parts.append(chunk.content)
+					yield "token", {"text": chunk.content}
+
+				answer = "".join(parts)
+				if answer_cache.enabled and answer:
+					await run_in_threadpool(answer_cache.store_answer, fingerprint, question, answer, vector)
+
+			self.add_message_to_history(question, answer)
+
+			yield "done", {
+				"context_data": context_data,
+				"user_preferences": self.user_preferences,
+				"context_time": context_time,
+				"first_token_time": first_token_time,
+				"cached": cached,
+				"prompt": prompt_report,
+				"history_cursor": self.history_cursor,
+				"processing_time": round(time.time() - start_time, 2)
+			}
+		except Exception as e:
+			print(f"Error in astream_response: {str(e)}")
+			yield "error", self._error_payload(e)
+
+class SessionManager:
+	"""Per-conversation OpenSourceChat sessions with idle-timeout and max-count (LRU) eviction"""
+
+	def __init__(self, idle_timeout: int = SESSION_IDLE_TIMEOUT, max_sessions: int = SESSION_MAX_COUNT):
+		self.idle_timeout = idle_timeout
+		self.max_sessions = max_sessions
+		self.sessions = OrderedDict()
+		self.last_used = {}
+		self.evictions = 0
+		self.lock = threading.Lock()
+
+	def _evict(self, now: float):
+		while self.sessions:
+			oldest = next(iter(self.sessions))
+			if len(self.sessions) <= self.max_sessions and now - self.last_used[oldest] < self.idle_timeout:
+				break
+			del self.sessions[oldest]
+			del self.last_used[oldest]
+			self.evictions += 1
+
+	def get(self, conversation_id: str) -> OpenSourceChat:
+		"""Session for the conversation, created on first use"""
+		now = time.time()
+		with self.lock:
+			session = self.sessions.get(conversation_id)
+			if session is None:
+				session = OpenSourceChat()
+				self.sessions[conversation_id] = session
+			self.sessions.move_to_end(conversation_id)
+			self.last_used[conversation_id] = now
+			self._evict(now)
+			return session
+
+	def find(self, conversation_id: str) -> Optional[OpenSourceChat]:
+		"""Existing live session for the conversation, or None; never creates one"""
+		with self.lock:
+			session = self.sessions.get(conversation_id)
+			if session is None or time.time() - self.last_used[conversation_id] >= self.idle_timeout:
+				return None
+			return session
+
+	def reset(self, conversation_id: str):
+		self.get(conversation_id).reset()
+
+	def stats(self) -> Dict[str, Any]:
+		with self.lock:
 			return {
-				"answer": error_message,
-				"error": str(e)
+				"active": len(self.sessions),
+				"max_sessions": self.max_sessions,
+				"idle_timeout": self.idle_timeout,
+				"evictions": self.evictions
 			}
 
+chat_resources = ChatResources()
+# Default conversation for endpoints called without a conversation_id
 chat_instance = OpenSourceChat()
+sessions = SessionManager()
+trending_snapshots = TrendingSnapshotService(crawler=chat_instance._crawl_sources, acrawler=chat_instance._acrawl_sources)
+# Started once at import, like the cache sweeper; under the debug reloader only the serving child refreshes
+if __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+	trending_snapshots.start()
+
+def get_session(conversation_id: Optional[str]) -> OpenSourceChat:
+	return sessions.get(conversation_id) if conversation_id else chat_instance
 
 @app.route("/")
 def index():
@@ -1460,22 +4482,58 @@ def chat():
 		use_realtime = data.get("use_realtime", True)
 		force_refresh = data.get("force_refresh", False)
 
+		session = sessions.get(conversation_id)
+		cursor = session.history_cursor
+
 		start_time = time.time()
-		response = chat_instance.get_response(question, use_realtime, force_refresh)
+		response = session.get_response(question, use_realtime, force_refresh)
 		end_time = time.time()
 
 		response["processing_time"] = round(end_time - start_time, 2)
 
-		response["conversation_history"] = chat_instance.get_chat_history()
+		# Only this turn's messages; earlier ones are paged from /api/history
+		response["messages"] = session.get_chat_history(since=cursor)
+		response["history_cursor"] = session.history_cursor
 
-		response["user_preferences"] = chat_instance.user_preferences
+		response["user_preferences"] = session.user_preferences
 
+		if response.get("status") == "overloaded":
+			return jsonify(response), 503, {"Retry-After": str(response["retry_after"])}
 		return jsonify(response)
 	except ValidationError as ve:
 		return jsonify({"error": "Validation error", "details": str(ve)}), 400
 	except Exception as e:
 		return jsonify({"error": "Server error", "details": str(e)}), 500
 
+@app.route("/api/chat/stream", methods=["POST"])
+def chat_stream():
+	"""Same request as /api/chat, answered as Server-Sent Events while the LLM generates"""
+	try:
+
+		data = request.json
+		errors = chat_request_schema.validate(data)
+		if errors:
+			return jsonify({"error": "Invalid request", "details": errors}), 400
+
+		session = sessions.get(data["conversation_id"])
+		events = session.stream_response(
+			data["question"],
+			data.get("use_realtime", True),
+			data.get("force_refresh", False)
+		)
+
+		def generate():
+			for event, payload in events:
+				yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+		return Response(
+			stream_with_context(generate()),
+			mimetype="text/event-stream",
+			headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+		)
+	except Exception as e:
+		return jsonify({"error": "Server error", "details": str(e)}), 500
+
 @app.route("/api/search/repositories", methods=["GET"])
 def search_repositories():
 	try:
@@ -1484,7 +4542,7 @@ def search_repositories():
 		force_refresh = request.args.get("force_refresh", "false").lower() == "true"
 
 		start_time = time.time()
-		repos = chat_instance.search_repositories(query, language, force_refresh)
+		repos = get_session(request.args.get("conversation_id")).search_repositories(query, language, force_refresh)
 		end_time = time.time()
 
 		return jsonify({
@@ -1504,7 +4562,7 @@ def search_issues():
 			return jsonify({"error": "Repository name is required"}), 400
 
 		start_time = time.time()
-		issues = chat_instance.search_issues(repo_name, force_refresh)
+		issues = get_session(request.args.get("conversation_id")).search_issues(repo_name, force_refresh)
 		end_time = time.time()
 
 		return jsonify({
@@ -1524,7 +4582,7 @@ def get_contribution_guide():
 			return jsonify({"error": "Repository name is required"}), 400
 
 		start_time = time.time()
-		guide = chat_instance.get_contribution_guide(repo_name, force_refresh)
+		guide = get_session(request.args.get("conversation_id")).get_contribution_guide(repo_name, force_refresh)
 		end_time = time.time()
 
 		return jsonify({
@@ -1544,7 +4602,7 @@ def get_project_insights():
 			return jsonify({"error": "Repository name is required"}), 400
 
 		start_time = time.time()
-		insights = chat_instance.get_project_insights(repo_name, force_refresh)
+		insights = get_session(request.args.get("conversation_id")).get_project_insights(repo_name, force_refresh)
 		end_time = time.time()
 
 		return jsonify({
@@ -1561,11 +4619,13 @@ def get_trending():
 		language = request.args.get("language", None)
 
 		start_time = time.time()
-		trending_data = chat_instance.crawl_for_open_source_info(topic=topic, language=language)
+		crawl = get_session(request.args.get("conversation_id")).crawl_trending_sources(topic=topic, language=language)
 		end_time = time.time()
 
 		return jsonify({
-			"trending": trending_data,
+			"trending": crawl["results"],
+			"skipped_sources": crawl["skipped_sources"],
+			"snapshot_version": crawl.get("version"),
 			"processing_time": round(end_time - start_time, 2)
 		})
 	except Exception as e:
@@ -1578,7 +4638,7 @@ def get_stackoverflow():
 		topic = request.args.get("topic", None)
 
 		start_time = time.time()
-		questions = chat_instance.get_stackoverflow_questions(repo_name=repo_name, topic=topic)
+		questions = get_session(request.args.get("conversation_id")).get_stackoverflow_questions(repo_name=repo_name, topic=topic)
 		end_time = time.time()
 
 		return jsonify({
@@ -1588,14 +4648,101 @@ def get_stackoverflow():
 	except Exception as e:
 		return jsonify({"error": "Error fetching Stack Overflow questions", "details": str(e)}), 500
 
+@app.route("/api/cache/stats", methods=["GET"])
+def get_cache_stats():
+	try:
+		embeddings = chat_resources.embeddings
+		return jsonify({
+			"caches": {name: cache.stats() for name, cache in CACHES.items()},
+			"embeddings": embeddings.stats() if isinstance(embeddings, CachedEmbeddings) else None,
+			"answers": answer_cache.stats(),
+			"github_rate_limit": github_client.rate_limiter.stats(),
+			"llm": llm_gateway.stats()
+		})
+	except Exception as e:
+		return jsonify({"error": "Error fetching cache stats", "details": str(e)}), 500
+
+def admin_authorized(token: Optional[str]) -> bool:
+	return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+@app.route("/api/admin/documents", methods=["GET"])
+def list_documents():
+	if not admin_authorized(request.headers.get("X-Admin-Token")):
+		return jsonify({"error": "Forbidden"}), 403
+	try:
+		return jsonify({"documents": chat_resources.list_documents()})
+	except Exception as e:
+		return jsonify({"error": "Error listing documents", "details": str(e)}), 500
+
+@app.route("/api/admin/documents", methods=["POST"])
+def ingest_documents():
+	"""Add documents to the knowledge base without rebuilding it"""
+	if not admin_authorized(request.headers.get("X-Admin-Token")):
+		return jsonify({"error": "Forbidden"}), 403
+	try:
+
+		data = request.get_json(silent=True) or {}
+		errors = ingest_request_schema.validate(data)
+		if errors:
+			return jsonify({"error": "Invalid request", "details": errors}), 400
+
+		start_time = time.time()
+		result = chat_resources.ingest_documents(data["documents"], data.get("source", "admin"))
+		result["processing_time"] = round(time.time() - start_time, 2)
+
+		return jsonify(result)
+	except Exception as e:
+		return jsonify({"error": "Error ingesting documents", "details": str(e)}), 500
+
+@app.route("/api/admin/documents", methods=["DELETE"])
+def remove_documents():
+	if not admin_authorized(request.headers.get("X-Admin-Token")):
+		return jsonify({"error": "Forbidden"}), 403
+	try:
+
+		data = request.get_json(silent=True) or {}
+		errors = remove_documents_schema.validate(data)
+		if errors:
+			return jsonify({"error": "Invalid request", "details": errors}), 400
+
+		return jsonify(chat_resources.remove_documents(data["document_ids"]))
+	except Exception as e:
+		return jsonify({"error": "Error removing documents", "details": str(e)}), 500
+
+@app.route("/api/history", methods=["GET"])
+def get_history():
+	"""Page through a conversation's messages from `cursor` (a message id) onwards"""
+	try:
+		conversation_id = request.args.get("conversation_id")
+		if not conversation_id:
+			return jsonify({"error": "conversation_id is required"}), 400
+
+		cursor = request.args.get("cursor", 0, type=int)
+		limit = min(max(request.args.get("limit", HISTORY_PAGE_SIZE, type=int), 1), HISTORY_MAX_MESSAGES)
+
+		# A history poll must not create (and make room for) a session of its own
+		session = sessions.find(conversation_id)
+		if session is None:
+			return jsonify({"error": "Conversation not found"}), 404
+
+		return jsonify(session.history_page(cursor, limit))
+	except Exception as e:
+		return jsonify({"error": "Error fetching history", "details": str(e)}), 500
+
+@app.route("/api/sessions/stats", methods=["GET"])
+def get_session_stats():
+	try:
+		return jsonify(sessions.stats())
+	except Exception as e:
+		return jsonify({"error": "Error fetching session stats", "details": str(e)}), 500
+
 @app.route("/api/reset", methods=["POST"])
 def reset_chat():
 	"""Reset the chat history and preferences"""
 	try:
 
-		global chat_instance
-		chat_instance = OpenSourceChat()
-		chat_instance.initialize_vectorstore()
+		conversation_id = (request.get_json(silent=True) or {}).get("conversation_id")
+		get_session(conversation_id).reset()
 
 		return jsonify({"status": "success", "message": "Chat history and preferences reset"})
 	except Exception as e:
@@ -1606,6 +4753,7 @@ def start_conversation():
 	try:
 
 		conversation_id = str(uuid.uuid4())
+		sessions.get(conversation_id)
 
 		return jsonify({
 			"status": "success",
@@ -1618,6 +4766,290 @@ def start_conversation():
 			"message": str(e)
 		}), 500
 
+# ASGI serving mode: the same routes on Starlette, served with `uvicorn app:asgi_app`.
+# Chat handlers await the LLM, GitHub and the other upstreams instead of holding a thread per request.
+
+templates = Jinja2Templates(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+
+def asgi_json(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> ASGIResponse:
+	return ASGIResponse(json.dumps(content, default=str), status_code=status_code, headers=headers, media_type="application/json")
+
+def asgi_flag(request, name: str) -> bool:
+	return request.query_params.get(name, "false").lower() == "true"
+
+async def asgi_index(request):
+	return templates.TemplateResponse(request, "index.html")
+
+async def asgi_chat(request):
+	try:
+
+		data = await request.json()
+		errors = chat_request_schema.validate(data)
+		if errors:
+			return asgi_json({"error": "Invalid request", "details": errors}, 400)
+
+		session = sessions.get(data["conversation_id"])
+		cursor = session.history_cursor
+
+		start_time = time.time()
+		response = await session.aget_response(data["question"], data.get("use_realtime", True), data.get("force_refresh", False))
+		end_time = time.time()
+
+		response["processing_time"] = round(end_time - start_time, 2)
+
+		response["messages"] = session.get_chat_history(since=cursor)
+		response["history_cursor"] = session.history_cursor
+
+		response["user_preferences"] = session.user_preferences
+
+		if response.get("status") == "overloaded":
+			return asgi_json(response, 503, {"Retry-After": str(response["retry_after"])})
+		return asgi_json(response)
+	except Exception as e:
+		return asgi_json({"error": "Server error", "details": str(e)}, 500)
+
+async def asgi_chat_stream(request):
+	try:
+
+		data = await request.json()
+		errors = chat_request_schema.validate(data)
+		if errors:
+			return asgi_json({"error": "Invalid request", "details": errors}, 400)
+
+		session = sessions.get(data["conversation_id"])
+		events = session.astream_response(
+			data["question"],
+			data.get("use_realtime", True),
+			data.get("force_refresh", False)
+		)
+
+		async def generate():
+			async for event, payload in events:
+				yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+		return StreamingResponse(
+			generate(),
+			media_type="text/event-stream",
+			headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+		)
+	except Exception as e:
+		return asgi_json({"error": "Server error", "details": str(e)}, 500)
+
+async def asgi_search_repositories(request):
+	try:
+		session = get_session(request.query_params.get("conversation_id"))
+
+		start_time = time.time()
+		repos = await session.asearch_repositories(
+			request.query_params.get("query", ""),
+			request.query_params.get("language", ""),
+			asgi_flag(request, "force_refresh")
+		)
+		end_time = time.time()
+
+		return asgi_json({
+			"repositories": repos,
+			"processing_time": round(end_time - start_time, 2)
+		})
+	except Exception as e:
+		return asgi_json({"error": "Search error", "details": str(e)}, 500)
+
+def asgi_repo_route(fetch_name: str, result_key: str, error: str):
+	"""Handler for the GET ?repo=owner/name endpoints backed by a cached async GitHub fetcher"""
+	async def handler(request):
+		try:
+			repo_name = request.query_params.get("repo", "")
+			if not repo_name:
+				return asgi_json({"error": "Repository name is required"}, 400)
+
+			session = get_session(request.query_params.get("conversation_id"))
+
+			start_time = time.time()
+			result = await getattr(session, fetch_name)(repo_name, asgi_flag(request, "force_refresh"))
+			end_time = time.time()
+
+			return asgi_json({
+				result_key: result,
+				"processing_time": round(end_time - start_time, 2)
+			})
+		except Exception as e:
+			return asgi_json({"error": error, "details": str(e)}, 500)
+
+	return handler
+
+async def asgi_trending(request):
+	try:
+		session = get_session(request.query_params.get("conversation_id"))
+
+		start_time = time.time()
+		crawl = await session.acrawl_trending_sources(
+			request.query_params.get("topic"),
+			request.query_params.get("language")
+		)
+		end_time = time.time()
+
+		return asgi_json({
+			"trending": crawl["results"],
+			"skipped_sources": crawl["skipped_sources"],
+			"snapshot_version": crawl.get("version"),
+			"processing_time": round(end_time - start_time, 2)
+		})
+	except Exception as e:
+		return asgi_json({"error": "Error fetching trending data", "details": str(e)}, 500)
+
+async def asgi_stackoverflow(request):
+	try:
+		session = get_session(request.query_params.get("conversation_id"))
+
+		start_time = time.time()
+		questions = await session.aget_stackoverflow_questions(
+			repo_name=request.query_params.get("repo"),
+			topic=request.query_params.get("topic")
+		)
+		end_time = time.time()
+
+		return asgi_json({
+			"questions": questions,
+			"processing_time": round(end_time - start_time, 2)
+		})
+	except Exception as e:
+		return asgi_json({"error": "Error fetching Stack Overflow questions", "details": str(e)}, 500)
+
+async def asgi_cache_stats(request):
+	try:
+		embeddings = chat_resources.embeddings
+		return asgi_json({
+			"caches": {name: cache.stats() for name, cache in CACHES.items()},
+			"embeddings": embeddings.stats() if isinstance(embeddings, CachedEmbeddings) else None,
+			"answers": answer_cache.stats(),
+			"github_rate_limit": github_client.rate_limiter.stats(),
+			"llm": llm_gateway.stats()
+		})
+	except Exception as e:
+		return asgi_json({"error": "Error fetching cache stats", "details": str(e)}, 500)
+
+async def asgi_history(request):
+	try:
+		conversation_id = request.query_params.get("conversation_id")
+		if not conversation_id:
+			return asgi_json({"error": "conversation_id is required"}, 400)
+
+		cursor = int(request.query_params.get("cursor", 0))
+		limit = min(max(int(request.query_params.get("limit", HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_MESSAGES)
+
+		session = sessions.find(conversation_id)
+		if session is None:
+			return asgi_json({"error": "Conversation not found"}, 404)
+
+		return asgi_json(session.history_page(cursor, limit))
+	except ValueError:
+		return asgi_json({"error": "cursor and limit must be integers"}, 400)
+	except Exception as e:
+		return asgi_json({"error": "Error fetching history", "details": str(e)}, 500)
+
+async def asgi_session_stats(request):
+	try:
+		return asgi_json(sessions.stats())
+	except Exception as e:
+		return asgi_json({"error": "Error fetching session stats", "details": str(e)}, 500)
+
+async def asgi_documents(request):
+	if not admin_authorized(request.headers.get("X-Admin-Token")):
+		return asgi_json({"error": "Forbidden"}, 403)
+	try:
+
+		if request.method == "GET":
+			return asgi_json({"documents": chat_resources.list_documents()})
+
+		try:
+			data = await request.json()
+		except Exception:
+			data = {}
+
+		if request.method == "DELETE":
+			errors = remove_documents_schema.validate(data or {})
+			if errors:
+				return asgi_json({"error": "Invalid request", "details": errors}, 400)
+			return asgi_json(await run_in_threadpool(chat_resources.remove_documents, data["document_ids"]))
+
+		errors = ingest_request_schema.validate(data or {})
+		if errors:
+			return asgi_json({"error": "Invalid request", "details": errors}, 400)
+
+		start_time = time.time()
+		result = await run_in_threadpool(chat_resources.ingest_documents, data["documents"], data.get("source", "admin"))
+		result["processing_time"] = round(time.time() - start_time, 2)
+
+		return asgi_json(result)
+	except Exception as e:
+		return asgi_json({"error": "Error updating documents", "details": str(e)}, 500)
+
+async def asgi_reset(request):
+	try:
+
+		try:
+			data = await request.json()
+		except Exception:
+			data = {}
+		get_session((data or {}).get("conversation_id")).reset()
+
+		return asgi_json({"status": "success", "message": "Chat history and preferences reset"})
+	except Exception as e:
+		return asgi_json({"error": "Error resetting chat", "details": str(e)}, 500)
+
+async def asgi_start_conversation(request):
+	try:
+
+		conversation_id = str(uuid.uuid4())
+		sessions.get(conversation_id)
+
+		return asgi_json({
+			"status": "success",
+			"conversation_id": conversation_id,
+			"message": "New conversation started"
+		})
+	except Exception as e:
+		return asgi_json({
+			"status": "error",
+			"message": str(e)
+		}, 500)
+
+@asynccontextmanager
+async def asgi_lifespan(asgi):
+	global async_http
+	limits = httpx.Limits(max_connections=ASYNC_HTTP_MAX_CONNECTIONS, max_keepalive_connections=ASYNC_HTTP_MAX_CONNECTIONS)
+	async_http = httpx.AsyncClient(limits=limits, follow_redirects=True)
+
+	await run_in_threadpool(chat_instance.initialize_vectorstore)
+	try:
+		yield
+	finally:
+		trending_snapshots.stop()
+		await async_http.aclose()
+
+asgi_app = Starlette(
+	routes=[
+		Route("/", asgi_index),
+		Route("/api/chat", asgi_chat, methods=["POST"]),
+		Route("/api/chat/stream", asgi_chat_stream, methods=["POST"]),
+		Route("/api/search/repositories", asgi_search_repositories, methods=["GET"]),
+		Route("/api/search/issues", asgi_repo_route("asearch_issues", "issues", "Search error"), methods=["GET"]),
+		Route("/api/contribution_guide", asgi_repo_route("aget_contribution_guide", "guide", "Error fetching contribution guide"), methods=["GET"]),
+		Route("/api/project_insights", asgi_repo_route("aget_project_insights", "insights", "Error fetching project insights"), methods=["GET"]),
+		Route("/api/trending", asgi_trending, methods=["GET"]),
+		Route("/api/stackoverflow", asgi_stackoverflow, methods=["GET"]),
+		Route("/api/cache/stats", asgi_cache_stats, methods=["GET"]),
+		Route("/api/history", asgi_history, methods=["GET"]),
+		Route("/api/sessions/stats", asgi_session_stats, methods=["GET"]),
+		Route("/api/admin/documents", asgi_documents, methods=["GET", "POST", "DELETE"]),
+		Route("/api/reset", asgi_reset, methods=["POST"]),
+		Route("/start-conversation", asgi_start_conversation, methods=["POST"]),
+		Mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")), name="static")
+	],
+	middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+	lifespan=asgi_lifespan
+)
+
 if __name__ == "__main__":
 
 	chat_instance.initialize_vectorstore()
@@ -58,7 +58,10 @@ document.addEventListener('DOMContentLoaded', function() {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
-            }
+            },
+            body: JSON.stringify({
+                conversation_id: conversationId
+            })
         })
         .then(response => response.json())
         .then(data => {
@@ -105,6 +108,8 @@ document.addEventListener('DOMContentLoaded', function() {
         addSyntaxHighlighting();
 
         makeLinksExternal();
+
+        return contentDiv;
     }
 
     function processMarkdown(text) {
@@ -157,8 +162,6 @@ document.addEventListener('DOMContentLoaded', function() {
         userInput.disabled = true;
         sendButton.disabled = true;
 
-        showLoading();
-
         if (!conversationId) {
             initializeConversation();
 
@@ -170,8 +173,39 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    function parseEvent(rawEvent) {
+        let name = 'message';
+        let data = '';
+
+        rawEvent.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                name = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                data += line.slice(5).trim();
+            }
+        });
+
+        return { name: name, payload: data ? JSON.parse(data) : {} };
+    }
+
     function getChatResponse(message) {
-        fetch('/api/chat', {  
+        const contentDiv = addMessage('assistant', '');
+        contentDiv.innerHTML = '<span class="typing-indicator"><i class="fas fa-circle-notch fa-spin"></i> Getting information from Sources...</span>';
+
+        let answer = '';
+
+        function handleEvent(event) {
+            if (event.name === 'token') {
+                answer += event.payload.text;
+                contentDiv.innerHTML = processMarkdown(answer);
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            } else if (event.name === 'error') {
+                answer = event.payload.answer || ('Sorry, there was an error: ' + event.payload.error);
+                contentDiv.innerHTML = processMarkdown(answer);
+            }
+        }
+
+        fetch('/api/chat/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -183,28 +217,49 @@ document.addEventListener('DOMContentLoaded', function() {
             })
         })
         .then(response => {
-            if (!response.ok) {
+            if (!response.ok || !response.body) {
                 throw new Error('Network response was not ok');
             }
-            return response.json();
-        })
-        .then(data => {
-            hideLoading();
 
-            if (data.error) {
-                throw new Error(data.error);
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            function read() {
+                return reader.read().then(({ done, value }) => {
+                    if (done) {
+                        return;
+                    }
+
+                    buffer += decoder.decode(value, { stream: true });
+
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                        handleEvent(parseEvent(buffer.slice(0, boundary)));
+                        buffer = buffer.slice(boundary + 2);
+                    }
+
+                    return read();
+                });
             }
 
-            addMessage('assistant', data.answer);
+            return read();
+        })
+        .then(() => {
+            if (!answer) {
+                contentDiv.innerHTML = processMarkdown('Sorry, no answer was received. Please try again.');
+            }
+
+            addSyntaxHighlighting();
+            makeLinksExternal();
 
             userInput.disabled = false;
             sendButton.disabled = false;
             userInput.focus();
         })
         .catch(error => {
-            hideLoading();
             console.error('Error:', error);
-            addMessage('assistant', 'Sorry, there was an error: ' + error.message);
+            contentDiv.innerHTML = processMarkdown('Sorry, there was an error: ' + error.message);
             userInput.disabled = false;
             sendButton.disabled = false;
         });
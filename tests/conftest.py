@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Keep the import of app offline and free of on-disk state
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ["VECTORSTORE_DIR"] = ""
+os.environ["EMBEDDING_CACHE_PATH"] = ""
+os.environ["TRENDING_REFRESH_INTERVAL"] = "0"
+os.environ["ANSWER_CACHE_SIMILARITY"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
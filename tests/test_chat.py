@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app
+
+
+class RecordingLLM:
+	"""Stands in for Gemini: records the messages of every call and answers with a numbered reply"""
+
+	def __init__(self):
+		self.calls = []
+
+	def _reply(self, messages):
+		self.calls.append(messages)
+		return f"answer {len(self.calls)}"
+
+	def invoke(self, messages, **kwargs):
+		return SimpleNamespace(content=self._reply(messages))
+
+	def stream(self, messages, **kwargs):
+		yield SimpleNamespace(content=self._reply(messages))
+
+	async def ainvoke(self, messages, **kwargs):
+		return SimpleNamespace(content=self._reply(messages))
+
+	async def astream(self, messages, **kwargs):
+		yield SimpleNamespace(content=self._reply(messages))
+
+
+@pytest.fixture
+def chat(monkeypatch):
+	chat = app.OpenSourceChat()
+	chat.llm = RecordingLLM()
+	monkeypatch.setattr(chat, "_gather_context", lambda question, force_refresh=False: {})
+
+	async def agather(question, force_refresh=False):
+		return {}
+
+	monkeypatch.setattr(chat, "_agather_context", agather)
+	monkeypatch.setattr(chat, "initialize_vectorstore", lambda curated_data=None: None)
+	return chat
+
+
+def contents(messages):
+	return [message["content"] for message in messages]
+
+
+def test_stream_response_sees_previous_turn(chat):
+	list(chat.stream_response("Which Python projects need help?"))
+	list(chat.stream_response("How do I start with the first one?"))
+
+	second = contents(chat.llm.calls[1])
+	assert "Which Python projects need help?" in second
+	assert "answer 1" in second
+	assert second[-1] == "How do I start with the first one?"
+
+
+def test_astream_response_sees_previous_turn(chat):
+	async def converse():
+		for question in ("Which Python projects need help?", "How do I start with the first one?"):
+			async for _ in chat.astream_response(question):
+				pass
+
+	asyncio.run(converse())
+
+	second = contents(chat.llm.calls[1])
+	assert "Which Python projects need help?" in second
+	assert "answer 1" in second
+
+
+def test_summary_reaches_the_prompt(chat):
+	chat.summary = "The user wants beginner-friendly Rust issues."
+	list(chat.stream_response("Any more?"))
+
+	assert "The user wants beginner-friendly Rust issues." in chat.llm.calls[0][0]["content"]
+
+
+class RecordingChain:
+	"""Stands in for the retrieval chain: records its inputs"""
+
+	def __init__(self):
+		self.inputs = []
+
+	def __call__(self, inputs):
+		self.inputs.append(inputs)
+		return {"answer": f"chain answer {len(self.inputs)}", "source_documents": []}
+
+
+def test_chain_turns_are_written_once(chat, monkeypatch):
+	chain = RecordingChain()
+	monkeypatch.setattr(app.OpenSourceChat, "conversation_chain", property(lambda self: chain))
+
+	chat.get_response("Which Python projects need help?")
+	chat.get_response("How do I start with the first one?")
+
+	assert len(chat.message_history.messages) == 4
+	history = [message.content for message in chain.inputs[1]["chat_history"]]
+	assert history == ["Which Python projects need help?", "chain answer 1"]
+
+
+def test_chain_answers_are_cached(chat, monkeypatch):
+	chain = RecordingChain()
+	monkeypatch.setattr(app.OpenSourceChat, "conversation_chain", property(lambda self: chain))
+	monkeypatch.setattr(app.answer_cache, "similarity", 0.9)
+
+	first = app.OpenSourceChat()
+	second = app.OpenSourceChat()
+	for session in (first, second):
+		session.llm = chat.llm
+		session.embeddings = None
+		monkeypatch.setattr(session, "_gather_context", lambda question, force_refresh=False: {})
+
+	assert first.get_response("Where do I find good first issues?")["cached"] is False
+	assert second.get_response("Where do I find good first issues?")["cached"] is True
+	assert len(chain.inputs) == 1
@@ -0,0 +1,57 @@
+import pytest
+
+import app
+
+
+def substring_intents(question: str) -> set:
+	"""The matcher extract_entities replaced: any keyword anywhere in the question"""
+	question = question.lower()
+	return {intent for intent, keywords in app.INTENT_KEYWORDS.items() if any(keyword in question for keyword in keywords)}
+
+
+# Inflections the substring matcher found and the whole-word matcher must keep finding
+INFLECTIONS = [
+	("I contributed to a repo before", "contribute"),
+	("Where are the contribution guidelines?", "guide"),
+	("Show me the newest Python repos", "trending"),
+	("What is trending this week?", "trending"),
+	("Any open issues?", "issues"),
+	("Which projects need help?", "repositories"),
+	("Are they helpful to newcomers?", "help"),
+	("I keep getting errors", "help"),
+	("Is the project healthy?", "insights"),
+	("How do I start?", None),
+]
+
+# Substring hits inside unrelated words, which the whole-word matcher drops
+FALSE_POSITIVES = [
+	("How do I renew my token?", "trending"),
+	("Is this an unpopular choice?", "trending"),
+	("What does this tissue sample library do?", "issues"),
+]
+
+
+@pytest.mark.parametrize("question, intent", INFLECTIONS)
+def test_inflections_still_match(question, intent):
+	intents = app.extract_entities(question)["intents"]
+	if intent is None:
+		assert not intents & {"contribute", "guide", "trending", "issues", "help", "insights"}
+	else:
+		assert intent in substring_intents(question)
+		assert intent in intents
+
+
+@pytest.mark.parametrize("question, intent", FALSE_POSITIVES)
+def test_words_containing_a_keyword_do_not_match(question, intent):
+	assert intent in substring_intents(question)
+	assert intent not in app.extract_entities(question)["intents"]
+
+
+@pytest.mark.parametrize("question, field, value", [
+	("javascript projects", "languages", ("javascript",)),
+	("good first issues in go", "languages", ("go",)),
+	("a good client library", "interests", ()),
+	("how to write tests", "interests", ("testing",)),
+])
+def test_short_names_need_whole_words(question, field, value):
+	assert app.extract_entities(question)[field] == value